@@ -0,0 +1,31 @@
+"""Archive Benchmarks."""
+
+import json
+
+import pytest
+
+from spykeball.archive import Archive
+
+
+@pytest.fixture
+def game_record(tmp_path, played_game):
+    """Save a played game and return its file."""
+    fp = tmp_path.joinpath(played_game.UID + '.json')
+    played_game.save(fp)
+    return fp
+
+
+def test_read_json(benchmark, game_record):
+    """Benchmark reading a game file, recording its size."""
+    benchmark.extra_info['bytes'] = game_record.stat().st_size
+    benchmark(lambda: json.loads(game_record.read_text()))
+
+
+@pytest.mark.parametrize('codec', ['zlib', 'lzma'])
+def test_read_archive(benchmark, tmp_path, game_record, codec):
+    """Benchmark reading an archived game, recording its compressed size."""
+    archive = Archive(tmp_path.joinpath('archive'))
+    name = archive.pack([(game_record.stem, game_record.read_text())], codec)
+    benchmark.extra_info['bytes'] = tmp_path.joinpath(
+        'archive', name + '.pack').stat().st_size
+    benchmark(lambda: json.loads(archive.read(game_record.stem)))
@@ -0,0 +1,72 @@
+"""
+Benchmark Configuration.
+
+The benchmarks are run with pytest-benchmark::
+
+    pytest benchmarks --benchmark-save=baseline
+    pytest benchmarks --benchmark-compare=baseline
+
+Saved runs are stored in ``.benchmarks``. When comparing against a stored
+baseline, any benchmark whose mean regresses by more than
+``REGRESSION_THRESHOLD`` fails the run, unless ``--benchmark-compare-fail``
+is given explicitly. The size of the generated workloads is controlled with
+``--bench-rallies`` and ``--bench-seed``.
+"""
+
+import pytest
+
+from pytest_benchmark.utils import parse_compare_fail
+
+from spykeball import Game, Player, PlayerMap
+from spykeball import synth
+
+
+REGRESSION_THRESHOLD = 'mean:15%'
+
+
+def pytest_addoption(parser):
+    """Add workload scale options."""
+    group = parser.getgroup('spykeball')
+    group.addoption('--bench-rallies', type=int, default=500,
+                    help="Number of rallies in generated workloads.")
+    group.addoption('--bench-seed', type=int, default=0,
+                    help="Seed for the workload generator.")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """Apply the default regression threshold when comparing runs."""
+    option = config.option
+    if (getattr(option, 'benchmark_compare', None)
+            and not getattr(option, 'benchmark_compare_fail', None)):
+        option.benchmark_compare_fail = [
+            parse_compare_fail(REGRESSION_THRESHOLD)]
+
+
+@pytest.fixture(scope='session')
+def scale(request):
+    """Return the configured workload scale."""
+    return {
+        'rallies': request.config.getoption('--bench-rallies'),
+        'seed': request.config.getoption('--bench-seed'),
+    }
+
+
+@pytest.fixture
+def playermap():
+    """Return a fresh PlayerMap."""
+    return PlayerMap(Player('p1'), Player('p2'), Player('p3'), Player('p4'))
+
+
+@pytest.fixture(scope='session')
+def rallies(scale):
+    """Return a valid sequence of rally strings."""
+    return list(synth.rallies(scale['rallies'], seed=scale['seed']))
+
+
+@pytest.fixture
+def played_game(playermap, rallies):
+    """Return a game which has been played."""
+    game = Game(playermap, rallies)
+    game.play(save_stats=False)
+    return game
@@ -0,0 +1,58 @@
+"""Game Benchmarks."""
+
+import gc
+import json
+
+import pytest
+
+from spykeball import Game, Player, PlayerMap
+
+
+@pytest.fixture
+def game_file(tmp_path, rallies):
+    """Save a played game whose objects no longer exist."""
+    fp = tmp_path.joinpath('game.json')
+    playermap = PlayerMap(Player('p1'), Player('p2'),
+                          Player('p3'), Player('p4'))
+    game = Game(playermap, rallies)
+    game.play(save_stats=False)
+    game.save(fp)
+    del game, playermap
+    gc.collect()
+    return fp
+
+
+def test_play(benchmark, playermap, rallies):
+    """Benchmark playing a parsed game."""
+    def setup():
+        return (Game(playermap, rallies),), {}
+
+    benchmark.pedantic(lambda game: game.play(save_stats=False),
+                       setup=setup, rounds=50)
+
+
+def test_save(benchmark, tmp_path, played_game):
+    """Benchmark saving a played game with stats."""
+    benchmark(played_game.save, tmp_path.joinpath('game.json'))
+
+
+def test_load(benchmark, game_file):
+    """Benchmark loading a played game."""
+    benchmark(Game.load, game_file)
+
+
+def test_load_many(benchmark, game_file):
+    """Benchmark decoding a season of played games and reading stats."""
+    record = json.loads(game_file.read_text())
+    records = [dict(record, UID=Game.format_uid(i)) for i in range(50)]
+
+    def load():
+        return [g.player_stat(g.p1)
+                for g in Game.from_json_many(records)]
+
+    benchmark(load)
+
+
+def test_whatif(benchmark, played_game):
+    """Benchmark evaluating every lineup of a played game."""
+    benchmark(played_game.whatif)
@@ -0,0 +1,13 @@
+"""Journal Benchmarks."""
+
+from spykeball import Game
+from spykeball import synth
+
+from spykeball.journal import Journal
+
+
+def test_journal_append(benchmark, tmp_path, playermap, scale):
+    """Benchmark the latency of journaling a rally."""
+    stream = synth.rallies(seed=scale['seed'])
+    with Journal(Game(playermap), tmp_path) as journal:
+        benchmark(lambda: journal.append(next(stream)))
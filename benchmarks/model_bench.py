@@ -0,0 +1,19 @@
+"""Model Benchmarks."""
+
+import numpy as np
+
+from spykeball.model import COMPONENT_KEYS, Model1
+
+
+def test_model1_calculate(benchmark, played_game):
+    """Benchmark calculating Model1 stats for a played game."""
+    benchmark(Model1.calculate, played_game)
+
+
+def test_model1_score(benchmark, scale):
+    """Benchmark scoring a season of component vectors at once."""
+    rows = scale['rallies'] * 4
+    rng = np.random.default_rng(scale['seed'])
+    counts = rng.integers(0, 20, (rows, len(COMPONENT_KEYS)))
+    lengths = rng.integers(30, 60, rows)
+    benchmark(Model1.score, counts, lengths)
@@ -0,0 +1,40 @@
+"""Query Benchmarks."""
+
+import pytest
+
+from spykeball import synth
+from spykeball import Game, Player, PlayerMap
+
+from spykeball.query import TouchIndex
+
+SEASON_GAMES = 500
+
+
+@pytest.fixture(scope='module')
+def season():
+    """Return an index over a season of synthetic games."""
+    players = [Player(name) for name in 'abcdefgh']
+    index = TouchIndex()
+    for i, rallies in enumerate(synth.games(SEASON_GAMES, seed=0)):
+        playermap = PlayerMap(*(players[(i + k) % 8] for k in range(4)))
+        index.add_game(Game(playermap, rallies))
+    index.column('actor')
+    return {'index': index, 'players': players}
+
+
+def test_query_ace_rate(benchmark, season):
+    """Benchmark the ace rate of a player serving to another player."""
+    x, y = season['players'][:2]
+    index = season['index']
+
+    def query():
+        return index.query(actor=x, target=y, kind='Service').last_games(
+            200).mean('ace')
+
+    benchmark(query)
+
+
+def test_query_groupby(benchmark, season):
+    """Benchmark the ace rate of every player."""
+    index = season['index']
+    benchmark(lambda: index.query(kind='Service').groupby('actor').mean('ace'))
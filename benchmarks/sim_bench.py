@@ -0,0 +1,9 @@
+"""Simulator Benchmarks."""
+
+from spykeball.sim import TouchModel
+
+
+def test_simulate(benchmark, playermap, played_game):
+    """Benchmark simulating a thousand games of a lineup."""
+    model = TouchModel([played_game])
+    benchmark(model.simulate, [playermap], games=1000, seed=0)
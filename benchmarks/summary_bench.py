@@ -0,0 +1,35 @@
+"""Summary Index Benchmarks."""
+
+import pytest
+
+from spykeball import Game
+
+from spykeball.summary import SummaryIndex, summarize
+
+GAME_COUNT = 10000
+
+
+@pytest.fixture
+def index(tmp_path, played_game):
+    """Return an index of many summaries of the played game."""
+    record = summarize(played_game)
+    records = record.repeat(GAME_COUNT)
+    records['game'] = [Game.format_uid(i).encode() for i in range(GAME_COUNT)]
+    records['time'] = range(GAME_COUNT)
+    index = SummaryIndex(tmp_path.joinpath('games.summary'))
+    index.extend([records])
+    return index
+
+
+def test_find(benchmark, index):
+    """Benchmark finding the summary of one game by UID."""
+    benchmark(index.find, Game.format_uid(GAME_COUNT // 2))
+
+
+def test_list_player(benchmark, index, played_game):
+    """Benchmark listing the latest games of a player since a time."""
+    def listing():
+        records = index.between(GAME_COUNT // 2)
+        return index.of_player(played_game.p1.UID, records)[::-1][:20]
+
+    benchmark(listing)
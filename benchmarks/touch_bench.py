@@ -0,0 +1,33 @@
+"""Touch Benchmarks."""
+
+import pytest
+
+from spykeball import io
+from spykeball import touch
+
+
+@pytest.fixture
+def rally_file(tmp_path, rallies):
+    """Write the rallies to a touchmap file."""
+    fp = tmp_path.joinpath('actions.txt')
+    lines = (','.join(rallies[i:i + 8]) for i in range(0, len(rallies), 8))
+    fp.write_text('\n'.join(lines))
+    return fp
+
+
+def test_rally_parse(benchmark, rallies, playermap):
+    """Benchmark parsing every rally of a game."""
+    def parse():
+        for rally in rallies:
+            touch.rally_parse(rally, playermap)
+
+    benchmark(parse)
+
+
+def test_readsplitby(benchmark, rally_file):
+    """Benchmark splitting a touchmap file into rallies."""
+    def read():
+        with open(rally_file) as f:
+            return sum(1 for _ in io.readsplitby(f, ',', '\n'))
+
+    benchmark(read)
@@ -0,0 +1,31 @@
+"""Util Benchmarks."""
+
+import pytest
+
+from spykeball import Player
+
+CREATE_COUNT = 1000
+
+
+@pytest.fixture(params=[0, 10000], ids=['empty', 'populated'])
+def live_players(request):
+    """Keep a number of players alive during the benchmark."""
+    return [Player() for _ in range(request.param)]
+
+
+def test_uidobject_creation(benchmark, live_players):
+    """Benchmark creating players with randomly generated UIDs."""
+    def create():
+        return [Player() for _ in range(CREATE_COUNT)]
+
+    benchmark(create)
+
+
+def test_uid_validation(benchmark, live_players):
+    """Benchmark validating and parsing the UIDs of live players."""
+    uids = [p.UID for p in live_players] or [Player.format_uid(0)]
+
+    def validate():
+        return [Player.valid_id(uid) and Player.parse_uid(uid) for uid in uids]
+
+    benchmark(validate)
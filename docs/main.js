@@ -1,5 +1,11 @@
 var t;
 
+/* Set by ?server=http://127.0.0.1:8765&game=<UID> to post each rally to
+   `spykeball tag-server` as it is entered. */
+var params = new URLSearchParams(window.location.search);
+var tagServer = params.get('server');
+var tagGame = params.get('game');
+
 window.onload = function() {
     t = document.querySelector('.textField');
 };
@@ -69,11 +75,33 @@ function saveText(v) {
             document.querySelector('.savedTextArea h2').remove();
             ul.appendChild(new_li);
         }
+
+        if(tagServer && tagGame) {
+            postRally(v, new_li);
+        }
     }
 
     t.value = '';
 }
 
+function postRally(v, li) {
+    fetch(tagServer + '/games/' + tagGame + '/rallies', {
+        method: 'POST',
+        headers: {'Content-Type': 'text/plain'},
+        body: v
+    }).then(function(response) {
+        return response.json();
+    }).then(function(reply) {
+        if(reply.error) {
+            li.classList.add('invalid');
+            li.setAttribute('title', reply.error);
+        }
+    }).catch(function() {
+        li.classList.add('invalid');
+        li.setAttribute('title', 'Tagging server is unreachable.');
+    });
+}
+
 /*----------------------------------------------------------------*/
 
 function removeText(el) {
@@ -41,7 +41,7 @@ setup(
 
     install_requires=findfile('requirements.txt', fail=[]),
     setup_requires=['pytest-runner'],
-    tests_require=['pytest'],
+    tests_require=['pytest==6.2.5', 'pytest-benchmark==3.4.1'],
 
     entry_points={
         'console_scripts': [
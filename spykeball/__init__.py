@@ -5,31 +5,64 @@ Usage:
     spykeball <id>
     spykeball login [(<username> <password>)]
     spykeball game new <p1> <p2> <p3> <p4> [<actions>]
+    spykeball game batch <manifest> [--jobs=<n>]
+    spykeball game archive [--days=<n>] [--codec=<c>] [--compact]
+    spykeball game dedup
+    spykeball game list [--player=<p>] [--since=<d>] [--limit=<n>]
     spykeball game <id>
     spykeball player new <name> [<stats>]
     spykeball player <id>
+    spykeball profile <actions> [--repeat=<n>] [--prometheus]
+    spykeball tag-server [--host=<h>] [--port=<n>]
     spykeball (-i | -h | --help | --version)
 
 Options:
     -h --help     Show this help message.
     --version     Show version.
     -i            Open spykeball in interactive mode.
+    --jobs=<n>    Number of worker processes, all CPUs by default.
+    --repeat=<n>  Number of times to run the workload. [default: 1]
+    --prometheus  Print metrics in the Prometheus text format.
+    --days=<n>    Archive games older than this many days. [default: 90]
+    --codec=<c>   Compression of archived games, zlib or lzma. [default: lzma]
+    --compact     Merge every archive segment into one.
+    --player=<p>  List the games of the player with this UID.
+    --since=<d>   List the games saved on or after an ISO date.
+    --limit=<n>   List at most this many of the latest games. [default: 20]
+    --host=<h>    Address of the tagging server. [default: 127.0.0.1]
+    --port=<n>    Port of the tagging server. [default: 8765]
 """
 
+import json
+
+from datetime import datetime
 from docopt import docopt
 from pathlib import Path
 
+from . import batch
+from . import metrics
+from . import summary
+from . import tagserver
+
+from .archive import *
 from .game import *
 from .io import *
 from .model import *
+from .pairs import *
 from .player import *
+from .query import *
+from .store import *
 from .touch import *
 from .util import *
 
-__all__ = (game.__all__ +
+__all__ = (archive.__all__ +
+           game.__all__ +
            io.__all__ +
            model.__all__ +
+           pairs.__all__ +
            player.__all__ +
+           query.__all__ +
+           store.__all__ +
            touch.__all__ +
            util.__all__)
 
@@ -40,6 +73,8 @@ HOME = Path.home()
 LOCAL_STORAGE = HOME.joinpath('.spyke')
 LGAMESTORE = LOCAL_STORAGE.joinpath('game-data')
 LPLAYERSTORE = LOCAL_STORAGE.joinpath('player-data')
+LARCHIVE = LOCAL_STORAGE.joinpath('archive')
+LJOURNAL = LOCAL_STORAGE.joinpath('journal')
 
 
 def main():
@@ -50,32 +85,59 @@ def main():
     LGAMESTORE.mkdir(exist_ok=True)
     LPLAYERSTORE.mkdir(exist_ok=True)
 
-    storage = LOCAL_STORAGE
+    archive = Archive(LARCHIVE)
+    store = Store(LGAMESTORE, LPLAYERSTORE, archive=archive,
+                  on_duplicate='merge')
 
     if options['game']:
-        if options['new']:
+        if options['batch']:
+            _batch(options['<manifest>'], store,
+                   int(options['--jobs']) if options['--jobs'] else None)
+        elif options['archive']:
+            uids = archive.archive(LGAMESTORE,
+                                   float(options['--days']) * 86400,
+                                   options['--codec'])
+            print("Archived {} games.".format(len(uids)))
+            if options['--compact']:
+                archive.compact(options['--codec'])
+        elif options['dedup']:
+            removed = store.dedup()
+            print("Removed {} duplicate games.".format(len(removed)))
+        elif options['list']:
+            _list(store, options['--player'], options['--since'],
+                  int(options['--limit']))
+        elif options['new']:
             pmap = PlayerMap(
-                _load_from_store(LPLAYERSTORE, options['<p1>']),
-                _load_from_store(LPLAYERSTORE, options['<p2>']),
-                _load_from_store(LPLAYERSTORE, options['<p3>']),
-                _load_from_store(LPLAYERSTORE, options['<p4>'])
+                store.load(options['<p1>']),
+                store.load(options['<p2>']),
+                store.load(options['<p3>']),
+                store.load(options['<p4>'])
                 )
             home_team = Team(pmap.p1, pmap.p2)
             away_team = Team(pmap.p3, pmap.p4)
 
             rallies = None
-            if options['actions']:
+            if options['<actions>']:
                 rally_file = Path(options['<actions>'])
                 if rally_file.is_file():
-                    rallies = touch.load(options['<actions>'])
+                    rallies = touch.read(options['<actions>'])
                 else:
                     raise RallyException("{} is not a touchmap file."
                                          .format(rally_file))
 
             game = Game(pmap, rallies)
+            if rallies is not None:
+                game.play()
+                store.add(game)
+                for player in pmap:
+                    store.add(player)
         else:
             if Game.valid_id(options['<id>']):
-                game = _load_from_store(LGAMESTORE, options['<id>'])
+                record = store.summaries.find(options['<id>'])
+                if record is None:
+                    game = store.load(options['<id>'])
+                    record = summary.summarize(game)[0]
+                print(_format_summary(record))
             else:
                 raise Exception("IDK")
     elif options['player']:
@@ -90,26 +152,106 @@ def main():
                     pass
                 else:
                     pass
-            _save_to_store(LPLAYERSTORE, player, with_stats=with_stats)
+            store.add(player, with_stats=with_stats)
         else:
             if Player.valid_id(options['<id>']):
-                player = _load_from_store(LPLAYERSTORE, options['<id>'])
+                player = store.load(options['<id>'])
             else:
                 raise Exception("IDK")
+    elif options['profile']:
+        _profile(options['<actions>'], int(options['--repeat']))
+        if options['--prometheus']:
+            print(metrics.to_prometheus(), end='')
+        else:
+            print(json.dumps(metrics.to_dict(), indent=4))
+    elif options['tag-server']:
+        _tag_server(store, options['--host'], int(options['--port']))
     elif options['login']:
         print("LOGIN FAILED")
     else:
         print(__doc__)
 
+    store.flush()
 
-def _save_to_store(store, obj, ext='.json', **kwargs):
-    obj.save(store.joinpath(obj.UID + ext), **kwargs)
 
+def _batch(fp, store, jobs=None):
+    """Score every game of a manifest and save the results to the store."""
+    manifest = batch.load_manifest(fp)
+    players = {}
+    for pids, _ in manifest:
+        for pid in pids:
+            if pid not in players:
+                players[pid] = store.load(pid)
 
-def _load_from_store(store, uid, ext='.json', **kwargs):
-    if uid.upper().startswith('G'):
-        return Game.load(store.joinpath(uid + ext), **kwargs)
-    elif uid.upper().startswith('P'):
-        return Player.load(store.joinpath(uid + ext), **kwargs)
-    else:
-        raise SyntaxError("Invalid UID.")
+    results, elapsed = batch.score_batch(manifest, players, jobs=jobs)
+
+    for result in results:
+        store.add_record(result.UID, result.record)
+    for player in players.values():
+        store.add(player)
+
+    rallies = sum(r.rallies for r in results)
+    print("Scored {} games ({} rallies) in {:.3f}s: {:.1f} games/s, "
+          "{:.1f} rallies/s.".format(len(results), rallies, elapsed,
+                                     len(results) / elapsed,
+                                     rallies / elapsed))
+
+
+def _format_summary(record):
+    """Return a one line description of a game summary record."""
+    players = [p.decode() for p in record['players']]
+    saved = datetime.fromtimestamp(record['time']).strftime('%Y-%m-%d %H:%M')
+    line = "{} {}  {} & {} vs {} & {}  {} rallies".format(
+        record['game'].decode(), saved, *players, record['rallies'])
+    if record['winner'] >= 0:
+        line += "  {}-{} {} won".format(
+            record['home'], record['away'],
+            ('home', 'away')[record['winner']])
+    if record['top'] >= 0:
+        line += "  top {} ({:g})".format(players[record['top']],
+                                         record['top_total'])
+    return line
+
+
+def _timestamp(date):
+    """Return the timestamp of an ISO date with an optional time."""
+    for fmt in ('%Y-%m-%d', '%Y-%m-%dT%H:%M', '%Y-%m-%dT%H:%M:%S'):
+        try:
+            return datetime.strptime(date, fmt).timestamp()
+        except ValueError:
+            pass
+    raise ValueError("Invalid ISO date.", date)
+
+
+def _list(store, player=None, since=None, limit=20):
+    """Print the summaries of the latest stored games."""
+    start = None if since is None else _timestamp(since)
+    records = store.summaries.between(start)
+    if player is not None:
+        records = store.summaries.of_player(player, records)
+    for record in records[::-1][:limit]:
+        print(_format_summary(record))
+
+
+def _tag_server(store, host, port):
+    """Serve the video tool until interrupted."""
+    server = tagserver.TagServer((host, port), LJOURNAL, store)
+    print("Tagging server on http://{}:{}/".format(*server.server_address))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def _profile(fp, repeat=1):
+    """Read, parse, play and score a touchmap file with metrics enabled."""
+    with metrics.profile():
+        for _ in range(repeat):
+            rallies = touch.read(fp)
+            game = Game(PlayerMap(Player('p1'), Player('p2'),
+                                  Player('p3'), Player('p4')), rallies)
+            game.play(save_stats=False)
+            for player in game.players:
+                game.player_stat(player)
@@ -0,0 +1,177 @@
+"""Game Archive Module."""
+
+__all__ = ['CODECS', 'ArchiveException', 'Archive']
+
+import json
+import lzma
+import os
+import time
+import zlib
+
+from pathlib import Path
+
+from . import io
+
+from .game import Game
+
+
+CODECS = {
+    'zlib': (lambda data: zlib.compress(data, 9), zlib.decompress),
+    'lzma': (lzma.compress, lzma.decompress),
+}
+
+
+class ArchiveException(Exception):
+    """Raise an exception about an archive."""
+
+
+class Archive(object):
+    """
+    Compressed segments of historical game records.
+
+    Each segment is a '.pack' file of individually compressed records with a
+    '.idx' JSON index holding the codec of the segment and the offset, size
+    and players of each game, so reading one game decompresses one record.
+    The indexes of every segment are loaded when the archive is opened.
+    """
+
+    def __init__(self, directory):
+        """Initialize Archive over a directory."""
+        self._directory = Path(directory)
+        self._games = {}
+        self._segments = {}
+        if self._directory.is_dir():
+            for index in sorted(self._directory.glob('*.idx')):
+                self._read_index(index.stem)
+
+    def __contains__(self, uid):
+        """Check if a game is archived."""
+        return uid in self._games
+
+    def __len__(self):
+        """Return the number of archived games."""
+        return len(self._games)
+
+    def __iter__(self):
+        """Iterate over the UIDs of the archived games."""
+        return iter(self._games)
+
+    @property
+    def segments(self):
+        """Return the names of the segments."""
+        return tuple(self._segments)
+
+    def _read_index(self, name):
+        """Load the index of a segment."""
+        with open(self._directory.joinpath(name + '.idx')) as file:
+            index = json.load(file)
+        if index.get('codec') not in CODECS:
+            raise ArchiveException("Unknown codec.", name, index.get('codec'))
+        self._segments[name] = index
+        for uid, entry in index['games'].items():
+            self._games[uid] = (name, entry)
+
+    def players(self, uid):
+        """Return the player UIDs of an archived game."""
+        if uid not in self._games:
+            raise ArchiveException("Game is not archived.", uid)
+        return tuple(self._games[uid][1][2])
+
+    def games_of(self, player_uid):
+        """Return the UIDs of the archived games of a player."""
+        return [uid for uid, (_, entry) in self._games.items()
+                if player_uid in entry[2]]
+
+    def read(self, uid):
+        """Return the JSON record of an archived game."""
+        if uid not in self._games:
+            raise ArchiveException("Game is not archived.", uid)
+        name, (offset, size, _) = self._games[uid]
+        _, decompress = CODECS[self._segments[name]['codec']]
+        with open(self._directory.joinpath(name + '.pack'), 'rb') as file:
+            file.seek(offset)
+            return decompress(file.read(size)).decode()
+
+    def load(self, uid, *args, **kwargs):
+        """Load an archived game like Game.load."""
+        return Game.from_json(json.loads(self.read(uid)), *args, **kwargs)
+
+    def pack(self, records, codec='lzma'):
+        """
+        Write a new segment from (UID, JSON record) pairs.
+
+        The pack is written before its index, and each is replaced
+        atomically, so a crash never leaves an index pointing at missing
+        data. Return the name of the segment.
+        """
+        if codec not in CODECS:
+            raise ArchiveException("Unknown codec.", codec, tuple(CODECS))
+        compress, _ = CODECS[codec]
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+        name = 'segment-{:d}-{:d}'.format(int(time.time() * 1e6),
+                                          os.getpid())
+        games = {}
+        chunks = []
+        offset = 0
+        for uid, record in records:
+            data = json.loads(record)
+            players = [p['UID'] for team in ('home', 'away')
+                       for p in data.get('teams', {}).get(team, ())]
+            blob = compress(json.dumps(data, separators=(',', ':')).encode())
+            games[uid] = [offset, len(blob), players]
+            chunks.append(blob)
+            offset += len(blob)
+
+        io.atomic_write(self._directory.joinpath(name + '.pack'),
+                        b''.join(chunks), mode='wb')
+        io.atomic_write(self._directory.joinpath(name + '.idx'),
+                        json.dumps({'codec': codec, 'games': games}))
+        self._read_index(name)
+        return name
+
+    def archive(self, directory, older_than=0.0, codec='lzma'):
+        """
+        Move old game files of a directory into a new segment.
+
+        Game files modified more than 'older_than' seconds ago are packed and
+        then deleted. Return the UIDs of the archived games.
+        """
+        cutoff = time.time() - older_than
+        files = [fp for fp in sorted(Path(directory).glob('G*.json'))
+                 if fp.stat().st_mtime <= cutoff]
+        if not files:
+            return []
+        self.pack(((fp.stem, fp.read_text()) for fp in files), codec)
+        for fp in files:
+            fp.unlink()
+        return [fp.stem for fp in files]
+
+    def remove(self, uids):
+        """
+        Remove games from the indexes of their segments.
+
+        The records stay in their packs until the archive is compacted.
+        """
+        uids = set(uids) & set(self._games)
+        for name in {self._games[uid][0] for uid in uids}:
+            index = self._segments[name]
+            for uid in uids & set(index['games']):
+                del index['games'][uid]
+                del self._games[uid]
+            io.atomic_write(self._directory.joinpath(name + '.idx'),
+                            json.dumps(index))
+        return sorted(uids)
+
+    def compact(self, codec='lzma'):
+        """Merge every segment into a single segment."""
+        old = list(self._segments)
+        if len(old) < 2:
+            return old[0] if old else None
+        records = [(uid, self.read(uid)) for uid in self._games]
+        self._games, self._segments = {}, {}
+        name = self.pack(records, codec)
+        for segment in old:
+            self._directory.joinpath(segment + '.idx').unlink()
+            self._directory.joinpath(segment + '.pack').unlink()
+        return name
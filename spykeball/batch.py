@@ -0,0 +1,114 @@
+"""Batch Scoring Module."""
+
+__all__ = ['BatchException', 'BatchResult', 'load_manifest', 'score',
+           'score_batch']
+
+import json
+import os
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from time import perf_counter
+
+from . import touch
+from . import util
+
+from .game import Game
+from .model import DefaultStatModel
+from .player import Player, PlayerMap
+
+
+BatchResult = namedtuple('BatchResult', ['UID', 'record', 'stats', 'rallies'])
+
+
+class BatchException(Exception):
+    """Raise an exception about a batch."""
+
+
+def load_manifest(fp):
+    """
+    Load a batch manifest.
+
+    The manifest is a JSON list of games, each with the four player UIDs and
+    the touchmap file of the game. Relative paths are resolved against the
+    directory of the manifest::
+
+        [{"players": ["P-...", "P-...", "P-...", "P-..."],
+          "actions": "game000.txt"}]
+    """
+    root = Path(fp).parent
+    with open(fp) as file:
+        entries = json.load(file)
+
+    util.typecheck(entries, list, error=BatchException,
+                   msg="Manifest must be a list of games.")
+
+    manifest = []
+    for entry in entries:
+        if not util.haskeys(entry, 'players', 'actions'):
+            raise BatchException("Manifest entry needs 'players' and "
+                                 "'actions'.", entry)
+        if len(entry['players']) != 4:
+            raise BatchException("Manifest entry needs four players.", entry)
+        manifest.append((tuple(entry['players']),
+                         root.joinpath(entry['actions'])))
+    return manifest
+
+
+def score(game_uid, playermap, fp, stat_model=DefaultStatModel, teams=None):
+    """
+    Parse, play and score a touchmap file without touching the players.
+
+    If 'teams' is given, it replaces the encoded teams of the game record.
+    """
+    rallies = touch.read(fp)
+    game = Game(playermap, rallies, stat_model=stat_model,
+                object_uid=game_uid)
+    game.play(save_stats=False)
+    stats = tuple(game.player_stat(p) for p in game.players)
+    data = game.to_json()
+    if teams is not None:
+        data['teams'] = teams
+    record = json.dumps(data, default=lambda o: o.to_json(), indent=4)
+    return BatchResult(game.UID, record, stats, len(rallies))
+
+
+def _score_remote(game_uid, players, fp, stat_model):
+    """Score a game in a worker process from the JSON of its players."""
+    playermap = PlayerMap(*(Player(p['name']) for p in players))
+    teams = {'home': players[:2], 'away': players[2:]}
+    return score(game_uid, playermap, fp, stat_model, teams=teams)
+
+
+def score_batch(manifest, players, jobs=None, stat_model=DefaultStatModel):
+    """
+    Score every game of a manifest.
+
+    'players' maps each player UID to its loaded Player, so that each player
+    is loaded once per batch. Games are scored in 'jobs' worker processes and
+    the stats of each game are added to its players. Return the results in
+    manifest order together with the elapsed time.
+    """
+    start = perf_counter()
+    uids = [Game.generate_uid() for _ in manifest]
+
+    if jobs == 1:
+        results = [score(uid, PlayerMap(*(players[p] for p in pids)), fp,
+                         stat_model)
+                   for uid, (pids, fp) in zip(uids, manifest)]
+    else:
+        jobs = jobs or os.cpu_count()
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(_score_remote, uid,
+                                [players[p].to_json() for p in pids],
+                                fp, stat_model)
+                for uid, (pids, fp) in zip(uids, manifest)]
+            results = [f.result() for f in futures]
+
+    for (pids, _), result in zip(manifest, results):
+        for pid, stat in zip(pids, result.stats):
+            players[pid].add_stat(result.UID, stat, stat_model)
+
+    return results, perf_counter() - start
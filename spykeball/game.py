@@ -1,10 +1,16 @@
 """Game Package."""
 
-__all__ = ['Team', 'GameException', 'Game']
+__all__ = ['Team', 'Outcome', 'GameResult', 'GameException', 'Timeline',
+           'Game', 'content_hash', 'score']
 
-from collections import namedtuple
+import hashlib
+
+from array import array
+from collections import defaultdict, namedtuple
+from itertools import permutations
 
 from . import io
+from . import metrics
 from . import util
 from . import touch
 
@@ -12,33 +18,98 @@ from .io import JSONKeyError
 from .player import PlayerException
 from .touch import RallyException
 
-from .player import Player, PlayerMap
-from .model import StatModel, DefaultStatModel
+from .player import Player, PlayerMap, Roster
+from .model import ComponentIndex, StatModel, DefaultStatModel
 
 
 Team = namedtuple('Team', ['p1', 'p2'])
 
+Outcome = namedtuple('Outcome', ['players', 'score', 'winner', 'stats'])
+
+GameResult = namedtuple('GameResult', ['UID', 'players', 'score', 'winner',
+                                       'timeline', 'stats'])
+
 
 class GameException(Exception):
     """Raise an exception about a game."""
 
 
+class Timeline(io.JSONSerializable):
+    """Point by point score of a game indexed by rally."""
+
+    SIDES = ('home', 'away')
+
+    def __init__(self, winners=()):
+        """Initialize Timeline from the side which won each rally."""
+        self._winners = array('b')
+        self._home = array('l', [0])
+        self._away = array('l', [0])
+        for winner in winners:
+            self.append(winner)
+
+    def __len__(self):
+        """Return the number of rallies."""
+        return len(self._winners)
+
+    def append(self, winner):
+        """Add a rally won by 'winner', either 'home' or 'away'."""
+        side = self.SIDES.index(winner)
+        self._winners.append(side)
+        self._home.append(self._home[-1] + (side == 0))
+        self._away.append(self._away[-1] + (side == 1))
+
+    def winner(self, rally):
+        """Return the side which won the rally."""
+        return self.SIDES[self._winners[rally]]
+
+    def serving(self, rally):
+        """Return the side which served the rally."""
+        if rally < 0:
+            rally += len(self)
+        if not 0 <= rally < len(self):
+            raise IndexError("Rally index out of range.", rally)
+        return 'home' if rally == 0 else self.SIDES[self._winners[rally - 1]]
+
+    def score_at(self, rally):
+        """Return the score after the rally."""
+        if rally < 0:
+            rally += len(self)
+        if not 0 <= rally < len(self):
+            raise IndexError("Rally index out of range.", rally)
+        return {'home': self._home[rally + 1], 'away': self._away[rally + 1]}
+
+    def points(self, start=0, stop=None):
+        """Return the points won by each side in rallies [start, stop)."""
+        start, stop, _ = slice(start, stop).indices(len(self))
+        stop = max(start, stop)
+        return {'home': self._home[stop] - self._home[start],
+                'away': self._away[stop] - self._away[start]}
+
+    def to_json(self):
+        """Encode the object into valid JSON."""
+        return ''.join('ha'[w] for w in self._winners)
+
+    @classmethod
+    def from_json(cls, data):
+        """Decode the object from valid JSON."""
+        util.typecheck(data, str)
+        return cls(cls.SIDES['ha'.index(w)] for w in data)
+
+
 class Game(util.UIDObject, io.JSONSerializable):
     """Game Object."""
 
     def __init__(self, playermap, actions=None, stat_model=DefaultStatModel,
                  object_uid=None, autoplay=False):
         """Initialize Game Object."""
-        self.players = playermap
+        self._roster = Roster()
+        self._played = False
         self._stat_model = stat_model
         # convert to defaultdict?
         self._stats = {
-            playermap.p1: None,
-            playermap.p2: None,
-            playermap.p3: None,
-            playermap.p4: None,
             'score': {'home': None, 'away': None}, 'winner': None
         }
+        self.players = playermap
         self.actions = actions
         self._index = 0
 
@@ -54,17 +125,11 @@ class Game(util.UIDObject, io.JSONSerializable):
 
     def __iter__(self):
         """Return iterator object for Game."""
-        return self
-
-    def __next__(self):
-        """Return the next item in the iterator."""
-        if not self._rallylist:
-            raise StopIteration
-        return next(self._rallylist)
+        return iter(self._rallylist if self._rallylist else ())
 
     def __len__(self):
         """Return length of the game."""
-        return len(list(self._rallylist)) if self._rallylist else 0
+        return len(self._rallylist) if self._rallylist else 0
 
     def __contains__(self, item):
         """Check if player is in the game or if touchmap is in the game."""
@@ -90,15 +155,14 @@ class Game(util.UIDObject, io.JSONSerializable):
                 raise PlayerException("Player '{}' not in Game.".format(index))
             participant_actions = {'actor': [], 'target': []}
             for rally in self._rallylist:
-                participant_actions['actor'] = list(
-                    rally_select_actor(rally, index))
-                participant_actions['target'] = list(
-                    rally_select_target(rally, index))
+                participant_actions['actor'].extend(
+                    touch.rally_select_actor(rally, index))
+                participant_actions['target'].extend(
+                    touch.rally_select_target(rally, index))
             return participant_actions
         elif isinstance(index, str):
             if index in ('p1', 'p2', 'p3', 'p4'):
-                # fix
-                return self._players[index]
+                return getattr(self._players, index)
             elif index in self._rallylist_strings:
                 return self._rallylist[self._rallylist_strings.index(index)]
             else:
@@ -118,21 +182,16 @@ class Game(util.UIDObject, io.JSONSerializable):
         elif isinstance(index, str):
             util.typecheck(value, Player)
             if index in ('p1', 'p2', 'p3', 'p4'):
-                old_actions = self[self._players[index]]
-                for play in old_actions['actor']:
-                    for action in play:
-                        action.actor = value
-                for play in old_actions['target']:
-                    for action in play:
-                        action.target = value
-                self._players[index] = value
+                self._bind_players(self._players._replace(**{index: value}))
             else:
                 raise IndexError("Object '{}' not in Game.".format(index))
         elif isinstance(index, int):
             if isinstance(value, str):
-                self._rallylist[index] = touch.parse_point(value,
-                                                           self._players)
-                self._rallylist_strings[index] = value
+                if self._rallylist_strings is None:
+                    raise GameException("Game has no rally strings.", self)
+                self._rallylist[index] = value
+                self._serving = None
+                self._reset_game_flags()
             elif isinstance(value, touch.Touch):
                 self._rallylist[index] = value
                 # self._rallylist_strings[index] = touch.unparse_point(value)
@@ -142,11 +201,34 @@ class Game(util.UIDObject, io.JSONSerializable):
         else:
             raise util.default_typeerror(index, int, str, Player)
 
+    def _bind_players(self, playermap):
+        """
+        Bind the players to the Roster shared by every parsed touch.
+
+        Substituting players takes constant time: the score and timeline are
+        kept, while the stats are recalculated for the new players.
+        """
+        self._players = playermap
+        self._roster.rebind(playermap)
+        self._stats_calculated = False
+        self._stats_saved = False
+        self._component_index = None
+
+        stats = {k: v for k, v in self._stats.items() if isinstance(k, str)}
+        stats.update(dict.fromkeys(playermap))
+        if self._played:
+            score = stats['score']
+            stats['winner'] = (self.home_team if score['home'] > score['away']
+                               else self.away_team)
+        self._stats = stats
+
     def _reset_game_flags(self):
         """Reset the game flags."""
         self._played = False
         self._stats_calculated = False
         self._stats_saved = False
+        self._timeline = None
+        self._component_index = None
 
     @property
     def p1(self):
@@ -156,10 +238,10 @@ class Game(util.UIDObject, io.JSONSerializable):
     @p1.setter
     def p1(self, other):
         """Set Player 1."""
-        self._players = PlayerMap(other,
-                                  self._players.p2,
-                                  self._players.p3,
-                                  self._players.p4)
+        self._bind_players(PlayerMap(other,
+                                     self._players.p2,
+                                     self._players.p3,
+                                     self._players.p4))
 
     @property
     def p2(self):
@@ -169,10 +251,10 @@ class Game(util.UIDObject, io.JSONSerializable):
     @p2.setter
     def p2(self, other):
         """Set Player 2."""
-        self._players = PlayerMap(self._players.p1,
-                                  other,
-                                  self._players.p3,
-                                  self._players.p4)
+        self._bind_players(PlayerMap(self._players.p1,
+                                     other,
+                                     self._players.p3,
+                                     self._players.p4))
 
     @property
     def p3(self):
@@ -182,10 +264,10 @@ class Game(util.UIDObject, io.JSONSerializable):
     @p3.setter
     def p3(self, other):
         """Set Player 3."""
-        self._players = PlayerMap(self._players.p1,
-                                  self._players.p2,
-                                  other,
-                                  self._players.p4)
+        self._bind_players(PlayerMap(self._players.p1,
+                                     self._players.p2,
+                                     other,
+                                     self._players.p4))
 
     @property
     def p4(self):
@@ -195,10 +277,10 @@ class Game(util.UIDObject, io.JSONSerializable):
     @p4.setter
     def p4(self, other):
         """Set Player 4."""
-        self._players = PlayerMap(self._players.p1,
-                                  self._players.p2,
-                                  self._players.p3,
-                                  other)
+        self._bind_players(PlayerMap(self._players.p1,
+                                     self._players.p2,
+                                     self._players.p3,
+                                     other))
 
     @property
     def players(self):
@@ -210,9 +292,10 @@ class Game(util.UIDObject, io.JSONSerializable):
         """Set the players."""
         util.typecheck(ps, list, tuple, dict)
         if isinstance(ps, (list, tuple)) and len(ps) == 4:
-            self._players = PlayerMap(ps[0], ps[1], ps[2], ps[3])
+            self._bind_players(PlayerMap(ps[0], ps[1], ps[2], ps[3]))
         elif util.haskeys(ps, 'p1', 'p2', 'p3', 'p4', error=KeyError):
-            self._players = PlayerMap(ps['p1'], ps['p2'], ps['p3'], ps['p4'])
+            self._bind_players(PlayerMap(ps['p1'], ps['p2'],
+                                         ps['p3'], ps['p4']))
 
     @property
     def home_team(self):
@@ -222,10 +305,10 @@ class Game(util.UIDObject, io.JSONSerializable):
     @home_team.setter
     def home_team(self, other):
         """Set the home team."""
-        self._players = PlayerMap(other[0],
-                                  other[1],
-                                  self._players.p3,
-                                  self._players.p4)
+        self._bind_players(PlayerMap(other[0],
+                                     other[1],
+                                     self._players.p3,
+                                     self._players.p4))
 
     @property
     def away_team(self):
@@ -235,10 +318,10 @@ class Game(util.UIDObject, io.JSONSerializable):
     @away_team.setter
     def away_team(self, other):
         """Set the away team."""
-        self._players = PlayerMap(self._players.p1,
-                                  self._players.p2,
-                                  other[0],
-                                  other[1])
+        self._bind_players(PlayerMap(self._players.p1,
+                                     self._players.p2,
+                                     other[0],
+                                     other[1]))
 
     @property
     def stat_model(self):
@@ -251,6 +334,13 @@ class Game(util.UIDObject, io.JSONSerializable):
         self._stat_model = other
         self._stats_calculated = False
 
+    @property
+    def _rallylist_strings(self):
+        """Return the rally strings of the game, if it was given strings."""
+        if isinstance(self._rallylist, touch.RallyList):
+            return self._rallylist.strings
+        return None
+
     @property
     def actions(self):
         """Return the action list."""
@@ -258,20 +348,58 @@ class Game(util.UIDObject, io.JSONSerializable):
 
     @actions.setter
     def actions(self, other):
-        """Set the action list."""
-        if util.isinnertype(other, str):
-            self._rallylist_strings = other
-            other = touch.parse(other, self._players)
-            self._parsed = True
+        """
+        Set the action list.
+
+        Rally strings are kept in a RallyList and each rally is parsed when
+        its touches are first requested.
+        """
+        if other is not None and not isinstance(other, (list, tuple)):
+            other = list(other)
+        if other is None:
+            pass
+        elif util.isinnertype(other, str):
+            other = touch.RallyList(other, self._roster)
         elif util.isinnertype(other, touch.Rally):
-            other = touch.inject(other, self._players)
-            self._parsed = True
-        elif other is None:
-            self._parsed = False
+            other = list(touch.inject(other, self._roster))
         else:
             raise util.default_typeerror(other, list, tuple, type(None))
         self._rallylist = other
+        self._serving = None
+        self._reset_game_flags()
+
+    def append(self, rally):
+        """
+        Parse a rally string and add it to the end of the game.
+
+        The rally is parsed and its serving team checked against the winner
+        of the previous rally before the game is changed, so an invalid rally
+        leaves the game as it was.
+        """
+        util.typecheck(rally, str)
+        parsed = touch.rally_parse(rally, self._roster)
+        if self._rallylist is None:
+            self._rallylist = touch.RallyList([], self._roster)
+        elif self._rallylist_strings is None:
+            raise GameException("Game has no rally strings to append to.",
+                                self)
+        serving = self._serving
+        if serving is None:
+            serving = 0
+            for previous in self._rallylist:
+                serving = _rally_winner(previous, self._players, serving)
+        serving = _rally_winner(parsed, self._players, serving)
+        self._rallylist.append(rally, parsed)
+        self._serving = serving
         self._reset_game_flags()
+        return parsed
+
+    @property
+    def content_hash(self):
+        """Return the hash of the players and rally strings of the game."""
+        if self._rallylist_strings is None:
+            raise GameException("Game has no rally strings to hash.", self)
+        return content_hash(self._players, self._rallylist_strings)
 
     @property
     def played(self):
@@ -290,8 +418,10 @@ class Game(util.UIDObject, io.JSONSerializable):
 
     @property
     def parsed(self):
-        """Return true if the touches of the game are parsed."""
-        return self._parsed
+        """Return true if the touches of every rally are parsed."""
+        if isinstance(self._rallylist, touch.RallyList):
+            return self._rallylist.parsed == len(self._rallylist)
+        return self._rallylist is not None
 
     @property
     def winner(self):
@@ -308,6 +438,12 @@ class Game(util.UIDObject, io.JSONSerializable):
         """Return stats of the game."""
         return self._stats
 
+    @property
+    def timeline(self):
+        """Return the point by point timeline of the game."""
+        return self._timeline
+
+    @metrics.timed('play')
     def play(self, *touches, save_stats=True):
         """Perform all touches from the game."""
         if len(touches) == 1:
@@ -324,30 +460,12 @@ class Game(util.UIDObject, io.JSONSerializable):
             if self._rallylist is None:
                 raise GameException("No touches registered.", self)
 
-            service = self.home_team
-            other = self.away_team
-            score = {service: 0, other: 0}
-
-            for rally in self:
-                if rally.touches[0].actor not in service:
-                    raise RallyException("Wrong team serving.",
-                                         rally, self._rallylist)
-                player = rally.touches[-1].actor
-                success = rally.touches[-1].success
-
-                if ((success and player not in service)
-                        or (not success and player in service)):
-                    service, other = other, service
-                score[service] += 1
-
-            self._stats['winner'] = (service if score[service] > score[other]
-                                     else other)
-
-            self._stats['score'] = {
-                'home': score[self.home_team],
-                'away': score[self.away_team]
-            }
+            points, timeline = _tally(self, self._players)
+            self._stats['score'] = {'home': points[0], 'away': points[1]}
+            self._stats['winner'] = (self.home_team if points[0] > points[1]
+                                     else self.away_team)
 
+            self._timeline = timeline
             self._played = True
 
         if save_stats and not self._stats_saved:
@@ -357,6 +475,65 @@ class Game(util.UIDObject, io.JSONSerializable):
 
         return self._stats
 
+    @property
+    def component_index(self):
+        """Return the prefix summed touch_components of the players."""
+        if self._component_index is None:
+            if self._rallylist is None:
+                raise RallyException("Rally is not parsed.")
+            self._component_index = ComponentIndex(self._players,
+                                                   self._rallylist)
+        return self._component_index
+
+    def stats_for(self, start=0, stop=None, stat_model=None, precision=4):
+        """
+        Evaluate the players over the rallies [start, stop).
+
+        The components of any window are differences of prefix sums, so each
+        call costs the same regardless of the size of the window. The window
+        length is used as the game length by the stat model. Models which
+        only calculate whole games can only evaluate the whole game.
+        """
+        if stat_model is None:
+            stat_model = self._stat_model
+        if not stat_model.windowed:
+            if slice(start, stop).indices(len(self))[:2] != (0, len(self)):
+                raise GameException("Model only calculates whole games.",
+                                    stat_model)
+            return stat_model.calculate(self, precision)
+        index = self.component_index
+        start, stop, _ = slice(start, stop).indices(len(index))
+        components = {p: index.window(p, start, stop) for p in self._players}
+        return stat_model.calculate_components(components,
+                                               max(0, stop - start),
+                                               precision)
+
+    def whatif(self, playermaps=None, stat_model=None, precision=4):
+        """
+        Evaluate the game for each of the playermaps.
+
+        Touches refer to players by slot, so the score, the winning side and
+        the stats of each slot do not depend on who plays in it. The game is
+        scored once with 'score', without being played, and each playermap
+        is an assignment of those results to players. Every Outcome has its
+        own score and stats. If 'playermaps' is None, every lineup of the
+        current players is evaluated. Return an Outcome for each playermap.
+        """
+        if playermaps is None:
+            playermaps = permutations(self._players)
+        result = score(self, stat_model, precision)
+        slot_stats = [result.stats[p] for p in result.players]
+        home_won = result.score['home'] > result.score['away']
+
+        table = []
+        for playermap in playermaps:
+            playermap = PlayerMap(*playermap)
+            winner = Team(*playermap[:2]) if home_won else Team(*playermap[2:])
+            table.append(Outcome(
+                playermap, dict(result.score), winner,
+                {p: dict(stat) for p, stat in zip(playermap, slot_stats)}))
+        return table
+
     def player_stat(self, player, stat_model=None):
         """Evaluate a player based on their performance in the game."""
         if not self._played:
@@ -367,7 +544,8 @@ class Game(util.UIDObject, io.JSONSerializable):
             self._stats_calculated = False
 
         if not self._stats_calculated:
-            self._stats.update(self._stat_model.calculate(self))
+            with metrics.timer('calculate', model=self._stat_model.__name__):
+                self._stats.update(self._stat_model.calculate(self))
             self._stats_calculated = True
 
         stat = self._stats.get(player)
@@ -393,50 +571,116 @@ class Game(util.UIDObject, io.JSONSerializable):
                 'away': self.score['away']
             }
 
+            game['timeline'] = self._timeline.to_json()
+
             if with_stats:
-                game['stats'] = {k: self.player_stat(self._players[k]) for k in
-                                 self._players}
+                game['stats'] = {k: self.player_stat(p) for k, p in
+                                 self._players._asdict().items()}
                 game['stats']['model'] = self._stat_model
 
         return game
 
+    @staticmethod
+    def _check_json(data, game_played=True, with_stats=True):
+        """
+        Validate the structure of a JSON game in one pass.
+
+        Return true if the stored results of the game are complete. Records
+        saved before games had a timeline are not complete, so their stored
+        results are dropped and rebuilt when the game is played.
+        """
+        if not isinstance(data, dict):
+            raise util.default_typeerror(data, dict)
+        if not ('UID' in data and 'teams' in data and 'actions' in data):
+            raise JSONKeyError(data, ('UID', 'teams', 'actions'))
+        teams = data['teams']
+        if not (isinstance(teams, dict) and len(teams.get('home', ())) == 2
+                and len(teams.get('away', ())) == 2):
+            raise JSONKeyError(data, ('teams.home', 'teams.away'))
+        for player in teams['home'] + teams['away']:
+            if not (isinstance(player, dict) and 'UID' in player
+                    and 'name' in player):
+                raise JSONKeyError(data, ('teams.UID', 'teams.name'))
+        if not isinstance(data['actions'], (list, type(None))):
+            raise util.default_typeerror(data['actions'], list, type(None))
+
+        if not (game_played and 'score' in data and 'winner' in data
+                and 'timeline' in data):
+            return False
+        stats = data.get('stats')
+        if with_stats and stats is not None:
+            if not all(k in stats for k in ('p1', 'p2', 'p3', 'p4', 'model')):
+                raise JSONKeyError(stats, ('p1', 'p2', 'p3', 'p4', 'model'))
+        return True
+
     @classmethod
-    def from_json(cls, data, game_played=True, with_stats=True):
-        """Decode the object from valid JSON."""
-        game = None
-        if util.haskeys(data, 'UID', 'teams', 'actions', error=JSONKeyError):
-            teams = data['teams']
-            if util.haskeys(teams, 'home', 'away', error=JSONKeyError):
-                playermap = PlayerMap(
-                    Player.from_json(teams['home'][0]),
-                    Player.from_json(teams['home'][1]),
-                    Player.from_json(teams['away'][0]),
-                    Player.from_json(teams['away'][1]),
-                    )
-
-                game = cls(
-                    playermap,
-                    actions=data['actions'],
-                    stat_model=DefaultStatModel,
-                    object_uid=data['UID']
-                    )
-
-                if game_played and util.haskeys(data, 'winner', 'score',
-                                                error=JSONKeyError):
-                    game._stats['winner'] = data['winner']
-                    game._stats['score'] = data['score']
-
-                    if with_stats and util.haskeys(data, 'stats',
-                                                   error=JSONKeyError):
-                        if util.haskeys(data['stats'], 'p1', 'p2', 'p3', 'p4',
-                                        'model', error=JSONKeyError):
-                            game.stat_model = StatModel.from_json(
-                                data['stats']['model'])
+    def from_json(cls, data, game_played=True, with_stats=True,
+                  stat_model=None, players=None, models=None):
+        """
+        Decode the object from valid JSON.
+
+        The record is validated once and, as for any game of rally strings,
+        each rally is parsed only when its touches are requested. A played
+        record keeps its stored score, winner and timeline, and its stored
+        stats are kept when they were calculated with 'stat_model', or with
+        any model if it is None.
+        'players' and 'models' cache the decoded players by UID and the
+        stat models by identifier across records.
+        """
+        complete = cls._check_json(data, game_played, with_stats)
+        if players is None:
+            players = {}
+        if models is None:
+            models = {}
+
+        playermap = []
+        for player in data['teams']['home'] + data['teams']['away']:
+            decoded = players.get(player['UID'])
+            if decoded is None:
+                decoded = players[player['UID']] = Player.from_json(player)
+            playermap.append(decoded)
+
+        game = cls(PlayerMap(*playermap), actions=data['actions'],
+                   stat_model=stat_model or DefaultStatModel,
+                   object_uid=data['UID'])
+        if not complete:
+            return game
+
+        score = data['score']
+        game._stats['score'] = {'home': score['home'], 'away': score['away']}
+        game._stats['winner'] = (game.home_team if data['winner'] == 'home'
+                                 else game.away_team)
+        game._timeline = Timeline.from_json(data['timeline'])
+        game._played = True
+
+        stats = data.get('stats')
+        if with_stats and stats is not None:
+            model_json = stats['model']
+            model_id = model_json.get('UID') or model_json.get('name')
+            model = models.get(model_id)
+            if model is None:
+                model = models[model_id] = StatModel.from_json(model_json)
+            if stat_model is None or stat_model is model:
+                game._stat_model = model
+                for slot, player in zip(('p1', 'p2', 'p3', 'p4'), playermap):
+                    game._stats[player] = stats[slot]
+                game._stats_calculated = True
         return game
 
-    def save(self, fp, game_played=True, with_stats=True):
-        """Save the Game data to a file."""
+    @classmethod
+    def from_json_many(cls, records, game_played=True, with_stats=True,
+                       stat_model=None):
+        """Decode a list of JSON games sharing their players and models."""
+        players, models = {}, {}
+        return [cls.from_json(data, game_played, with_stats, stat_model,
+                              players, models)
+                for data in records]
+
+    def save(self, fp, game_played=True, with_stats=True, index=None):
+        """Save the Game data to a file and its summary to an 'index'."""
         super().save(fp, game_played, with_stats)
+        if index is not None:
+            index.append(self)
 
     @classmethod
     def load(self, fp, game_played=True, with_stats=True):
@@ -446,3 +690,107 @@ class Game(util.UIDObject, io.JSONSerializable):
 
 class GameRegistry(object):
     """Class that holds game objects and records their history."""
+
+
+def content_hash(players, rallies):
+    """
+    Return a canonical hash of a game.
+
+    The hash covers the UIDs of the players in slot order and the rally
+    strings without surrounding whitespace, so the same game submitted under
+    another UID has the same hash.
+    """
+    digest = hashlib.sha256()
+    for player in players:
+        uid = player.UID if isinstance(player, Player) else player
+        digest.update(uid.encode() + b'\0')
+    for rally in rallies:
+        digest.update(rally.strip().encode() + b'\n')
+    return digest.hexdigest()
+
+
+def _slots(act, players):
+    """Return the slot indices of the actor and target of a touch."""
+    if act.roster is not None:
+        actor, target = act.actor_slot, act.target_slot
+        return actor - 1, None if target is None else target - 1
+
+    def index(player):
+        for i, p in enumerate(players):
+            if p is player:
+                return i
+        raise PlayerException("Player is not part of this player list.",
+                              player, players)
+
+    return (index(act.actor),
+            None if act.target is None else index(act.target))
+
+
+def _rally_winner(rally, players, serving):
+    """Return the side which won a rally served by the side 'serving'."""
+    if not rally.touches:
+        raise RallyException("Rally is not parsed.", rally)
+    if _slots(rally.touches[0], players)[0] // 2 != serving:
+        raise RallyException("Wrong team serving.", rally)
+
+    last = rally.touches[-1]
+    if bool(last.success) != (_slots(last, players)[0] // 2 == serving):
+        return 1 - serving
+    return serving
+
+
+def _tally(rallies, players):
+    """Return the points of each side and the Timeline of the rallies."""
+    points = [0, 0]
+    serving = 0
+    timeline = Timeline()
+
+    for rally in rallies:
+        serving = _rally_winner(rally, players, serving)
+        points[serving] += 1
+        timeline.append(Timeline.SIDES[serving])
+
+    return points, timeline
+
+
+def score(game, stat_model=None, precision=4):
+    """
+    Play and score a game without changing its results or its players.
+
+    Parsed rallies are immutable and players are resolved from a snapshot of
+    the game's PlayerMap by slot, so any number of threads may score games,
+    including the same game, concurrently. Rallies parsed on demand are
+    still kept by the game, and threads parsing the same rally store equal
+    results. Models which only calculate whole games are given the game.
+    Substituting the players of a game while it is being scored is not
+    supported.
+    """
+    players = game.players
+    rallies = game.actions
+    if rallies is None:
+        raise GameException("No touches registered.", game)
+    rallies = tuple(rallies)
+    if stat_model is None:
+        stat_model = game.stat_model
+
+    points, timeline = _tally(rallies, players)
+    if stat_model.windowed:
+        counts = [defaultdict(int) for _ in players]
+        for rally in rallies:
+            for act in rally.touches:
+                actor, target = _slots(act, players)
+                StatModel.count_performed(counts[actor], act)
+                if target is not None:
+                    StatModel.count_recieved(counts[target], act)
+
+        components = {p: StatModel.derive_components(c)
+                      for p, c in zip(players, counts)}
+        stats = stat_model.calculate_components(components, len(rallies),
+                                                precision)
+    else:
+        stats = stat_model.calculate(game, precision)
+
+    return GameResult(
+        game.UID, players, {'home': points[0], 'away': points[1]},
+        Team(*players[:2]) if points[0] > points[1] else Team(*players[2:]),
+        timeline, {p: stats[p] for p in players})
@@ -1,15 +1,19 @@
 """Spykeball IO Module."""
 
-__all__ = ['readsplitby', 'ext_matches', 'findfile', 'JSONKeyError',
-           'JSONSerializable']
+__all__ = ['readsplitby', 'ext_matches', 'findfile', 'atomic_write',
+           'JSONKeyError', 'JSONSerializable']
 
 import json
+import os
+import tempfile
 
 from abc import ABCMeta, abstractmethod
 
+from . import metrics
 from . import util
 
 
+@metrics.timed('readsplitby')
 def readsplitby(fp, *delimeters, buffer_size=4096):
     """Read a file and yield the content separated by delimeters."""
     if len(delimeters) == 0:
@@ -48,6 +52,46 @@ def findfile(fp, fail='', strip=False, encoding='utf-8'):
         return fail
 
 
+def _umask():
+    """Return the file mode creation mask of the process."""
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+UMASK = _umask()
+
+
+def atomic_write(fp, data, mode='w', sync=True):
+    """
+    Replace the contents of a file with 'data' in a single step.
+
+    The data is written to a temporary file next to 'fp', which then
+    replaces it, so readers see either the old or the new file. The file
+    keeps its permissions, and a new file gets those of 'open'. With 'sync',
+    the data is on disk before the file is replaced.
+    """
+    fp = str(fp)
+    try:
+        permissions = os.stat(fp).st_mode & 0o7777
+    except FileNotFoundError:
+        permissions = 0o666 & ~UMASK
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(fp) + '.',
+                               suffix='.tmp', dir=os.path.dirname(fp) or '.')
+    try:
+        os.chmod(tmp, permissions)
+        with open(fd, mode) as file:
+            file.write(data)
+            if sync:
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(tmp, fp)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
 class JSONKeyError(Exception):
     """Raise if a KeyError occurs during JSON Processing."""
 
@@ -66,6 +110,8 @@ class JSONKeyError(Exception):
 class JSONSerializable(metaclass=ABCMeta):
     """Creates a JSON Serializable Object."""
 
+    __slots__ = ()
+
     @abstractmethod
     def to_json(self, *args, **kwargs):
         """Encode the object into valid JSON."""
@@ -79,13 +125,16 @@ class JSONSerializable(metaclass=ABCMeta):
         """Representation of the Object."""
         return str(self.to_json())
 
-    def save(self, fp, *args, **kwargs):
-        """Save JSON data using JSONSerializable Structure."""
+    def dumps(self, *args, **kwargs):
+        """Return the JSON text of the object."""
         def serializer(o):
             return o.to_json(*args, **kwargs) if o is self else o.to_json()
 
-        with open(fp, "w+") as file:
-            json.dump(self, file, default=serializer, indent=4)
+        return json.dumps(self, default=serializer, indent=4)
+
+    def save(self, fp, *args, **kwargs):
+        """Save JSON data using JSONSerializable Structure atomically."""
+        atomic_write(fp, self.dumps(*args, **kwargs))
 
     @classmethod
     def load(cls, fp, *args, **kwargs):
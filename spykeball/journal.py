@@ -0,0 +1,200 @@
+"""Live Game Journal."""
+
+__all__ = ['JournalException', 'Journal']
+
+import json
+import os
+import zlib
+
+from pathlib import Path
+from time import perf_counter
+
+from . import io
+from . import util
+
+from .game import Game
+
+
+class JournalException(Exception):
+    """Raise an exception about a journal."""
+
+
+class Journal(object):
+    """
+    Append-only rally log of a live game with periodic snapshots.
+
+    Each rally is appended to '<UID>.log' as one line holding its sequence
+    number, the rally string and a CRC32 of both. The log is synced to disk
+    every 'sync_every' rallies or once 'sync_interval' seconds have passed
+    since the last sync, so a crash loses at most the unsynced tail. Every
+    'snapshot_every' rallies the game is written atomically to '<UID>.json'
+    and the log is truncated. Recovery loads the snapshot and replays the
+    valid records of the log after it.
+    """
+
+    def __init__(self, game, directory, sync_every=32, sync_interval=0.1,
+                 snapshot_every=256):
+        """Initialize Journal of a game in a directory."""
+        self._game = game
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.snapshot_every = snapshot_every
+
+        self._fd = os.open(str(self.log_path),
+                           os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._unsynced = 0
+        self._last_sync = perf_counter()
+        self._since_snapshot = 0
+        if not self.snapshot_path.exists():
+            self.snapshot()
+
+    def __enter__(self):
+        """Enter the context."""
+        return self
+
+    def __exit__(self, *exc):
+        """Sync and close the journal."""
+        self.close()
+        return False
+
+    def __len__(self):
+        """Return the number of rallies of the game."""
+        return len(self._game)
+
+    @property
+    def game(self):
+        """Return the game being journaled."""
+        return self._game
+
+    @property
+    def log_path(self):
+        """Return the path of the rally log."""
+        return self._directory.joinpath(self._game.UID + '.log')
+
+    @property
+    def snapshot_path(self):
+        """Return the path of the game snapshot."""
+        return self._directory.joinpath(self._game.UID + '.json')
+
+    @property
+    def closed(self):
+        """Return true if the journal has been closed."""
+        return self._fd is None
+
+    @staticmethod
+    def _record(sequence, rally):
+        """Return the log line of a rally."""
+        body = '{}\t{}'.format(sequence, rally)
+        return '{}\t{:08x}\n'.format(
+            body, zlib.crc32(body.encode())).encode()
+
+    @staticmethod
+    def _parse_record(line):
+        """Return the sequence number and rally of a log line or None."""
+        try:
+            body, crc = line.decode().rsplit('\t', 1)
+            if int(crc, 16) != zlib.crc32(body.encode()):
+                return None
+            sequence, rally = body.split('\t', 1)
+            return int(sequence), rally
+        except ValueError:
+            return None
+
+    def append(self, rally):
+        """Add a rally to the game and the log."""
+        if self.closed:
+            raise JournalException("Journal is closed.", self.log_path)
+        sequence = len(self._game)
+        self._game.append(rally)
+        os.write(self._fd, self._record(sequence, rally))
+
+        self._unsynced += 1
+        self._since_snapshot += 1
+        if (self._unsynced >= self.sync_every
+                or perf_counter() - self._last_sync >= self.sync_interval):
+            self.sync()
+        if self._since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    def sync(self):
+        """Flush the appended records to disk."""
+        if self._unsynced:
+            os.fsync(self._fd)
+            self._unsynced = 0
+        self._last_sync = perf_counter()
+
+    def snapshot(self):
+        """Write the game to its snapshot and truncate the log."""
+        self.sync()
+        data = {'rallies': len(self._game),
+                'game': self._game.to_json(game_played=False,
+                                           with_stats=False)}
+        io.atomic_write(self.snapshot_path, json.dumps(
+            data, default=lambda o: o.to_json()))
+        os.ftruncate(self._fd, 0)
+        os.fsync(self._fd)
+        self._since_snapshot = 0
+
+    def close(self, snapshot=False):
+        """Sync the log, optionally write a snapshot and close the journal."""
+        if self.closed:
+            return
+        if snapshot:
+            self.snapshot()
+        else:
+            self.sync()
+        os.close(self._fd)
+        self._fd = None
+
+    @classmethod
+    def recover(cls, directory, uid):
+        """
+        Rebuild a game from its snapshot and the valid tail of its log.
+
+        Records already in the snapshot are skipped. Replay stops at the
+        first torn or corrupt record, which is cut from the log along with
+        everything after it.
+        """
+        directory = Path(directory)
+        snapshot = directory.joinpath(uid + '.json')
+        if not snapshot.exists():
+            raise JournalException("No snapshot of the game.", uid)
+
+        with open(snapshot) as file:
+            data = json.load(file)
+        if not util.haskeys(data, 'rallies', 'game'):
+            raise JournalException("Invalid snapshot.", snapshot)
+        game = Game.from_json(data['game'], game_played=False,
+                              with_stats=False)
+
+        log = directory.joinpath(uid + '.log')
+        if not log.exists():
+            return game
+
+        valid = 0
+        with open(log, 'rb') as file:
+            for line in file:
+                record = (cls._parse_record(line)
+                          if line.endswith(b'\n') else None)
+                if record is None:
+                    break
+                sequence, rally = record
+                if sequence >= len(game):
+                    if sequence != len(game):
+                        break
+                    try:
+                        game.append(rally)
+                    except Exception:
+                        break
+                valid += len(line)
+
+        if valid < log.stat().st_size:
+            os.truncate(str(log), valid)
+        return game
+
+    @classmethod
+    def open(cls, directory, uid, **kwargs):
+        """Recover a game and continue journaling it."""
+        return cls(cls.recover(directory, uid), directory, **kwargs)
@@ -0,0 +1,232 @@
+"""Instrumentation Module."""
+
+__all__ = ['Stage', 'is_enabled', 'enable', 'disable', 'reset', 'profile',
+           'record', 'timer', 'timed', 'to_dict', 'to_prometheus']
+
+import functools
+import inspect
+import random
+import threading
+
+from contextlib import contextmanager
+from time import perf_counter
+
+
+SAMPLE_SIZE = 1024
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+_enabled = False
+_lock = threading.Lock()
+_stages = {}
+
+
+class Stage(object):
+    """Count and timings of a single instrumented stage."""
+
+    def __init__(self, name, labels=()):
+        """Initialize an empty Stage."""
+        self.name = name
+        self.labels = labels
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self._samples = []
+        self._rng = random.Random(0)
+
+    def add(self, seconds):
+        """Record a timing, keeping a uniform reservoir of samples."""
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+        if len(self._samples) < SAMPLE_SIZE:
+            self._samples.append(seconds)
+        else:
+            index = self._rng.randrange(self.count)
+            if index < SAMPLE_SIZE:
+                self._samples[index] = seconds
+
+    def quantile(self, q):
+        """Return the 'q' quantile of the sampled timings."""
+        if not self._samples:
+            return None
+        samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def to_dict(self):
+        """Return the stage as a dictionary."""
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.min,
+            'max': self.max,
+            'quantiles': {str(q): self.quantile(q) for q in QUANTILES}
+        }
+
+
+def is_enabled():
+    """Return true if instrumentation is enabled."""
+    return _enabled
+
+
+def enable():
+    """Enable instrumentation."""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Disable instrumentation."""
+    global _enabled
+    _enabled = False
+
+
+def reset():
+    """Remove every recorded stage."""
+    with _lock:
+        _stages.clear()
+
+
+@contextmanager
+def profile(clear=True):
+    """Enable instrumentation for the duration of the context."""
+    previous = _enabled
+    if clear:
+        reset()
+    enable()
+    try:
+        yield
+    finally:
+        if not previous:
+            disable()
+
+
+def record(stage, seconds, **labels):
+    """Record the time spent in a stage."""
+    key = (stage, tuple(sorted(labels.items())))
+    with _lock:
+        entry = _stages.get(key)
+        if entry is None:
+            entry = _stages[key] = Stage(stage, key[1])
+        entry.add(seconds)
+
+
+class _NullTimer(object):
+    """Timer used while instrumentation is disabled."""
+
+    def __enter__(self):
+        """Enter the context."""
+        return self
+
+    def __exit__(self, *exc):
+        """Exit the context."""
+        return False
+
+
+class _Timer(object):
+    """Timer recording the time spent inside its context."""
+
+    def __init__(self, stage, labels):
+        """Initialize Timer."""
+        self.stage = stage
+        self.labels = labels
+
+    def __enter__(self):
+        """Start timing."""
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        """Stop timing and record the stage."""
+        record(self.stage, perf_counter() - self.start, **self.labels)
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(stage, **labels):
+    """Return a context manager timing a stage."""
+    if not _enabled:
+        return _NULL_TIMER
+    return _Timer(stage, labels)
+
+
+def _timed_generator(stage, labels, gen):
+    """Yield from a generator, timing the time spent inside it."""
+    elapsed = 0.0
+    try:
+        while True:
+            start = perf_counter()
+            try:
+                item = next(gen)
+            except StopIteration:
+                return
+            finally:
+                elapsed += perf_counter() - start
+            yield item
+    finally:
+        record(stage, elapsed, **labels)
+
+
+def timed(stage, **labels):
+    """Decorate a function or generator function to time a stage."""
+    def decorator(func):
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not _enabled:
+                    return func(*args, **kwargs)
+                return _timed_generator(stage, labels, func(*args, **kwargs))
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not _enabled:
+                    return func(*args, **kwargs)
+                start = perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    record(stage, perf_counter() - start, **labels)
+        return wrapper
+    return decorator
+
+
+def _label_key(stage):
+    """Return the dictionary key of a stage."""
+    if not stage.labels:
+        return stage.name
+    return '{}[{}]'.format(stage.name, ','.join(
+        '{}={}'.format(k, v) for k, v in stage.labels))
+
+
+def to_dict():
+    """Return the recorded stages as a dictionary."""
+    with _lock:
+        return {_label_key(s): s.to_dict() for s in _stages.values()}
+
+
+def to_prometheus(prefix='spykeball'):
+    """Return the recorded stages in the Prometheus text format."""
+    def labelset(stage, **extra):
+        labels = (('stage', stage.name),) + stage.labels + tuple(extra.items())
+        return '{' + ','.join('{}="{}"'.format(k, v) for k, v in labels) + '}'
+
+    name = prefix + '_stage_seconds'
+    lines = ['# HELP {} Time spent in each stage.'.format(name),
+             '# TYPE {} summary'.format(name)]
+    with _lock:
+        for stage in _stages.values():
+            for q in QUANTILES:
+                lines.append('{}{} {!r}'.format(
+                    name, labelset(stage, quantile=q), stage.quantile(q)))
+            lines.append('{}_sum{} {!r}'.format(
+                name, labelset(stage), stage.total))
+            lines.append('{}_count{} {}'.format(
+                name, labelset(stage), stage.count))
+    return '\n'.join(lines) + '\n'
@@ -1,10 +1,14 @@
 """Statistics Modeling Module."""
 
-__all__ = ['StatModel', 'DefaultStatModel']
+__all__ = ['COMPONENT_KEYS', 'DERIVED_KEYS', 'StatModelMeta', 'StatModel',
+           'ComponentIndex', 'LinearStatModel', 'Model1', 'DefaultStatModel']
 
-from abc import ABCMeta, abstractmethod
+from abc import ABCMeta
+from array import array
 from collections import defaultdict
 
+import numpy as np
+
 from . import io
 from . import util
 
@@ -15,76 +19,127 @@ from .touch import TouchException
 from .touch import Defense, Set, Spike, Service
 
 
-class StatModel(io.JSONSerializable, metaclass=ABCMeta):
-    """Interpret a game."""
+COMPONENT_KEYS = ('serves_made', 'aces', 'serve_total', 'd_touch_r',
+                  'd_touch_nr', 'tough_touch', 'missed_sets',
+                  'spikes_returned', 'missed_spikes', 'spike_total', 'aced')
+
+DERIVED_KEYS = ('serve_ratio', 'spike_ratio', 'missed_total')
+
+
+class StatModelMeta(ABCMeta):
+    """
+    Register every StatModel when its class is created.
+
+    Models are identified by '<name>:<version>', so a model whose formulas
+    change can bump its 'version' and games scored with the old version
+    still resolve to it. The JSON of each model is computed once. Base
+    classes which cannot score games are declared with 'register=False'
+    and are left out of the registry.
+    """
+
+    _registry = {}
+    _latest = {}
+
+    def __new__(mcs, name, bases, attr, register=True, **kwargs):
+        """Create the class and add it to the registry."""
+        cls = super().__new__(mcs, name, bases, attr, **kwargs)
+        if not any(isinstance(base, StatModelMeta) for base in bases):
+            return cls
+        if not register:
+            cls.model_id = None
+            cls._json = {'UID': None, 'name': name, 'version': cls.version}
+            return cls
+
+        model_id = '{}:{}'.format(name, cls.version)
+        if model_id in mcs._registry:
+            raise NameError("No two StatModels can have the same name and "
+                            "version.", model_id)
+        mcs._registry[model_id] = cls
+        latest = mcs._latest.get(name)
+        if latest is None or latest.version < cls.version:
+            mcs._latest[name] = cls
 
-    __stat_model_registry = {}
+        cls.model_id = model_id
+        cls._json = {'UID': model_id, 'name': name, 'version': cls.version}
+        return cls
 
-    def __new__(cls, name, bases, attr):
-        """Add class to the StatModel registry after creation."""
-        model = StatModel.__stat_model_registry.get(name)
+    @classmethod
+    def lookup(mcs, model_id=None, name=None):
+        """Return a model by its identifier or the latest model of a name."""
+        model = mcs._registry.get(model_id)
+        if model is None and name is not None:
+            model = mcs._latest.get(name)
         if model is None:
-            StatModel.__stat_model_registry[name] = cls
-        else:
-            # think about this
-            raise NameError("No two StatModels can have the same name.", name)
-        return super().__new__(name, bases, attr)
+            raise NameError("Model not found.", model_id or name)
+        return model
 
-    @staticmethod
-    def touch_components(game, player):
-        """Return the relevant touch_components for each player."""
-        actions = game[player]
+    @property
+    def registry(cls):
+        """Return the registered models by identifier."""
+        return dict(StatModelMeta._registry)
 
-        if actions is None:
-            raise PlayerException("Player is not part of the Game.",
-                                  player, game)
+    @property
+    def windowed(cls):
+        """Return true if the model can evaluate any window of a game."""
+        return cls.calculate_components is not None
 
-        performed = actions.get('actor')
-        recieved = actions.get('target')
 
-        count = defaultdict(int)
+class StatModel(io.JSONSerializable, metaclass=StatModelMeta):
+    """
+    Interpret a game.
 
-        for act in performed:
-            if isinstance(act, Service):
-                if act.success:
-                    count['serves_made'] += 1
-                    if act.is_ace:
-                        count['aces'] += 1
-                count['serve_total'] += 1
-            elif isinstance(act, Defense):
-                if act.success:
-                    count['d_touch_r'] += 1
-                else:
-                    count['d_touch_nr'] += 1
-                if act.strength == 'w':
-                    count['tough_touch'] += 1
-            elif isinstance(act, Set):
-                if not act.success:
-                    count['missed_sets'] += 1
-                if act.strength == 'w':
-                    count['tough_touch'] += 1
-            elif isinstance(act, Spike):
-                if act.success:
-                    count['spikes_returned'] += 1
-                else:
-                    count['missed_spikes'] += 1
-                count['spike_total'] += 1
-            else:
-                raise TouchException("Action must be a subtype of Touch.", act)
+    Models override either 'calculate', to evaluate whole games, or
+    'calculate_components', to evaluate the touch_components of each player,
+    which also evaluates any window of a game. 'calculate_components' is
+    None for models which only calculate whole games.
+    """
+
+    version = 1
 
-        for act in recieved:
-            if isinstance(act, Service):
+    calculate_components = None
+
+    @staticmethod
+    def count_performed(count, act):
+        """Add a touch performed by a player to its component counts."""
+        if isinstance(act, Service):
+            if act.success:
+                count['serves_made'] += 1
                 if act.is_ace:
-                    count['aced'] += 1
-            elif isinstance(act, Defense):
-                pass
-            elif isinstance(act, Set):
-                pass
-            elif isinstance(act, Spike):
-                pass
+                    count['aces'] += 1
+            count['serve_total'] += 1
+        elif isinstance(act, Defense):
+            if act.success:
+                count['d_touch_r'] += 1
             else:
-                raise TouchException("Action must be a subtype of Touch.", act)
+                count['d_touch_nr'] += 1
+            if act.strength == 'w':
+                count['tough_touch'] += 1
+        elif isinstance(act, Set):
+            if not act.success:
+                count['missed_sets'] += 1
+            if act.strength == 'w':
+                count['tough_touch'] += 1
+        elif isinstance(act, Spike):
+            if act.success:
+                count['spikes_returned'] += 1
+            else:
+                count['missed_spikes'] += 1
+            count['spike_total'] += 1
+        else:
+            raise TouchException("Action must be a subtype of Touch.", act)
+
+    @staticmethod
+    def count_recieved(count, act):
+        """Add a touch recieved by a player to its component counts."""
+        if isinstance(act, Service):
+            if act.is_ace:
+                count['aced'] += 1
+        elif not isinstance(act, (Defense, Set, Spike)):
+            raise TouchException("Action must be a subtype of Touch.", act)
 
+    @staticmethod
+    def derive_components(count):
+        """Add the ratios and totals derived from the component counts."""
         try:
             count['serve_ratio'] = count['serves_made'] / count['serve_total']
         except ArithmeticError:
@@ -100,63 +155,233 @@ class StatModel(io.JSONSerializable, metaclass=ABCMeta):
 
         return count
 
+    @staticmethod
+    def touch_components(game, player):
+        """Return the relevant touch_components for each player."""
+        actions = game[player]
+
+        if actions is None:
+            raise PlayerException("Player is not part of the Game.",
+                                  player, game)
+
+        count = defaultdict(int)
+
+        for act in actions.get('actor'):
+            StatModel.count_performed(count, act)
+
+        for act in actions.get('target'):
+            StatModel.count_recieved(count, act)
+
+        return StatModel.derive_components(count)
+
     @classmethod
-    @abstractmethod
     def calculate(cls, game, precision=4):
         """Perform the stat calculations and register player stat."""
-        return {'p1': None, 'p2': None, 'p3': None, 'p4': None}
+        if not cls.windowed:
+            raise NotImplementedError("StatModel has no calculation.", cls)
+        components = {p: cls.touch_components(game, p) for p in game.players}
+        return cls.calculate_components(components, len(game), precision)
 
     @classmethod
     def to_json(cls):
         """Encode the object into valid JSON."""
-        return {'UID': None, 'name': cls.__name__}
+        return cls._json
 
     @classmethod
     def from_json(cls, data):
-        """Decode the object from valid JSON."""
-        model = None
-        if util.has_keys(data, 'UID', 'name', error=JSONKeyError):
-            model = StatModel.__stat_model_registry.get(data['name'])
-            if model is None:
-                raise NameError("Model not found.", data['name'])
+        """
+        Decode the object from valid JSON.
 
+        Records written before models were versioned have no 'UID' and
+        resolve to the latest version of the named model.
+        """
+        model = None
+        if util.haskeys(data, 'UID', 'name', error=JSONKeyError):
+            model = StatModelMeta.lookup(data['UID'], data['name'])
         return model
 
 
-class Model1(StatModel):
-    """Current Model as of 6/25/17."""
+class ComponentIndex(object):
+    """Prefix sums of each player's touch_components counts by rally."""
+
+    def __init__(self, players, rallies=()):
+        """Initialize ComponentIndex for the players with the rallies."""
+        self._players = tuple(players)
+        self._slot = {p: i for i, p in enumerate(self._players)}
+        self._prefix = [[array('l', [0]) for _ in COMPONENT_KEYS]
+                        for _ in self._players]
+        self._length = 0
+        for rally in rallies:
+            self.append(rally)
+
+    def __len__(self):
+        """Return the number of rallies."""
+        return self._length
+
+    def append(self, rally):
+        """Add the counts of a rally."""
+        counts = [defaultdict(int) for _ in self._players]
+        for act in rally.touches:
+            StatModel.count_performed(counts[self._slot[act.actor]], act)
+            if act.target is not None:
+                StatModel.count_recieved(counts[self._slot[act.target]], act)
+
+        for prefix, count in zip(self._prefix, counts):
+            for column, key in zip(prefix, COMPONENT_KEYS):
+                column.append(column[-1] + count[key])
+        self._length += 1
+
+    def window(self, player, start=0, stop=None):
+        """Return the player's touch_components in rallies [start, stop)."""
+        if player not in self._slot:
+            raise PlayerException("Player is not part of the Game.", player)
+        start, stop, _ = slice(start, stop).indices(self._length)
+        stop = max(start, stop)
+        prefix = self._prefix[self._slot[player]]
+        count = defaultdict(int, ((key, column[stop] - column[start])
+                                  for key, column in zip(COMPONENT_KEYS,
+                                                         prefix)))
+        return StatModel.derive_components(count)
+
+
+class LinearStatModel(StatModel, register=False):
+    """
+    StatModel declared as linear expressions over the touch components.
+
+    'terms' maps each stat to its terms, and each term maps a product of
+    factors to its coefficient, such as ``{'aces': 5.5, '1': 20}``. Factors
+    are the COMPONENT_KEYS, the DERIVED_KEYS, the constant '1' or the name of
+    a hook. 'hooks' maps names to functions of the array of game lengths,
+    which is where nonlinear weights go. The 'total' stat is the sum of the
+    others.
+
+    The terms are compiled once per class into a coefficient matrix, so the
+    stats of any number of component vectors are one matrix multiply.
+    """
+
+    terms = {}
+    hooks = {}
+
+    def __init_subclass__(cls, **kwargs):
+        """Compile the terms of the subclass."""
+        super().__init_subclass__(**kwargs)
+        cls._compile()
 
     @classmethod
-    def calculate(cls, game, precision=4):
-        """Perform the stat calculations and register player stat."""
-        stats = defaultdict(type(None))
-
-        length = len(game)
-        game_length_weight = 1 if length <= 39 else 39.0 / length
+    def _compile(cls):
+        """Compile the terms into factor columns and a coefficient matrix."""
+        columns = COMPONENT_KEYS + DERIVED_KEYS + tuple(cls.hooks)
+        features = sorted({tuple(sorted(term.split('*')))
+                           for terms in cls.terms.values() for term in terms})
+        stat_names = tuple(cls.terms) + ('total',)
+
+        factors = []
+        for feature in features:
+            unknown = set(feature) - set(columns) - {'1'}
+            if unknown:
+                raise NameError("Unknown factors in StatModel terms.",
+                                cls.__name__, sorted(unknown))
+            factors.append([columns.index(f) for f in feature if f != '1'])
+
+        matrix = np.zeros((len(features), len(stat_names)))
+        for j, terms in enumerate(cls.terms.values()):
+            for term, coefficient in terms.items():
+                i = features.index(tuple(sorted(term.split('*'))))
+                matrix[i, j] += coefficient
+        matrix[:, -1] = matrix[:, :-1].sum(axis=1)
+
+        cls._factors = factors
+        cls._coefficients = matrix
+        cls.stat_names = stat_names
 
-        for player in game.players:
-            touchcomp = cls.touch_components(game, player)
-
-            hitting = 20 * (1 - touchcomp['spike_ratio'])
-
-            defense = (touchcomp['d_touch_nr'] + 0.4 * hitting *
-                       touchcomp['d_touch_r']) * game_length_weight
+    @classmethod
+    def feature_matrix(cls, counts, lengths):
+        """
+        Return the value of each compiled feature for each component vector.
+
+        'counts' has a row of COMPONENT_KEYS counts for each player and
+        'lengths' has the length of the game of each row.
+        """
+        counts = np.asarray(counts, dtype=np.float64).reshape(
+            -1, len(COMPONENT_KEYS))
+        lengths = np.broadcast_to(np.asarray(lengths, dtype=np.float64),
+                                  (len(counts),))
+        c = dict(zip(COMPONENT_KEYS, counts.T))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            serve_ratio = np.where(c['serve_total'] > 0,
+                                   c['serves_made'] / c['serve_total'], 0.0)
+            spike_ratio = np.where(c['spike_total'] > 0,
+                                   c['spikes_returned'] / c['spike_total'],
+                                   0.0)
+        missed_total = c['missed_sets'] + c['missed_spikes']
+        hooks = [np.broadcast_to(hook(lengths), (len(counts),))
+                 for hook in cls.hooks.values()]
+
+        base = np.column_stack([counts, serve_ratio, spike_ratio,
+                                missed_total] + hooks)
+        features = np.ones((len(counts), len(cls._factors)))
+        for j, factors in enumerate(cls._factors):
+            for f in factors:
+                features[:, j] *= base[:, f]
+        return features
 
-            serving = 5.5 * touchcomp['aces'] + 15 * touchcomp['serve_ratio']
+    @classmethod
+    def score(cls, counts, lengths):
+        """Return an array with the stat_names of each component vector."""
+        return cls.feature_matrix(counts, lengths) @ cls._coefficients
 
-            cleanliness = (20 - 5 * touchcomp['missed_total'] - 2 * (
-                touchcomp['tough_touch'] + touchcomp['aced']))
+    @classmethod
+    def calculate_components(cls, components, length, precision=4):
+        """Perform the stat calculations from each player's components."""
+        stats = defaultdict(type(None))
+        players = list(components)
+        counts = [[components[p][k] for k in COMPONENT_KEYS] for p in players]
+        values = cls.score(counts, length).round(precision)
+        for player, row in zip(players, values.tolist()):
+            stats[player] = dict(zip(cls.stat_names, row))
+        return stats
 
-            stats[player] = {
-                'hitting': round(hitting, precision),
-                'defense': round(defense, precision),
-                'serving': round(serving, precision),
-                'cleanliness': round(cleanliness, precision),
-                'total': round(hitting + defense + serving + cleanliness,
-                               precision)
-            }
+    @classmethod
+    def calculate_many(cls, games, precision=4):
+        """Return the stats of the players of each game in one multiply."""
+        keys, counts, lengths = [], [], []
+        for game in games:
+            index = game.component_index
+            for player in game.players:
+                window = index.window(player)
+                keys.append((game, player))
+                counts.append([window[k] for k in COMPONENT_KEYS])
+                lengths.append(len(index))
+
+        values = cls.score(counts, lengths).round(precision).tolist()
+        stats = {}
+        for (game, player), row in zip(keys, values):
+            stats.setdefault(game, defaultdict(type(None)))[player] = dict(
+                zip(cls.stat_names, row))
+        return [stats[game] for game in dict.fromkeys(g for g, _ in keys)]
+
+
+def game_length_weight(length):
+    """Return the weight of a game with 'length' rallies."""
+    return 39.0 / np.maximum(length, 39)
+
+
+class Model1(LinearStatModel):
+    """Current Model as of 6/25/17."""
 
-        return stats
+    # defense = (d_touch_nr + 0.4 * hitting * d_touch_r) * game_length_weight
+    terms = {
+        'hitting': {'1': 20, 'spike_ratio': -20},
+        'defense': {'game_length_weight*d_touch_nr': 1,
+                    'game_length_weight*d_touch_r': 8,
+                    'game_length_weight*spike_ratio*d_touch_r': -8},
+        'serving': {'aces': 5.5, 'serve_ratio': 15},
+        'cleanliness': {'1': 20, 'missed_total': -5, 'tough_touch': -2,
+                        'aced': -2}
+    }
+
+    hooks = {'game_length_weight': game_length_weight}
 
 
 class DefaultStatModel(Model1):
@@ -0,0 +1,192 @@
+"""Player Pair Statistics."""
+
+__all__ = ['PairRecord', 'PairStats']
+
+import heapq
+
+from . import io
+from . import util
+
+from .io import JSONKeyError
+from .player import Player
+
+
+class PairRecord(object):
+    """Results of a pair of players from the point of view of the first."""
+
+    __slots__ = ('games', 'wins', 'differential', 'totals')
+
+    def __init__(self, games=0, wins=0, differential=0, totals=(0.0, 0.0)):
+        """Initialize PairRecord."""
+        self.games = games
+        self.wins = wins
+        self.differential = differential
+        self.totals = list(totals)
+
+    def __repr__(self):
+        """Representation of the PairRecord."""
+        return "PairRecord(games={}, wins={}, differential={}, totals={})" \
+            .format(self.games, self.wins, self.differential, self.totals)
+
+    def swapped(self):
+        """Return the record with the totals of the two players swapped."""
+        return PairRecord(self.games, self.wins, self.differential,
+                          self.totals[::-1])
+
+    def flipped(self):
+        """Return the record from the point of view of the second player."""
+        return PairRecord(self.games, self.games - self.wins,
+                          -self.differential, self.totals[::-1])
+
+    @property
+    def win_rate(self):
+        """Return the fraction of games won."""
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def avg_differential(self):
+        """Return the average score differential."""
+        return self.differential / self.games if self.games else 0.0
+
+    @property
+    def avg_total(self):
+        """Return the average combined stat total of the pair."""
+        return sum(self.totals) / self.games if self.games else 0.0
+
+
+class PairStats(io.JSONSerializable):
+    """
+    Partnership and head-to-head records of every pair of players.
+
+    Records are stored sparsely by sorted pairs of player UIDs. Partners
+    share one result, so only their totals depend on the order of the pair,
+    while a head-to-head record is seen from the first player. Each player
+    keeps the set of players it has a record with, so top-k queries only look
+    at a player's own partners or opponents.
+    """
+
+    def __init__(self):
+        """Initialize empty PairStats."""
+        self._partners = {}
+        self._opponents = {}
+        self._partner_links = {}
+        self._opponent_links = {}
+
+    @staticmethod
+    def _key(a, b):
+        """Return the stored key of a pair and whether it is flipped."""
+        a = a.UID if isinstance(a, Player) else a
+        b = b.UID if isinstance(b, Player) else b
+        return ((a, b), False) if a <= b else ((b, a), True)
+
+    @staticmethod
+    def _record(records, links, a, b):
+        """Return the stored record of a pair, creating it if needed."""
+        key, flip = PairStats._key(a, b)
+        record = records.get(key)
+        if record is None:
+            record = records[key] = PairRecord()
+            links.setdefault(key[0], set()).add(key[1])
+            links.setdefault(key[1], set()).add(key[0])
+        return record, flip
+
+    @staticmethod
+    def _add(record, flip, won, differential, totals, shared=False):
+        """
+        Add a game to a record given from the first player's view.
+
+        With 'shared', both players had the same result, so a flipped pair
+        only swaps the totals.
+        """
+        if flip:
+            if not shared:
+                won, differential = not won, -differential
+            totals = totals[::-1]
+        record.games += 1
+        record.wins += int(won)
+        record.differential += differential
+        record.totals[0] += totals[0]
+        record.totals[1] += totals[1]
+
+    def add_game(self, game):
+        """Add a played game to the records of its six pairs of players."""
+        score = game.score
+        if score is None or score['home'] is None:
+            raise ValueError("Game has not been played yet.", game)
+
+        players = [p.UID for p in game.players]
+        totals = [game.player_stat(p).get('total', 0.0)
+                  for p in game.players]
+        differential = score['home'] - score['away']
+        home_won = differential > 0
+
+        for (i, j), won, diff in (((0, 1), home_won, differential),
+                                  ((2, 3), not home_won, -differential)):
+            record, flip = self._record(self._partners, self._partner_links,
+                                        players[i], players[j])
+            self._add(record, flip, won, diff, (totals[i], totals[j]),
+                      shared=True)
+
+        for i in (0, 1):
+            for j in (2, 3):
+                record, flip = self._record(self._opponents,
+                                            self._opponent_links,
+                                            players[i], players[j])
+                self._add(record, flip, home_won, differential,
+                          (totals[i], totals[j]))
+
+    def partners(self, a, b):
+        """Return the partnership record of two players."""
+        key, flip = self._key(a, b)
+        record = self._partners.get(key, PairRecord())
+        return record.swapped() if flip else record
+
+    def head_to_head(self, a, b):
+        """Return the head-to-head record of 'a' against 'b'."""
+        key, flip = self._key(a, b)
+        record = self._opponents.get(key, PairRecord())
+        return record.flipped() if flip else record
+
+    def _top(self, links, lookup, player, k, by, min_games):
+        """Return the top 'k' linked players sorted by a record attribute."""
+        uid = player.UID if isinstance(player, Player) else player
+        records = ((other, lookup(uid, other))
+                   for other in links.get(uid, ()))
+        return heapq.nlargest(k, (r for r in records
+                                  if r[1].games >= min_games),
+                              key=lambda r: getattr(r[1], by))
+
+    def best_partners(self, player, k=5, by='win_rate', min_games=1):
+        """Return the 'k' best partners of a player with their records."""
+        return self._top(self._partner_links, self.partners, player, k, by,
+                         min_games)
+
+    def best_opponents(self, player, k=5, by='win_rate', min_games=1):
+        """Return the 'k' opponents a player does best against."""
+        return self._top(self._opponent_links, self.head_to_head, player, k,
+                         by, min_games)
+
+    def to_json(self):
+        """Encode the object into valid JSON."""
+        def rows(records):
+            return [[a, b, r.games, r.wins, r.differential] + r.totals
+                    for (a, b), r in records.items()]
+
+        return {'partners': rows(self._partners),
+                'opponents': rows(self._opponents)}
+
+    @classmethod
+    def from_json(cls, data):
+        """Decode the object from valid JSON."""
+        pairs = cls()
+        if util.haskeys(data, 'partners', 'opponents', error=JSONKeyError):
+            for name, records, links in (
+                    ('partners', pairs._partners, pairs._partner_links),
+                    ('opponents', pairs._opponents, pairs._opponent_links)):
+                for a, b, games, wins, differential, ta, tb in data[name]:
+                    record, _ = cls._record(records, links, a, b)
+                    record.games = games
+                    record.wins = wins
+                    record.differential = differential
+                    record.totals = [ta, tb]
+        return pairs
@@ -1,6 +1,11 @@
 """Player Library."""
 
-__all__ = ['PlayerMap', 'PlayerException', 'Player']
+__all__ = ['PlayerMap', 'Roster', 'PlayerException', 'PlayerCache',
+           'PLAYER_CACHE', 'Player']
+
+import os
+import threading
+import weakref
 
 from collections import namedtuple
 
@@ -15,6 +20,156 @@ class PlayerException(Exception):
     """Raise an exception about a player."""
 
 
+class Roster(object):
+    """
+    Mutable binding of players to the four slots of a game.
+
+    Parsed touches refer to their players by slot and resolve them through a
+    Roster, so rebinding the Roster substitutes players in every touch that
+    shares it at once.
+    """
+
+    SLOTS = PlayerMap._fields
+
+    __slots__ = ('_players',)
+
+    def __init__(self, p1=None, p2=None, p3=None, p4=None):
+        """Initialize Roster with the players of each slot."""
+        self._players = [p1, p2, p3, p4]
+
+    def __repr__(self):
+        """Representation of the Roster."""
+        return "Roster({})".format(", ".join(
+            "{}={}".format(s, p) for s, p in zip(self.SLOTS, self._players)))
+
+    def __getitem__(self, index):
+        """Return the player of a slot given by position or name."""
+        try:
+            return self._players[index]
+        except TypeError:
+            return self._players[self.SLOTS.index(index)]
+
+    def __iter__(self):
+        """Iterate over the players."""
+        return iter(self._players)
+
+    def __len__(self):
+        """Return the number of slots."""
+        return len(self._players)
+
+    def __contains__(self, player):
+        """Return true if the player is bound to a slot."""
+        return player in self._players
+
+    def __eq__(self, other):
+        """Compare the bound players with a Roster or PlayerMap."""
+        try:
+            return tuple(self._players) == tuple(other)
+        except TypeError:
+            return NotImplemented
+
+    __hash__ = None
+
+    @property
+    def p1(self):
+        """Return Player 1."""
+        return self._players[0]
+
+    @property
+    def p2(self):
+        """Return Player 2."""
+        return self._players[1]
+
+    @property
+    def p3(self):
+        """Return Player 3."""
+        return self._players[2]
+
+    @property
+    def p4(self):
+        """Return Player 4."""
+        return self._players[3]
+
+    @property
+    def playermap(self):
+        """Return the bound players as a PlayerMap."""
+        return PlayerMap(*self._players)
+
+    def slot(self, player):
+        """Return the slot number, from 1 to 4, of a player."""
+        for i, p in enumerate(self._players):
+            if p is player:
+                return i + 1
+        raise PlayerException("Player is not part of this roster.",
+                              player, self)
+
+    def bind(self, slot, player):
+        """Bind a player to a slot given by name or number from 1 to 4."""
+        if isinstance(slot, str):
+            slot = self.SLOTS.index(slot) + 1
+        if not 1 <= slot <= 4:
+            raise IndexError("Slot must be between 1 and 4.", slot)
+        self._players[slot - 1] = player
+
+    def rebind(self, playermap):
+        """Bind the players of a PlayerMap to every slot."""
+        p1, p2, p3, p4 = playermap
+        self._players[:] = (p1, p2, p3, p4)
+
+
+class PlayerCache(object):
+    """Identity map of the live Players of the process keyed by UID."""
+
+    def __init__(self):
+        """Initialize an empty PlayerCache."""
+        self._players = weakref.WeakValueDictionary()
+        self._lock = threading.RLock()
+
+    def __contains__(self, uid):
+        """Return true if a live player has this UID."""
+        return uid in self._players
+
+    def __len__(self):
+        """Return the number of live players."""
+        return len(self._players)
+
+    def get(self, uid, default=None):
+        """Return the live player with this UID."""
+        return self._players.get(uid, default)
+
+    def add(self, player):
+        """Add a player to the cache."""
+        with self._lock:
+            self._players[player.UID] = player
+
+    def get_or_create(self, uid, create):
+        """Return the live player with this UID or the result of 'create'."""
+        with self._lock:
+            player = self._players.get(uid)
+            if player is None:
+                player = create()
+            return player
+
+    def load(self, fp, uid, with_stats=True):
+        """
+        Return the live player with this UID or load it from a file.
+
+        If stats are requested and the live player has not loaded them, the
+        stats of the file are added to it.
+        """
+        with self._lock:
+            player = self._players.get(uid)
+            if player is None:
+                player = Player.load(fp, with_stats=with_stats)
+            elif (with_stats and not player.stats_loaded
+                    and os.path.isfile(fp)):
+                Player.load(fp, with_stats=True)
+            return player
+
+
+PLAYER_CACHE = PlayerCache()
+
+
 class Player(util.UIDObject, io.JSONSerializable):
     """An object representing a Spikeball Player."""
 
@@ -22,7 +177,10 @@ class Player(util.UIDObject, io.JSONSerializable):
         """Initialize Player."""
         self._name = name
         self._stats = {}
+        self._unsaved = set()
+        self._stats_loaded = False
         super().__init__(object_uid)
+        PLAYER_CACHE.add(self)
 
     def __str__(self):
         """Return name of the player or UID if name is empty."""
@@ -43,6 +201,11 @@ class Player(util.UIDObject, io.JSONSerializable):
         """Return stats dictionary of the player."""
         return self._stats
 
+    @property
+    def stats_loaded(self):
+        """Return true if stats have been loaded from a file or segment."""
+        return self._stats_loaded
+
     @property
     def history(self):
         """Return the games that this person has participated in."""
@@ -53,13 +216,45 @@ class Player(util.UIDObject, io.JSONSerializable):
         if not override and (game.UID in self._stats or game.stats_saved):
             return False
 
-        self._stats[game.UID] = {
-            'stat': game.player_stat(self, stat_model=stat_model),
-            'model': game.stat_model
-        }
+        stat = game.player_stat(self, stat_model=stat_model)
+        return self.add_stat(game.UID, stat, game.stat_model, override=True)
+
+    def add_stat(self, game_uid, stat, stat_model, override=False):
+        """Add the stat of a game given by its UID."""
+        if not override and game_uid in self._stats:
+            return False
+
+        self._stats[game_uid] = {'stat': stat, 'model': stat_model}
+        self._unsaved.add(game_uid)
 
         return True
 
+    def remove_stat(self, game_uid):
+        """Remove the stat of a game given by its UID."""
+        self._unsaved.discard(game_uid)
+        return self._stats.pop(game_uid, None) is not None
+
+    def save_stats(self, segment):
+        """
+        Append the stats added since the last call to a StatSegment.
+
+        The cost depends on the number of new games rather than the career of
+        the player.
+        """
+        if not self._unsaved:
+            return 0
+        games = [g for g in self._stats if g in self._unsaved]
+        segment.extend((g, self._stats[g]['stat'], self._stats[g]['model'])
+                       for g in games)
+        self._unsaved.clear()
+        return len(games)
+
+    def load_stats(self, segment):
+        """Add the stats of a StatSegment for games the player lacks."""
+        for game_uid, stat in segment.to_stats().items():
+            self._stats.setdefault(game_uid, stat)
+        self._stats_loaded = True
+
     def to_json(self, with_stats=False):
         """Encode the object into valid JSON."""
         player = {'UID': self.UID, 'name': self._name}
@@ -69,14 +264,24 @@ class Player(util.UIDObject, io.JSONSerializable):
 
     @classmethod
     def from_json(cls, data, with_stats=False):
-        """Decode the object from valid JSON."""
+        """
+        Decode the object from valid JSON.
+
+        If a player with the same UID is alive, it is returned instead of a new
+        one and only the stats of games it does not know are added to it.
+        """
         player = None
-        if util.has_keys(data, 'name', 'UID', error=io.JSONKeyError):
-            player = cls(data['name'], object_uid=data['UID'])
+        if util.haskeys(data, 'name', 'UID', error=io.JSONKeyError):
+            player = PLAYER_CACHE.get_or_create(
+                data['UID'],
+                lambda: cls(data['name'], object_uid=data['UID']))
 
-        if with_stats and util.has_keys(data, 'stats', error=io.JSONKeyError):
-            for game_id, stat in data['stats'].items():
-                player._stats[game_id] = stat
+        if with_stats:
+            for game_id, stat in data.get('stats', {}).items():
+                if game_id not in player._stats:
+                    player._stats[game_id] = stat
+                    player._unsaved.add(game_id)
+            player._stats_loaded = True
 
         return player
 
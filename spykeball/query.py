@@ -0,0 +1,273 @@
+"""Touch Query Module."""
+
+__all__ = ['TOUCH_KINDS', 'QueryException', 'TouchIndex', 'Query', 'Grouped']
+
+import numpy as np
+
+from . import util
+
+from .player import Player
+from .touch import ErrorTouch, Service, Touch
+
+
+TOUCH_KINDS = ('Service', 'Defense', 'Set', 'Spike')
+
+STRENGTHS = (None, 's', 'w')
+
+ERRORS = (None,) + tuple(ErrorTouch)
+
+COLUMNS = {
+    'actor': np.int32,
+    'target': np.int32,
+    'kind': np.int8,
+    'success': np.bool_,
+    'ace': np.bool_,
+    'strength': np.int8,
+    'error': np.int8,
+    'game': np.int32,
+    'rally': np.int32,
+}
+
+
+class QueryException(Exception):
+    """Raise an exception about a query."""
+
+
+class TouchIndex(object):
+    """Columnar index of every touch of a collection of games."""
+
+    def __init__(self, games=()):
+        """Initialize TouchIndex with the touches of the games."""
+        self._players = []
+        self._player_codes = {}
+        self._games = []
+        self._pending = {c: [] for c in COLUMNS}
+        self._columns = {c: np.empty(0, dtype=t) for c, t in COLUMNS.items()}
+        for game in games:
+            self.add_game(game)
+
+    def __len__(self):
+        """Return the number of touches."""
+        return (len(self._columns['actor'])
+                + len(self._pending['actor']))
+
+    @property
+    def games(self):
+        """Return the UIDs of the indexed games in order."""
+        return tuple(self._games)
+
+    @property
+    def players(self):
+        """Return the UIDs of the indexed players."""
+        return tuple(self._players)
+
+    def _player_code(self, player, insert=False):
+        """Return the code of a player given as a Player or a UID."""
+        if player is None:
+            return -1
+        uid = player.UID if isinstance(player, Player) else player
+        code = self._player_codes.get(uid)
+        if code is None:
+            if not insert:
+                return -2
+            code = self._player_codes[uid] = len(self._players)
+            self._players.append(uid)
+        return code
+
+    def add_game(self, game):
+        """Add the touches of a game to the index."""
+        game_code = len(self._games)
+        self._games.append(game.UID)
+        pending = self._pending
+        for rally_number, rally in enumerate(game):
+            for act in rally.touches:
+                pending['actor'].append(self._player_code(act.actor, True))
+                pending['target'].append(self._player_code(act.target, True))
+                pending['kind'].append(
+                    TOUCH_KINDS.index(type(act).__name__))
+                pending['success'].append(bool(act.success))
+                pending['ace'].append(isinstance(act, Service)
+                                      and act.is_ace)
+                pending['strength'].append(STRENGTHS.index(act.strength))
+                pending['error'].append(ERRORS.index(act.error))
+                pending['game'].append(game_code)
+                pending['rally'].append(rally_number)
+
+    def column(self, name):
+        """Return a column of the index as an array."""
+        if name not in COLUMNS:
+            raise QueryException("Unknown column.", name, tuple(COLUMNS))
+        if self._pending['actor']:
+            for c, t in COLUMNS.items():
+                self._columns[c] = np.concatenate(
+                    (self._columns[c], np.array(self._pending[c], dtype=t)))
+                self._pending[c] = []
+        return self._columns[name]
+
+    def encode(self, name, value):
+        """Return the code of a value in a column."""
+        if name in ('actor', 'target'):
+            return self._player_code(value)
+        elif name == 'kind':
+            if isinstance(value, type) and issubclass(value, Touch):
+                value = value.__name__
+            return TOUCH_KINDS.index(value)
+        elif name == 'strength':
+            return STRENGTHS.index(value)
+        elif name == 'error':
+            return ERRORS.index(value)
+        elif name == 'game':
+            return self._games.index(value) if isinstance(value, str) else (
+                self._games.index(value.UID))
+        return value
+
+    def decode(self, name, code):
+        """Return the value of a code in a column."""
+        if name in ('actor', 'target'):
+            return None if code < 0 else self._players[code]
+        elif name == 'kind':
+            return TOUCH_KINDS[code]
+        elif name == 'strength':
+            return STRENGTHS[code]
+        elif name == 'error':
+            return ERRORS[code]
+        elif name == 'game':
+            return self._games[code]
+        elif COLUMNS[name] is np.bool_:
+            return bool(code)
+        return int(code)
+
+    def query(self, **filters):
+        """Return a query over every touch matching the filters."""
+        return Query(self).where(**filters)
+
+    def save(self, fp):
+        """Save the index to a file."""
+        columns = {c: self.column(c) for c in COLUMNS}
+        np.savez_compressed(fp, players=np.array(self._players, dtype=str),
+                            games=np.array(self._games, dtype=str),
+                            **columns)
+
+    @classmethod
+    def load(cls, fp):
+        """Load an index from a file."""
+        index = cls()
+        with np.load(fp) as data:
+            index._players = [str(p) for p in data['players']]
+            index._player_codes = {p: i for i, p in enumerate(index._players)}
+            index._games = [str(g) for g in data['games']]
+            for c in COLUMNS:
+                index._columns[c] = data[c]
+        return index
+
+
+class Query(object):
+    """Filtered view of a TouchIndex evaluated with boolean masks."""
+
+    def __init__(self, index, mask=None):
+        """Initialize Query over the index."""
+        self._index = index
+        if mask is None:
+            mask = np.ones(len(index), dtype=np.bool_)
+        self._mask = mask
+
+    def __len__(self):
+        """Return the number of matching touches."""
+        return self.count()
+
+    @property
+    def mask(self):
+        """Return the boolean mask of matching touches."""
+        return self._mask
+
+    def _match(self, **filters):
+        """Return the mask of touches matching every filter."""
+        mask = np.ones(len(self._mask), dtype=np.bool_)
+        for name, value in filters.items():
+            column = self._index.column(name)
+            if isinstance(value, (list, tuple, set, frozenset)):
+                codes = [self._index.encode(name, v) for v in value]
+                mask &= np.isin(column, codes)
+            else:
+                mask &= column == self._index.encode(name, value)
+        return mask
+
+    def where(self, **filters):
+        """Return a query restricted to touches matching the filters."""
+        return Query(self._index, self._mask & self._match(**filters))
+
+    def last_games(self, n):
+        """Return a query restricted to the last 'n' games it matches."""
+        util.typecheck(n, int)
+        games = np.unique(self._index.column('game')[self._mask])
+        if len(games) <= n:
+            return self
+        first = games[-n] if n > 0 else games[-1] + 1
+        return Query(self._index,
+                     self._mask & (self._index.column('game') >= first))
+
+    def count(self):
+        """Return the number of matching touches."""
+        return int(np.count_nonzero(self._mask))
+
+    def sum(self, column):
+        """Return the sum of a column over the matching touches."""
+        return self._index.column(column)[self._mask].sum().item()
+
+    def mean(self, column):
+        """Return the mean of a column over the matching touches."""
+        values = self._index.column(column)[self._mask]
+        return values.mean().item() if len(values) else None
+
+    def rate(self, **filters):
+        """Return the fraction of matching touches matching the filters."""
+        total = self.count()
+        if not total:
+            return None
+        matched = np.count_nonzero(self._mask & self._match(**filters))
+        return matched / total
+
+    def groupby(self, column):
+        """Group the matching touches by the values of a column."""
+        return Grouped(self, column)
+
+
+class Grouped(object):
+    """Query grouped by the values of a column."""
+
+    def __init__(self, query, column):
+        """Initialize Grouped over the query."""
+        self._query = query
+        self._column = column
+        index = query._index
+        keys = index.column(column)[query.mask].astype(np.int64)
+        self._offset = int(keys.min()) if len(keys) else 0
+        self._keys = keys - self._offset
+
+    def _decode(self, counts, values=None):
+        """Return the non-empty groups as a dictionary."""
+        index = self._query._index
+        result = {}
+        for code in np.flatnonzero(counts):
+            value = counts[code] if values is None else values[code]
+            result[index.decode(self._column, code + self._offset)] = (
+                value.item())
+        return result
+
+    def count(self):
+        """Return the number of touches in each group."""
+        return self._decode(np.bincount(self._keys))
+
+    def sum(self, column):
+        """Return the sum of a column in each group."""
+        weights = self._query._index.column(column)[self._query.mask]
+        counts = np.bincount(self._keys)
+        return self._decode(counts, np.bincount(self._keys, weights=weights))
+
+    def mean(self, column):
+        """Return the mean of a column in each group."""
+        weights = self._query._index.column(column)[self._query.mask]
+        counts = np.bincount(self._keys)
+        sums = np.bincount(self._keys, weights=weights)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self._decode(counts, sums / counts)
@@ -0,0 +1,216 @@
+"""Player Stat Segments."""
+
+__all__ = ['STAT_FIELDS', 'STAT_DTYPE', 'SegmentException', 'RecordFile',
+           'StatSegment']
+
+import os
+
+from pathlib import Path
+
+import numpy as np
+
+from . import io
+
+from .model import StatModel
+
+
+STAT_FIELDS = ('hitting', 'defense', 'serving', 'cleanliness', 'total')
+
+STAT_DTYPE = np.dtype([('game', 'S56'), ('model', 'S40')]
+                      + [(field, '<f8') for field in STAT_FIELDS])
+
+MAGIC = b'SPKSEG01'
+
+
+class SegmentException(Exception):
+    """Raise an exception about a stat segment."""
+
+
+def _model_id(model):
+    """Return the identifier of a StatModel, its JSON or its identifier."""
+    if isinstance(model, dict):
+        return model.get('UID') or model.get('name') or ''
+    if isinstance(model, type) and issubclass(model, StatModel):
+        return model.model_id
+    return model or ''
+
+
+def _model(model_id):
+    """Return the StatModel of an identifier, or the identifier if unknown."""
+    if not model_id:
+        return None
+    try:
+        return StatModel.from_json({'UID': model_id,
+                                    'name': model_id.split(':')[0]})
+    except NameError:
+        return model_id
+
+
+class RecordFile(object):
+    """
+    Append-only file of fixed-size records after a magic header.
+
+    Subclasses set the 'dtype' of the records, which has a 'game' field, the
+    'magic' bytes, and the 'exception' raised and the 'kind' named when a
+    file is not of their kind. Reading maps the file into a structured
+    array. If a game is appended again the last record wins. A torn record
+    at the end of the file is ignored and cut before the next append.
+    """
+
+    dtype = None
+    magic = None
+    exception = Exception
+    kind = 'record file'
+
+    def __init__(self, fp):
+        """Initialize the record file over a file."""
+        self._path = Path(fp)
+
+    def __len__(self):
+        """Return the number of complete records."""
+        if not self._path.is_file():
+            return 0
+        size = self._path.stat().st_size - len(self.magic)
+        return max(0, size // self.dtype.itemsize)
+
+    @property
+    def path(self):
+        """Return the path of the file."""
+        return self._path
+
+    def _write(self, data):
+        """Append the bytes of whole records and sync them to disk."""
+        if not data:
+            return
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(str(self._path), os.O_WRONLY | os.O_APPEND | os.O_CREAT,
+                     0o644)
+        try:
+            size = os.fstat(fd).st_size
+            if size < len(self.magic):
+                os.ftruncate(fd, 0)
+                data = self.magic + data
+            else:
+                self._check()
+                whole = len(self.magic) + len(self) * self.dtype.itemsize
+                if size != whole:
+                    os.ftruncate(fd, whole)
+            os.write(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _check(self):
+        """Raise if the file does not start with the magic bytes."""
+        with open(self._path, 'rb') as file:
+            if file.read(len(self.magic)) != self.magic:
+                raise self.exception("Not a {}.".format(self.kind),
+                                     self._path)
+
+    def records(self, latest=True):
+        """
+        Return the records as a read-only memory-mapped structured array.
+
+        With 'latest', only the last record of each game is kept.
+        """
+        n = len(self)
+        if n == 0:
+            return np.zeros(0, dtype=self.dtype)
+        self._check()
+        records = np.memmap(self._path, dtype=self.dtype, mode='r',
+                            offset=len(self.magic), shape=(n,))
+        if latest:
+            _, last = np.unique(records['game'][::-1], return_index=True)
+            if len(last) < n:
+                return records[np.sort(n - 1 - last)]
+        return records
+
+    def compact(self, exclude=()):
+        """
+        Rewrite the file keeping only the last record of each game.
+
+        The records of the games in 'exclude' are dropped.
+        """
+        if not self._path.is_file():
+            return
+        records = self.records()
+        if exclude:
+            excluded = np.array([g.encode() for g in exclude],
+                                dtype=self.dtype['game'])
+            records = records[~np.isin(records['game'], excluded)]
+        io.atomic_write(self._path,
+                        self.magic + np.asarray(records).tobytes(),
+                        mode='wb')
+
+
+class StatSegment(RecordFile):
+    """
+    Append-only file of fixed-width stat records of a player.
+
+    Each record holds a game UID, a model identifier and the five stats of
+    the player in that game. Appending a game writes one record, and reading
+    maps the file into a structured array, so career aggregates are array
+    reductions.
+    """
+
+    dtype = STAT_DTYPE
+    magic = MAGIC
+    exception = SegmentException
+    kind = 'stat segment'
+
+    @staticmethod
+    def _record(game_uid, stat, model=None):
+        """Return the bytes of a record."""
+        record = np.zeros(1, dtype=STAT_DTYPE)
+        game_uid = game_uid.encode()
+        model_id = _model_id(model).encode()
+        if (len(game_uid) > STAT_DTYPE['game'].itemsize
+                or len(model_id) > STAT_DTYPE['model'].itemsize):
+            raise SegmentException("Game UID or model is too long.",
+                                   game_uid, model_id)
+        record['game'] = game_uid
+        record['model'] = model_id
+        for field in STAT_FIELDS:
+            record[field] = stat.get(field, 0.0) or 0.0
+        return record.tobytes()
+
+    def extend(self, stats):
+        """Append the records of (game UID, stat, model) triples."""
+        self._write(b''.join(self._record(*s) for s in stats))
+
+    def append(self, game_uid, stat, model=None):
+        """Append the stat of a game."""
+        self.extend([(game_uid, stat, model)])
+
+    def column(self, field):
+        """Return a stat of every game as an array."""
+        if field not in STAT_FIELDS:
+            raise SegmentException("Unknown stat.", field, STAT_FIELDS)
+        return self.records()[field]
+
+    def games(self):
+        """Return the UIDs of the games in order."""
+        return [g.decode() for g in self.records()['game']]
+
+    def career(self):
+        """Return the number of games and the mean of each stat."""
+        records = self.records()
+        career = {'games': len(records)}
+        for field in STAT_FIELDS:
+            career[field] = (float(records[field].mean()) if len(records)
+                             else None)
+        return career
+
+    def to_stats(self):
+        """Return the records as a Player stats dictionary."""
+        models = {}
+        stats = {}
+        for record in self.records():
+            model_id = record['model'].decode()
+            if model_id not in models:
+                models[model_id] = _model(model_id)
+            stats[record['game'].decode()] = {
+                'stat': {f: float(record[f]) for f in STAT_FIELDS},
+                'model': models[model_id]
+            }
+        return stats
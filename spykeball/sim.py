@@ -0,0 +1,252 @@
+"""Monte Carlo Match Simulator."""
+
+__all__ = ['STATES', 'OUTCOMES', 'Forecast', 'TouchModel', 'simulate']
+
+import os
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .player import Player, PlayerMap
+from .synth import Synthesizer
+
+
+STATES = ('service', 'defense', 'set', 'spike')
+
+OUTCOMES = ('win', 'fault', 'over', 'pass')
+
+SERVICE, DEFENSE, SET, SPIKE = range(len(STATES))
+
+WIN, FAULT, OVER, PASS = range(len(OUTCOMES))
+
+NEXT_STATE = np.array([DEFENSE, SET, SPIKE, DEFENSE], dtype=np.int8)
+
+STRENGTHS = (None, 's', 'w')
+
+Forecast = namedtuple('Forecast', ['players', 'games', 'home_win',
+                                   'home_points', 'away_points'])
+
+
+def _default_probabilities():
+    """Return the outcome probabilities used by the Synthesizer."""
+    s = Synthesizer(seed=0)
+    probs = np.zeros((len(STATES), len(OUTCOMES)))
+    probs[SERVICE] = (s.ace, s.service_fault, 1 - s.ace - s.service_fault, 0)
+    probs[DEFENSE] = (0, s.defense_fault, s.one_touch,
+                      1 - s.defense_fault - s.one_touch)
+    probs[SET] = (0, s.set_fault, s.two_touch, 1 - s.set_fault - s.two_touch)
+    probs[SPIKE] = (s.kill, s.spike_fault, 1 - s.kill - s.spike_fault, 0)
+    return probs
+
+
+DEFAULT_PROBABILITIES = _default_probabilities()
+
+
+class TouchModel(object):
+    """
+    Outcome probabilities of the touches of each player.
+
+    Every touch is counted by the state of the rally it was made in and its
+    outcome: winning or faulting the point, sending the ball over to the
+    other team or passing it to a teammate. The probabilities of a player are
+    their counts smoothed towards the league with 'prior' pseudo-touches per
+    state, so players with few touches behave like the league.
+    """
+
+    def __init__(self, games=(), prior=4.0):
+        """Initialize TouchModel with the touches of the games."""
+        self.prior = prior
+        self._counts = {}
+        self._strengths = {}
+        for game in games:
+            self.add_game(game)
+
+    def __contains__(self, player):
+        """Check if there are touches of the player."""
+        return self._uid(player) in self._counts
+
+    def __len__(self):
+        """Return the number of players with touches."""
+        return len(self._counts)
+
+    @staticmethod
+    def _uid(player):
+        """Return the UID of a player given as a Player or a UID."""
+        return player.UID if isinstance(player, Player) else player
+
+    def _player_counts(self, player):
+        """Return the counts of a player, creating them if needed."""
+        uid = self._uid(player)
+        counts = self._counts.get(uid)
+        if counts is None:
+            counts = self._counts[uid] = np.zeros((len(STATES),
+                                                   len(OUTCOMES)))
+            self._strengths[uid] = np.zeros((len(STATES), len(STRENGTHS)))
+        return counts, self._strengths[uid]
+
+    def add_rally(self, rally):
+        """Count the touches of a parsed rally."""
+        touches = rally.touches
+        if not touches:
+            return
+        home = rally.playermap[:2]
+        state = SERVICE
+        for i, touch in enumerate(touches):
+            counts, strengths = self._player_counts(touch.actor)
+            if i == len(touches) - 1:
+                outcome = WIN if touch.success else FAULT
+            elif (touch.actor in home) != (touch.target in home):
+                outcome = OVER
+            else:
+                outcome = PASS
+            counts[state, outcome] += 1
+            strengths[state, STRENGTHS.index(touch.strength)] += 1
+            state = DEFENSE if outcome == OVER else NEXT_STATE[state]
+
+    def add_game(self, game):
+        """Count the touches of every rally of a parsed game."""
+        for rally in game:
+            self.add_rally(rally)
+
+    def counts(self, player):
+        """Return the outcome counts of a player by state."""
+        counts = self._counts.get(self._uid(player))
+        if counts is None:
+            return np.zeros((len(STATES), len(OUTCOMES)))
+        return counts.copy()
+
+    def league(self):
+        """Return the outcome probabilities of every touch by state."""
+        if not self._counts:
+            return DEFAULT_PROBABILITIES.copy()
+        totals = sum(self._counts.values())
+        seen = totals.sum(axis=1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            probs = totals / seen
+        return np.where(seen > 0, probs, DEFAULT_PROBABILITIES)
+
+    def probabilities(self, player, league=None):
+        """Return the smoothed outcome probabilities of a player by state."""
+        if league is None:
+            league = self.league()
+        counts = self.counts(player)
+        return ((counts + self.prior * league)
+                / (counts.sum(axis=1, keepdims=True) + self.prior))
+
+    def strength_rates(self, player):
+        """Return the fraction of strong and weak touches by state."""
+        strengths = self._strengths.get(self._uid(player))
+        if strengths is None:
+            return np.zeros((len(STATES), len(STRENGTHS)))
+        seen = strengths.sum(axis=1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(seen > 0, strengths / seen, 0.0)
+
+    def lineup(self, playermap):
+        """Return the probabilities of the four players of a lineup."""
+        league = self.league()
+        return np.stack([self.probabilities(p, league) for p in playermap])
+
+    def simulate(self, lineups, games=10000, points=21, win_by=2, seed=None,
+                 jobs=1):
+        """Simulate games for each lineup. See 'simulate'."""
+        return simulate(self, lineups, games, points, win_by, seed, jobs)
+
+
+def _simulate(probs, games, seed, points=21, win_by=2, max_touches=60):
+    """
+    Simulate games between the slots of a lineup.
+
+    Every live game takes one touch per step, so each step is a handful of
+    array operations over all of the games. Home serves first and the server
+    of a team alternates each time it wins the serve back. Return the number
+    of home wins and the total points of each side.
+    """
+    rng = np.random.default_rng(seed)
+    cumulative = np.cumsum(probs, axis=-1)
+    cumulative[..., -1] = 1.0
+
+    score = np.zeros((games, 2), dtype=np.int32)
+    serving = np.zeros(games, dtype=np.int8)
+    servers = np.tile(np.array([0, 2], dtype=np.int8), (games, 1))
+    focus = servers[:, 0].copy()
+    state = np.full(games, SERVICE, dtype=np.int8)
+    touches = np.zeros(games, dtype=np.int32)
+    live = np.arange(games)
+
+    while len(live):
+        f, s = focus[live], state[live]
+        team = f // 2
+        roll = rng.random(len(live))
+        outcome = (roll[:, None] >= cumulative[f, s]).sum(axis=1)
+
+        over = outcome == OVER
+        focus[live] = np.where(
+            over, 2 * (1 - team) + rng.integers(0, 2, len(live)),
+            np.where(outcome == PASS, f ^ 1, f))
+        state[live] = np.where(over, DEFENSE, NEXT_STATE[s])
+        touches[live] += 1
+
+        winner = np.where(outcome == WIN, team,
+                          np.where(outcome == FAULT, 1 - team, -1))
+        stalled = (winner < 0) & (touches[live] >= max_touches)
+        last = focus[live] // 2
+        winner[stalled] = np.where(state[live][stalled] == SPIKE,
+                                   last[stalled], 1 - last[stalled])
+
+        ended = winner >= 0
+        if not ended.any():
+            continue
+        g, w = live[ended], winner[ended]
+        score[g, w] += 1
+        side_out = w != serving[g]
+        servers[g[side_out], w[side_out]] ^= 1
+        serving[g] = w
+
+        done = ((score[g].max(axis=1) >= points)
+                & (np.abs(score[g, 0] - score[g, 1]) >= win_by))
+        g = g[~done]
+        focus[g] = servers[g, serving[g]]
+        state[g] = SERVICE
+        touches[g] = 0
+        if done.any():
+            live = live[~np.isin(live, live[ended][done])]
+
+    home_wins = int(np.count_nonzero(score[:, 0] > score[:, 1]))
+    return home_wins, int(score[:, 0].sum()), int(score[:, 1].sum())
+
+
+def simulate(model, lineups, games=10000, points=21, win_by=2, seed=None,
+             jobs=1):
+    """
+    Simulate games for each lineup with the probabilities of a TouchModel.
+
+    The games of each lineup are split between 'jobs' worker processes, each
+    with an independent random stream spawned from 'seed'. Return a Forecast
+    with the home win probability and average score of each lineup.
+    """
+    lineups = [PlayerMap(*lineup) for lineup in lineups]
+    jobs = jobs or os.cpu_count()
+    chunks = [games // jobs + (i < games % jobs) for i in range(jobs)]
+    chunks = [c for c in chunks if c]
+    seeds = np.random.SeedSequence(seed).spawn(len(lineups))
+
+    tasks = [(model.lineup(lineup), chunk, child, points, win_by)
+             for lineup, seq in zip(lineups, seeds)
+             for chunk, child in zip(chunks, seq.spawn(len(chunks)))]
+
+    if jobs == 1:
+        results = [_simulate(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(_simulate, *zip(*tasks)))
+
+    forecasts = []
+    for i, lineup in enumerate(lineups):
+        wins, home, away = np.sum(
+            results[i * len(chunks):(i + 1) * len(chunks)], axis=0)
+        forecasts.append(Forecast(lineup, games, float(wins / games),
+                                  float(home / games), float(away / games)))
+    return forecasts
@@ -0,0 +1,315 @@
+"""Object Store Module."""
+
+__all__ = ['StoreException', 'DuplicateGameException', 'Store']
+
+import json
+
+from pathlib import Path
+
+from . import io
+
+from .game import Game, GameException, content_hash
+from .segment import StatSegment
+from .summary import SummaryIndex, summarize, summarize_record
+from .player import PLAYER_CACHE, Player
+
+
+class StoreException(Exception):
+    """Raise an exception about a store."""
+
+
+class DuplicateGameException(StoreException):
+    """Raise if a game with the same content is already in the store."""
+
+    def __init__(self, uid, existing):
+        """Initialize with the UIDs of the new and the stored game."""
+        self.uid = uid
+        self.existing = existing
+        super().__init__("Game duplicates a stored game.", uid, existing)
+
+
+class Store(object):
+    """
+    Write-behind store of Games and Players saved as JSON files by UID.
+
+    Adding an object only marks it dirty, so adding the same object many
+    times before a flush writes its file once. The stats of a player are
+    appended to its StatSegment instead of its JSON file, so saving a player
+    costs the games added since its last save. Every file is replaced
+    atomically, so a crash during a flush leaves each file either old or
+    new. Used as a context manager, the store flushes on exit unless an
+    exception was raised, in which case the pending writes are dropped.
+
+    Games are indexed by their content_hash. Adding a game with the content
+    of another stored game raises a DuplicateGameException if 'on_duplicate'
+    is 'reject', or drops the game and its player stats if it is 'merge'.
+    The summary of every game written is appended to a SummaryIndex.
+    """
+
+    HASH_INDEX = '.hashes'
+    SUMMARY_INDEX = '.summary'
+
+    def __init__(self, games, players, ext='.json', archive=None,
+                 on_duplicate='reject'):
+        """
+        Initialize Store over the game and player directories.
+
+        Games missing from the game directory are read from the 'archive',
+        if one is given.
+        """
+        if on_duplicate not in ('reject', 'merge'):
+            raise StoreException("Unknown duplicate policy.", on_duplicate)
+        self._games = Path(games)
+        self._players = Path(players)
+        self._ext = ext
+        self._archive = archive
+        self.on_duplicate = on_duplicate
+        self._pending = {}
+        self._hashes = None
+        self._pending_hashes = {}
+
+    def __enter__(self):
+        """Enter the context."""
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        """Flush the pending writes, or drop them after an exception."""
+        if exc_type is None:
+            self.flush()
+        else:
+            self.discard()
+        return False
+
+    def __len__(self):
+        """Return the number of pending writes."""
+        return len(self._pending)
+
+    def __contains__(self, uid):
+        """Check if there is a pending write for the UID."""
+        return uid in self._pending
+
+    def path(self, uid):
+        """Return the file of the object with this UID."""
+        if uid.upper().startswith('G'):
+            return self._games.joinpath(uid + self._ext)
+        elif uid.upper().startswith('P'):
+            return self._players.joinpath(uid + self._ext)
+        else:
+            raise SyntaxError("Invalid UID.", uid)
+
+    def segment(self, uid):
+        """Return the StatSegment of the player with this UID."""
+        return StatSegment(self._players.joinpath(uid + '.stats'))
+
+    @property
+    def summaries(self):
+        """Return the SummaryIndex of the stored games."""
+        return SummaryIndex(self._games.joinpath(self.SUMMARY_INDEX))
+
+    @property
+    def hashes(self):
+        """Return the UID of each stored game by content hash."""
+        if self._hashes is None:
+            self._hashes = {}
+            index = self._games.joinpath(self.HASH_INDEX)
+            if index.is_file():
+                for line in index.read_text().splitlines():
+                    digest, _, uid = line.partition('\t')
+                    if uid:
+                        self._hashes.setdefault(digest, uid)
+        return self._hashes
+
+    @staticmethod
+    def _record_hash(data):
+        """
+        Return the content hash and player UIDs of a decoded game.
+
+        The hash is None if the record has no players or rallies.
+        """
+        teams = data.get('teams')
+        if not teams or not data.get('actions'):
+            return None, ()
+        players = [p['UID'] if isinstance(p, dict) else p.UID
+                   for p in teams['home'] + teams['away']]
+        return content_hash(players, data.get('actions') or ()), players
+
+    def _admit(self, uid, digest, players):
+        """
+        Check a game against the hash index and return the UID to keep.
+
+        A duplicate is rejected, or merged by dropping its player stats.
+        """
+        if digest is None:
+            return uid
+        existing = self.hashes.get(digest)
+        if existing is None or existing == uid:
+            self.hashes[digest] = uid
+            self._pending_hashes[uid] = digest
+            return uid
+        if self.on_duplicate == 'reject':
+            raise DuplicateGameException(uid, existing)
+        for player in players:
+            player = PLAYER_CACHE.get(
+                player if isinstance(player, str) else player.UID)
+            if player is not None:
+                player.remove_stat(uid)
+        return existing
+
+    def add(self, obj, *args, **kwargs):
+        """
+        Mark an object dirty, to be saved with the arguments given.
+
+        Return the UID under which the object is stored, which is the UID
+        of the stored game when a duplicate game is merged.
+        """
+        if isinstance(obj, Game):
+            try:
+                digest = obj.content_hash
+            except GameException:
+                digest = None
+            uid = self._admit(obj.UID, digest, obj.players)
+            if uid != obj.UID:
+                return uid
+        self._pending[obj.UID] = (obj, args, kwargs)
+        return obj.UID
+
+    def add_record(self, uid, record):
+        """Mark an already encoded JSON game record dirty like 'add'."""
+        if not isinstance(record, str):
+            raise StoreException("Record must be JSON text.", uid)
+        stored = self._admit(uid, *self._record_hash(json.loads(record)))
+        if stored == uid:
+            self._pending[uid] = (record, (), {})
+        return stored
+
+    def discard(self, uid=None):
+        """Drop the pending write of a UID, or every pending write."""
+        uids = list(self._pending) if uid is None else [uid]
+        for uid in uids:
+            self._pending.pop(uid, None)
+            digest = self._pending_hashes.pop(uid, None)
+            if digest is not None and self.hashes.get(digest) == uid:
+                del self.hashes[digest]
+
+    def load(self, uid, **kwargs):
+        """Return the object with this UID, preferring pending writes."""
+        pending = self._pending.get(uid)
+        if pending is not None:
+            obj = pending[0]
+            if not isinstance(obj, str):
+                return obj
+            cls = Game if uid.upper().startswith('G') else Player
+            return cls.from_json(json.loads(obj), **kwargs)
+
+        path = self.path(uid)
+        if uid.upper().startswith('G'):
+            if not path.is_file() and self._archive is not None:
+                if uid in self._archive:
+                    return self._archive.load(uid, **kwargs)
+        if not path.is_file() and uid not in PLAYER_CACHE:
+            raise StoreException("Object is not in the store.", uid)
+        if uid.upper().startswith('G'):
+            return Game.load(path, **kwargs)
+        with_stats = kwargs.get('with_stats', True)
+        player = PLAYER_CACHE.get(uid)
+        if player is not None and (player.stats_loaded or not with_stats
+                                   or not path.is_file()):
+            return player
+        player = PLAYER_CACHE.load(path, uid, **kwargs)
+        if with_stats:
+            player.load_stats(self.segment(uid))
+        return player
+
+    def flush(self):
+        """Write every pending object to its file and return their count."""
+        pending, self._pending = self._pending, {}
+        written, summaries = [], []
+        try:
+            for uid, (obj, args, kwargs) in pending.items():
+                path = self.path(uid)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                if isinstance(obj, str):
+                    io.atomic_write(path, obj)
+                    if uid.upper().startswith('G'):
+                        summaries.append(summarize_record(json.loads(obj)))
+                elif isinstance(obj, Player):
+                    obj.save(path, with_stats=False)
+                    obj.save_stats(self.segment(uid))
+                else:
+                    obj.save(path, *args, **kwargs)
+                    summaries.append(summarize(obj))
+                written.append(uid)
+        except BaseException:
+            for key, value in pending.items():
+                if key not in written:
+                    self._pending.setdefault(key, value)
+            raise
+        finally:
+            self._index(written, summaries)
+        return len(written)
+
+    def _index(self, written, summaries):
+        """Append the summaries and content hashes of written games."""
+        self.summaries.extend(summaries)
+        hashes = [(self._pending_hashes.pop(uid), uid) for uid in written
+                  if uid in self._pending_hashes]
+        if hashes:
+            self._games.mkdir(parents=True, exist_ok=True)
+            with open(self._games.joinpath(self.HASH_INDEX), 'a') as file:
+                file.writelines('{}\t{}\n'.format(*h) for h in hashes)
+
+    def dedup(self):
+        """
+        Remove stored and archived games duplicating an earlier game.
+
+        Games are kept in order of their files' modification times, then
+        archived games. The stats of removed games are removed from their
+        players, and the hash index is rebuilt. Return the UID of the kept
+        game of each removed game.
+        """
+        self.flush()
+        records = [(fp.stem, fp.read_text())
+                   for fp in sorted(self._games.glob('G*' + self._ext),
+                                    key=lambda fp: fp.stat().st_mtime)]
+        if self._archive is not None:
+            records += [(uid, self._archive.read(uid))
+                        for uid in self._archive]
+
+        hashes, removed, players, seen = {}, {}, {}, set()
+        for uid, record in records:
+            if uid in seen:
+                continue
+            seen.add(uid)
+            digest, uids = self._record_hash(json.loads(record))
+            if digest is None:
+                continue
+            if digest in hashes:
+                removed[uid] = hashes[digest]
+                for player in uids:
+                    players.setdefault(player, []).append(uid)
+            else:
+                hashes[digest] = uid
+
+        for uid in removed:
+            path = self.path(uid)
+            if path.is_file():
+                path.unlink()
+        if self._archive is not None:
+            self._archive.remove(removed)
+
+        for player_uid, uids in players.items():
+            player = PLAYER_CACHE.get(player_uid)
+            if player is None and self.path(player_uid).is_file():
+                player = PLAYER_CACHE.load(self.path(player_uid), player_uid)
+            if player is not None:
+                for uid in uids:
+                    player.remove_stat(uid)
+                self.add(player)
+            self.segment(player_uid).compact(exclude=uids)
+        self.flush()
+        self.summaries.compact(exclude=removed)
+
+        io.atomic_write(self._games.joinpath(self.HASH_INDEX), ''.join(
+            '{}\t{}\n'.format(d, u) for d, u in hashes.items()))
+        self._hashes = hashes
+        return removed
@@ -0,0 +1,131 @@
+"""Game Summary Index."""
+
+__all__ = ['SUMMARY_DTYPE', 'SummaryException', 'SummaryIndex', 'summarize',
+           'summarize_record']
+
+import time
+
+from pathlib import Path
+
+import numpy as np
+
+from .segment import STAT_DTYPE, RecordFile
+
+
+SUMMARY_DTYPE = np.dtype([('game', STAT_DTYPE['game']),
+                          ('time', '<f8'),
+                          ('players', STAT_DTYPE['game'], (4,)),
+                          ('home', '<i4'),
+                          ('away', '<i4'),
+                          ('winner', 'i1'),
+                          ('rallies', '<i4'),
+                          ('top', 'i1'),
+                          ('top_total', '<f8')])
+
+SLOTS = ('p1', 'p2', 'p3', 'p4')
+
+MAGIC = b'SPKSUM01'
+
+
+class SummaryException(Exception):
+    """Raise an exception about a summary index."""
+
+
+def _summary(uid, players, score, winner, rallies, stats, saved=None):
+    """Return a summary record from the parts of a game."""
+    record = np.zeros(1, dtype=SUMMARY_DTYPE)
+    try:
+        record['game'] = uid.encode()
+        record['players'] = [p.encode() for p in players]
+    except ValueError:
+        raise SummaryException("Game or player UID is too long.", uid)
+    record['time'] = time.time() if saved is None else saved
+    record['rallies'] = rallies
+    record['winner'] = -1
+    record['top'] = -1
+    if score is not None and score.get('home') is not None:
+        record['home'] = score['home']
+        record['away'] = score['away']
+        record['winner'] = 0 if winner in ('home', 0) else 1
+    totals = [(stat or {}).get('total') for stat in stats]
+    if any(total is not None for total in totals):
+        top = max((t, -i) for i, t in enumerate(totals) if t is not None)
+        record['top'] = -top[1]
+        record['top_total'] = top[0]
+    return record
+
+
+def summarize(game, saved=None):
+    """
+    Return the summary record of a Game.
+
+    The top scorer is taken from the stats already calculated, so summarizing
+    never parses or scores the game.
+    """
+    played = game.played
+    stats = [game.stats.get(p) if played and game.stats_calculated else None
+             for p in game.players]
+    winner = None
+    if played:
+        winner = 'home' if game.winner == game.home_team else 'away'
+    return _summary(game.UID, [p.UID for p in game.players],
+                    game.score if played else None, winner, len(game),
+                    stats, saved)
+
+
+def summarize_record(data, saved=None):
+    """Return the summary record of a decoded JSON game."""
+    teams = data['teams']
+    players = [p['UID'] if isinstance(p, dict) else p
+               for p in teams['home'] + teams['away']]
+    stats = data.get('stats') or {}
+    return _summary(data['UID'], players, data.get('score'),
+                    data.get('winner'), len(data.get('actions') or ()),
+                    [stats.get(slot) for slot in SLOTS], saved)
+
+
+class SummaryIndex(RecordFile):
+    """
+    Append-only file of fixed-size game summary records.
+
+    Each record holds the UID, save time, players, score, winner, length and
+    top scorer of a game, so games can be listed and filtered without
+    opening their files. Records are appended in save order, so the times are
+    sorted and a time range is found by binary search.
+    """
+
+    dtype = SUMMARY_DTYPE
+    magic = MAGIC
+    exception = SummaryException
+    kind = 'summary index'
+
+    def extend(self, records):
+        """Append summary records."""
+        self._write(b''.join(np.asarray(r, dtype=SUMMARY_DTYPE).tobytes()
+                             for r in records))
+
+    def append(self, game, saved=None):
+        """Append the summary of a Game."""
+        self.extend([summarize(game, saved)])
+
+    def find(self, uid):
+        """Return the last record of a game or None, by one linear scan."""
+        records = self.records(latest=False)
+        key = np.array(uid.encode(), dtype=SUMMARY_DTYPE['game'])
+        found = np.flatnonzero(records['game'] == key)
+        return records[found[-1]] if len(found) else None
+
+    def between(self, start=None, stop=None):
+        """Return the records of the games saved in [start, stop)."""
+        records = self.records()
+        lo = 0 if start is None else np.searchsorted(records['time'], start)
+        hi = (len(records) if stop is None
+              else np.searchsorted(records['time'], stop))
+        return records[lo:hi]
+
+    def of_player(self, uid, records=None):
+        """Return the records of the games of a player."""
+        if records is None:
+            records = self.records()
+        key = np.array(uid.encode(), dtype=SUMMARY_DTYPE['game'])
+        return records[(records['players'] == key).any(axis=1)]
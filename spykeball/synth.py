@@ -0,0 +1,167 @@
+"""Synthetic Game Generator."""
+
+__all__ = ['HOME', 'AWAY', 'Synthesizer', 'rallies', 'games']
+
+import random
+
+
+HOME = 0
+AWAY = 1
+
+TEAMS = ('12', '34')
+
+
+class Synthesizer(object):
+    """Generate legal rally strings and games with a valid serving order."""
+
+    def __init__(self, seed=None, ace=0.06, service_fault=0.05,
+                 defense_fault=0.12, set_fault=0.04, kill=0.35,
+                 spike_fault=0.12, one_touch=0.03, two_touch=0.04,
+                 strong=0.1, weak=0.1, future_mistake=0.01,
+                 max_touches=60):
+        """Initialize Synthesizer with the touch probabilities."""
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.ace = ace
+        self.service_fault = service_fault
+        self.defense_fault = defense_fault
+        self.set_fault = set_fault
+        self.kill = kill
+        self.spike_fault = spike_fault
+        self.one_touch = one_touch
+        self.two_touch = two_touch
+        self.strong = strong
+        self.weak = weak
+        self.future_mistake = future_mistake
+        self.max_touches = max_touches
+        self._rng = random.Random(self.seed)
+
+    def _modifier(self, rng, same_team=False):
+        """Return a random touch modifier."""
+        roll = rng.random()
+        if roll < self.strong:
+            return 's'
+        roll -= self.strong
+        if roll < self.weak:
+            return 'w'
+        roll -= self.weak
+        if same_team and roll < self.future_mistake:
+            return 'e'
+        return ''
+
+    def _rally(self, rng, serving_team, server=None):
+        """Return a rally string and the team which won it."""
+        serving = TEAMS[serving_team]
+        receiving = TEAMS[1 - serving_team]
+        if server is None:
+            server = rng.choice(serving)
+
+        roll = rng.random()
+        if roll < self.service_fault:
+            return server + 'n', 1 - serving_team
+        elif roll < self.service_fault + self.ace:
+            return server + 'a' + rng.choice(receiving), serving_team
+
+        focus = rng.choice(receiving)
+        team = 1 - serving_team
+        rally = [server, focus]
+        state = 'defense'
+
+        for _ in range(self.max_touches):
+            mate = TEAMS[team].replace(focus, '')
+            other = TEAMS[1 - team]
+            roll = rng.random()
+
+            if state == 'defense':
+                if roll < self.defense_fault:
+                    rally.append('n')
+                    return ''.join(rally), 1 - team
+                elif roll < self.defense_fault + self.one_touch:
+                    focus = rng.choice(other)
+                    rally += [self._modifier(rng), focus]
+                    team = 1 - team
+                else:
+                    focus = mate
+                    rally += [self._modifier(rng, same_team=True), focus]
+                    state = 'set'
+
+            elif state == 'set':
+                if roll < self.set_fault:
+                    rally.append('n')
+                    return ''.join(rally), 1 - team
+                elif roll < self.set_fault + self.two_touch:
+                    focus = rng.choice(other)
+                    rally += [self._modifier(rng), focus]
+                    team = 1 - team
+                    state = 'defense'
+                else:
+                    focus = mate
+                    rally += [self._modifier(rng, same_team=True), focus]
+                    state = 'spike'
+
+            else:
+                if roll < self.kill:
+                    rally.append('p')
+                    return ''.join(rally), team
+                elif roll < self.kill + self.spike_fault:
+                    rally.append('n')
+                    return ''.join(rally), 1 - team
+                else:
+                    focus = rng.choice(other)
+                    rally += [self._modifier(rng), focus]
+                    team = 1 - team
+                    state = 'defense'
+
+        rally.append('p' if state == 'spike' else 'n')
+        return ''.join(rally), team if state == 'spike' else 1 - team
+
+    def rally(self, serving_team=HOME):
+        """Return a legal rally string served by 'serving_team'."""
+        return self._rally(self._rng, serving_team)[0]
+
+    def rallies(self, count=None, serving_team=HOME):
+        """Yield legal rallies where the winner of each rally serves next."""
+        rng = self._rng
+        n = 0
+        while count is None or n < count:
+            rally, serving_team = self._rally(rng, serving_team)
+            yield rally
+            n += 1
+
+    def game(self, index=0, points=21, win_by=2):
+        """Return the rally strings of the game at 'index'."""
+        rng = random.Random('{}:{}'.format(self.seed, index))
+        score = [0, 0]
+        servers = [rng.choice(TEAMS[HOME]), rng.choice(TEAMS[AWAY])]
+        serving_team = HOME
+        rallies = []
+
+        while (max(score) < points
+               or abs(score[HOME] - score[AWAY]) < win_by):
+            rally, winner = self._rally(rng, serving_team,
+                                        servers[serving_team])
+            rallies.append(rally)
+            score[winner] += 1
+            if winner != serving_team:
+                team = TEAMS[winner]
+                servers[winner] = team.replace(servers[winner], '')
+                serving_team = winner
+
+        return rallies
+
+    def games(self, count=None, start=0, points=21, win_by=2):
+        """Yield the rally strings of each game starting at 'start'."""
+        index = start
+        while count is None or index < start + count:
+            yield self.game(index, points=points, win_by=win_by)
+            index += 1
+
+
+def rallies(count=None, seed=None, **kwargs):
+    """Yield legal rallies where the winner of each rally serves next."""
+    return Synthesizer(seed, **kwargs).rallies(count)
+
+
+def games(count=None, seed=None, points=21, win_by=2, **kwargs):
+    """Yield the rally strings of synthetic games."""
+    return Synthesizer(seed, **kwargs).games(count, points=points,
+                                              win_by=win_by)
@@ -0,0 +1,235 @@
+"""Live Tagging Server."""
+
+__all__ = ['TagServerException', 'TagServer', 'TagHandler']
+
+import json
+import threading
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from socketserver import ThreadingMixIn
+
+from .game import Game, GameException
+from .journal import Journal
+from .player import PlayerException, PlayerMap
+from .store import DuplicateGameException, StoreException
+from .touch import RallyException
+
+
+class TagServerException(Exception):
+    """Raise an exception about a tagging request."""
+
+    def __init__(self, status, message, *args):
+        """Initialize with the HTTP status and message of the reply."""
+        self.status = status
+        self.message = message
+        super().__init__(message, status, *args)
+
+
+class TagServer(ThreadingMixIn, HTTPServer):
+    """
+    HTTP server journaling the rallies of live games as they are tagged.
+
+    Each rally posted to a game is parsed with the rally grammar and, if
+    valid, appended to the Journal of the game, so a tagger sees errors as
+    soon as a rally is entered and no file has to be exported and re-read.
+    A finished game is played and added to the Store with its players.
+
+    The requests are::
+
+        POST /games                  {"players": [p1, p2, p3, p4]}
+        POST /games/<UID>/rallies    one rally per line, or {"rally": ...}
+        POST /games/<UID>/finish
+        GET  /games/<UID>
+
+    Every reply is JSON, and errors have an 'error' message.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, directory, store, quiet=False,
+                 **journal_options):
+        """Initialize TagServer journaling games in a directory."""
+        super().__init__(address, TagHandler)
+        self.directory = Path(directory)
+        self.store = store
+        self.quiet = quiet
+        self.journal_options = journal_options
+        self._journals = {}
+        self._lock = threading.Lock()
+
+    def journal(self, uid):
+        """Return the open Journal of a game, recovering it if needed."""
+        try:
+            Game.valid_id(uid)
+        except SyntaxError as e:
+            raise TagServerException(400, str(e), uid)
+        journal = self._journals.get(uid)
+        if journal is None:
+            if not self.directory.joinpath(uid + '.json').exists():
+                raise TagServerException(404, "Game is not being tagged.",
+                                         uid)
+            journal = self._journals[uid] = Journal.open(
+                self.directory, uid, **self.journal_options)
+        return journal
+
+    def new_game(self, players):
+        """Start journaling a new game of four player UIDs."""
+        if not isinstance(players, list) or len(players) != 4:
+            raise TagServerException(400, "A game needs four players.",
+                                     players)
+        with self._lock:
+            try:
+                playermap = PlayerMap(*(self.store.load(p) for p in players))
+            except Exception as e:
+                raise TagServerException(404, "Unknown player.", str(e))
+            journal = Journal(Game(playermap), self.directory,
+                              **self.journal_options)
+            self._journals[journal.game.UID] = journal
+            return {'game': journal.game.UID}
+
+    def tag(self, uid, rallies):
+        """
+        Append rallies to a game until one of them is invalid.
+
+        Return the number of rallies of the game, and the error of the first
+        invalid rally if there is one.
+        """
+        with self._lock:
+            journal = self.journal(uid)
+            reply = {'game': uid}
+            for i, rally in enumerate(rallies):
+                try:
+                    journal.append(rally)
+                except Exception as e:
+                    reply.update(error=str(e.args[0] if e.args else e),
+                                 rally=rally, accepted=i)
+                    break
+            journal.sync()
+            reply['rallies'] = len(journal)
+            return reply
+
+    def status(self, uid):
+        """Return the number of rallies and the rally strings of a game."""
+        with self._lock:
+            journal = self.journal(uid)
+            actions = journal.game.to_json(game_played=False)['actions']
+            return {'game': uid, 'rallies': len(journal),
+                    'actions': actions or []}
+
+    def finish(self, uid):
+        """
+        Play a game and add it to the store, then stop journaling it.
+
+        The journal is kept open if the game cannot be stored, so tagging
+        can continue.
+        """
+        with self._lock:
+            journal = self.journal(uid)
+            game = journal.game
+            if not len(game):
+                raise TagServerException(400, "Game has no rallies.", uid)
+
+            game.play(save_stats=False)
+            stored = self.store.add(game)
+            if stored == game.UID:
+                game.play()
+                for player in game.players:
+                    self.store.add(player)
+            self.store.flush()
+
+            journal.close()
+            del self._journals[uid]
+            journal.log_path.unlink()
+            journal.snapshot_path.unlink()
+            return {'game': stored, 'score': game.score}
+
+    def server_close(self):
+        """Close the journals and the server."""
+        with self._lock:
+            for journal in self._journals.values():
+                journal.close(snapshot=True)
+            self._journals.clear()
+        super().server_close()
+
+
+class TagHandler(BaseHTTPRequestHandler):
+    """Request handler of a TagServer."""
+
+    def _reply(self, status, body):
+        """Send a JSON reply."""
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self):
+        """Return the request body as text."""
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length).decode()
+
+    def _route(self):
+        """Return the parts of the request path."""
+        return [p for p in self.path.split('?')[0].split('/') if p]
+
+    def _handle(self, method):
+        """Dispatch a request and reply with its result or error."""
+        try:
+            self._reply(200, method(self._route()))
+        except TagServerException as e:
+            self._reply(e.status, {'error': e.message})
+        except DuplicateGameException as e:
+            self._reply(409, {'error': str(e.args[0]), 'game': e.existing})
+        except (GameException, PlayerException, RallyException,
+                StoreException) as e:
+            self._reply(400, {'error': str(e.args[0] if e.args else e)})
+        except (AttributeError, KeyError, ValueError) as e:
+            self._reply(400, {'error': "Invalid request.", 'detail': repr(e)})
+
+    def _get(self, route):
+        """Handle a GET request."""
+        if len(route) == 2 and route[0] == 'games':
+            return self.server.status(route[1])
+        raise TagServerException(404, "Not found.", self.path)
+
+    def _post(self, route):
+        """Handle a POST request."""
+        if route == ['games']:
+            return self.server.new_game(json.loads(self._body() or '{}')
+                                        .get('players'))
+        if len(route) == 3 and route[0] == 'games':
+            if route[2] == 'rallies':
+                body = self._body()
+                if self.headers.get('Content-Type', '').startswith(
+                        'application/json'):
+                    rallies = [json.loads(body)['rally']]
+                else:
+                    rallies = [r.strip() for r in body.splitlines()]
+                return self.server.tag(route[1], [r for r in rallies if r])
+            if route[2] == 'finish':
+                return self.server.finish(route[1])
+        raise TagServerException(404, "Not found.", self.path)
+
+    def do_GET(self):
+        """Reply to a GET request."""
+        self._handle(self._get)
+
+    def do_POST(self):
+        """Reply to a POST request."""
+        self._handle(self._post)
+
+    def do_OPTIONS(self):
+        """Reply to a CORS preflight request."""
+        self.send_response(204)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        """Log a request unless the server is quiet."""
+        if not self.server.quiet:
+            super().log_message(format, *args)
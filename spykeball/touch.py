@@ -2,22 +2,26 @@
 
 __all__ = ['TouchException', 'Touch', 'Service', 'Defense', 'Set', 'Spike',
            'ErrorTouch', 'TOUCH_LEXICON', 'Rally', 'RallyException',
-           'rally_parse', 'parse', 'rally_validate', 'validate',
+           'rally_parse', 'parse', 'RallyList', 'rally_validate', 'validate',
            'rally_inject', 'inject', 'rally_select_actor',
-           'rally_select_target', 'rally_select', 'select', 'load']
+           'rally_select_target', 'rally_select', 'select', 'read',
+           'load']
+
+import copy
 
 from collections import deque, namedtuple
-from copy import deepcopy
+from collections.abc import Sequence
 from enum import Enum
 from pathlib import Path
 
 from . import io
+from . import metrics
 from . import util
 
 from .io import JSONKeyError
 from .player import PlayerException
 
-from .player import Player, PlayerMap
+from .player import Player, PlayerMap, Roster
 
 
 class TouchException(Exception):
@@ -25,18 +29,29 @@ class TouchException(Exception):
 
 
 class Touch(io.JSONSerializable):
-    """Abstract definition of a Spikeball touch."""
+    """
+    Abstract definition of a Spikeball touch.
+
+    If a Roster is given, 'actor' and 'target' are slot numbers from 1 to 4
+    and the players are resolved through the Roster when they are accessed.
+    Touches are read-only once created, so parsed rallies can be shared
+    between games and threads. Binding a touch returns a new touch.
+    """
+
+    __slots__ = ('_actor', '_success', '_target', '_strength', '_error',
+                 '_roster')
 
     _next = None
 
     def __init__(self, actor, success=True, target=None, strength=None,
-                 error=None):
+                 error=None, roster=None):
         """Initialize Abstract Touch Class."""
         self._actor = actor
         self._success = success
         self._target = target
         self._strength = strength
         self._error = error
+        self._roster = roster
 
     def __str__(self):
         """String representation of the Touch Object."""
@@ -51,28 +66,26 @@ class Touch(io.JSONSerializable):
 
         return "{}({} {}{}{})".format(
             self.__class__.__name__,
-            self._actor,
+            self.actor,
             success,
-            "" if self._target is None else " to " + str(self._target),
+            "" if self._target is None else " to " + str(self.target),
             "" if self._error is None else " " + self._error.message)
 
     def to_json(self):
         """Encode the object into valid JSON."""
-        touch = deepcopy(self.__dict__)
-        for k, v in list(touch.items()):
-            if k[0] == '_':
-                touch[k[1:]] = touch.pop(k)
-            if k[1:] == 'success' and v:
-                touch.pop(k[1:])
-            elif k[1:] in ('is_ace', 'strength', 'target', 'error') and not v:
-                touch.pop(k[1:])
-        touch['touch'] = self.__class__.__name__
+        touch = {'touch': self.__class__.__name__, 'actor': self.actor}
+        if not self._success:
+            touch['success'] = False
+        for key in ('target', 'strength', 'error', 'is_ace'):
+            value = getattr(self, key, None)
+            if value:
+                touch[key] = value.name if key == 'error' else value
         return touch
 
     @classmethod
     def from_json(cls, data):
         """Decode the object from valid JSON."""
-        if util.has_keys(data, 'touch', 'actor', error=JSONKeyError):
+        if util.haskeys(data, 'touch', 'actor', error=JSONKeyError):
             touch_type = data['touch']
             clz = None
             if touch_type == "Service":
@@ -88,72 +101,104 @@ class Touch(io.JSONSerializable):
                                  "'Service', 'Defense', 'Set', or 'Spike'.",
                                  touch_type)
 
+            kwargs = {}
+            if clz is Service:
+                kwargs['is_ace'] = bool(data.get('is_ace'))
             return clz(data['actor'],
-                       data.get('success', default=True),
-                       data.get('target'),
-                       data.get('strength'),
-                       data.get('error')
-                       )
+                       success=data.get('success', True),
+                       target=data.get('target'),
+                       strength=data.get('strength'),
+                       error=(ErrorTouch[data['error']] if data.get('error')
+                              else None),
+                       **kwargs)
 
     @property
-    def actor(self):
-        """Return actor Player."""
+    def roster(self):
+        """Return the Roster resolving the players of the touch."""
+        return self._roster
+
+    @property
+    def actor_slot(self):
+        """Return the slot number of the actor."""
+        if self._roster is None:
+            return None
         return self._actor
 
-    @actor.setter
-    def actor(self, other):
-        """Set actor Player."""
-        self._actor = other
+    @property
+    def target_slot(self):
+        """Return the slot number of the target."""
+        if self._roster is None:
+            return None
+        return self._target
+
+    def bind(self, roster, playermap=None):
+        """
+        Return a copy of the touch resolving its players through a Roster.
+
+        Touches holding players are converted to slots using their positions
+        in 'playermap', which defaults to the Roster itself.
+        """
+        touch = copy.copy(self)
+        if self._roster is None:
+            slots = roster if playermap is None else playermap
+            touch._actor = self._slot_of(slots, self._actor)
+            touch._target = self._slot_of(slots, self._target)
+        touch._roster = roster
+        return touch
+
+    @staticmethod
+    def _slot_of(players, player):
+        """Return the slot number of a player in a sequence of players."""
+        if player is None:
+            return None
+        for i, p in enumerate(players):
+            if p is player:
+                return i + 1
+        raise PlayerException("Player is not part of this player list.",
+                              player, players)
+
+    @property
+    def actor(self):
+        """Return actor Player."""
+        roster = self._roster
+        if roster is None:
+            return self._actor
+        return roster[self._actor - 1]
 
     @property
     def success(self):
         """Return success value."""
         return self._success
 
-    @success.setter
-    def success(self, other):
-        """Set success value."""
-        self._success = other
-
     @property
     def target(self):
         """Return target Player."""
-        return self._target
-
-    @target.setter
-    def target(self, other):
-        """Set target Player."""
-        self._target = other
+        roster = self._roster
+        if roster is None or self._target is None:
+            return self._target
+        return roster[self._target - 1]
 
     @property
     def strength(self):
         """Return strength value."""
         return self._strength
 
-    @strength.setter
-    def strength(self, other):
-        """Set strength value."""
-        self._strength = other
-
     @property
     def error(self):
         """Return error value."""
         return self._error
 
-    @error.setter
-    def error(self, other):
-        """Set error value."""
-        self._error = other
-
 
 class Service(Touch):
     """Service."""
 
+    __slots__ = ('_is_ace',)
+
     def __init__(self, actor, success=True, target=None, strength=None,
-                 is_ace=False, error=None):
+                 is_ace=False, error=None, roster=None):
         """Initialize Service."""
         self._is_ace = is_ace if success else False
-        super().__init__(actor, success, target, strength, error)
+        super().__init__(actor, success, target, strength, error, roster)
 
     def __str__(self):
         """String representation of the Touch Object."""
@@ -168,9 +213,9 @@ class Service(Touch):
 
         return "{}({} {}{}{})".format(
             "Ace" if self._is_ace else "Service",
-            self._actor,
+            self.actor,
             success,
-            "" if self._target is None else " to " + str(self._target),
+            "" if self._target is None else " to " + str(self.target),
             "" if self._error is None else " " + self._error.message)
 
     @property
@@ -178,23 +223,24 @@ class Service(Touch):
         """Determine if the serve is an ace."""
         return self._is_ace
 
-    @is_ace.setter
-    def is_ace(self, other):
-        """Set ace value."""
-        self._is_ace = other
-
 
 class Defense(Touch):
     """Defensive Return."""
 
+    __slots__ = ()
+
 
 class Set(Touch):
     """Set."""
 
+    __slots__ = ()
+
 
 class Spike(Touch):
     """Spike."""
 
+    __slots__ = ()
+
     def __str__(self):
         """String representation of the Spike Object."""
         success = ""
@@ -208,9 +254,9 @@ class Spike(Touch):
 
         return "{}({} {}{}{})".format(
             self.__class__.__name__,
-            self._actor,
+            self.actor,
             success,
-            "" if self._target is None else " on " + str(self._target),
+            "" if self._target is None else " on " + str(self.target),
             "" if self._error is None else " " + self._error.message)
 
 
@@ -234,6 +280,8 @@ class ErrorTouch(Enum):
 TOUCH_LEXICON = '1234aefnpsw'
 
 
+# The touches of a parsed rally are a tuple so that parsed games can be
+# shared between threads.
 Rally = namedtuple('Rally', ['playermap', 'touches'])
 
 
@@ -241,16 +289,26 @@ class RallyException(Exception):
     """Raise an exception about a rally."""
 
 
+@metrics.timed('rally_parse')
 def rally_parse(rally, playermap):
-    """Parse an action."""
+    """
+    Parse an action.
+
+    The touches refer to players by slot through a Roster. If 'playermap' is
+    a Roster, the touches share it, otherwise a new Roster is bound to it.
+    """
+    if isinstance(playermap, Roster):
+        roster = playermap
+    else:
+        roster = Roster(*playermap)
 
     def pmap(pindex):
-        valid_player = playermap[int(pindex) - 1]
-        if valid_player is None:
+        slot = int(pindex)
+        if roster[slot - 1] is None:
             raise PlayerException("Player is not part of this player list.",
-                                  pindex, playermap.values())
+                                  pindex, tuple(roster))
         else:
-            return valid_player
+            return slot
 
     touches = []
     touch = Service
@@ -290,20 +348,23 @@ def rally_parse(rally, playermap):
             modifier = next_touch()
 
             if modifier == 'n':
-                touches.append(Service(pmap(focus), success=False))
+                touches.append(Service(pmap(focus), success=False,
+                                       roster=roster))
                 is_deque_empty(error_on=False)
             elif modifier == 'a':
                 target = next_touch()
                 if target in other_team:
                     touches.append(Service(pmap(focus),
                                            target=pmap(target),
-                                           is_ace=True))
+                                           is_ace=True,
+                                           roster=roster))
                 else:
                     raise RallyException("Player cannot ace a teammate.",
                                          rally)
                 is_deque_empty(error_on=False)
             elif modifier in other_team:
-                touches.append(Service(pmap(focus), target=pmap(modifier)))
+                touches.append(Service(pmap(focus), target=pmap(modifier),
+                                       roster=roster))
                 set_focus(modifier)
                 touch = Defense
             else:
@@ -322,7 +383,8 @@ def rally_parse(rally, playermap):
 
                 # how to determine if touch was a spike or a missed set
 
-                touches.append(clz(pmap(focus), success=success))
+                touches.append(clz(pmap(focus), success=success,
+                                   roster=roster))
                 is_deque_empty(error_on=False)
 
             else:
@@ -353,14 +415,15 @@ def rally_parse(rally, playermap):
                     touches.append(touch(pmap(focus),
                                          target=pmap(target),
                                          strength=strength,
-                                         error=error))
+                                         error=error,
+                                         roster=roster))
                     set_focus(target)
                     touch = touch._next
 
                 else:
                     raise RallyException("Invalid character.", rally)
 
-    return Rally(playermap, touches)
+    return Rally(roster, tuple(touches))
 
 
 def parse(rallies, playermap):
@@ -369,6 +432,58 @@ def parse(rallies, playermap):
         yield rally_parse(rally, playermap)
 
 
+class RallyList(Sequence):
+    """
+    Rally strings parsed one rally at a time on demand.
+
+    Each rally is parsed the first time it is read and the result is kept,
+    so a game whose touches are never requested is never parsed. The rally
+    strings are copied, so changes do not reach the caller's list.
+    """
+
+    def __init__(self, rallies, roster):
+        """Initialize RallyList over rally strings and a Roster."""
+        self._strings = list(rallies)
+        self._roster = roster
+        self._rallies = [None] * len(self._strings)
+
+    def __len__(self):
+        """Return the number of rallies."""
+        return len(self._strings)
+
+    def __getitem__(self, index):
+        """Return the parsed rally, or a list of them for a slice."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        rally = self._rallies[index]
+        if rally is None:
+            rally = rally_parse(self._strings[index], self._roster)
+            self._rallies[index] = rally
+        return rally
+
+    def __setitem__(self, index, value):
+        """Replace the rally string at the index."""
+        util.typecheck(value, str)
+        self._strings[index] = value
+        self._rallies[index] = None
+
+    @property
+    def strings(self):
+        """Return the rally strings."""
+        return self._strings
+
+    @property
+    def parsed(self):
+        """Return the number of rallies parsed so far."""
+        return len(self._rallies) - self._rallies.count(None)
+
+    def append(self, rally, parsed=None):
+        """Add a rally string and, if already parsed, its Rally."""
+        util.typecheck(rally, str)
+        self._strings.append(rally)
+        self._rallies.append(parsed)
+
+
 def rally_validate(rally):
     """Return the rally if it can be parsed, else return an empty rally."""
     parsed_rally = None
@@ -382,9 +497,9 @@ def rally_validate(rally):
     try:
         parsed_rally = rally_parse(rally, playermap)
     except Exception:
-        parsed_rally = None
+        parsed_rally = Rally(playermap, None)
 
-    return Rally(playermap, parsed_rally)
+    return parsed_rally
 
 
 def validate(rallies):
@@ -394,31 +509,32 @@ def validate(rallies):
 
 
 def rally_inject(rally, playermap):
-    """Replace the players of the rally with those in the playermap."""
-    if rally.playermap != playermap:
-        for touch in rally.touches:
-            if touch.actor.UID == rally.playermap.p1.UID:
-                touch.actor = playermap.p1
-            elif touch.actor.UID == rally.playermap.p2.UID:
-                touch.actor = playermap.p2
-            elif touch.actor.UID == rally.playermap.p3.UID:
-                touch.actor = playermap.p3
-            elif touch.actor.UID == rally.playermap.p4.UID:
-                touch.actor = playermap.p4
-
-            if touch.target.UID == rally.playermap.p1.UID:
-                touch.target = playermap.p1
-            elif touch.target.UID == rally.playermap.p2.UID:
-                touch.target = playermap.p2
-            elif touch.target.UID == rally.playermap.p3.UID:
-                touch.target = playermap.p3
-            elif touch.target.UID == rally.playermap.p4.UID:
-                touch.target = playermap.p4
-    return rally
+    """
+    Replace the players of the rally with those in the playermap.
+
+    The touches of the rally are bound to a Roster, either 'playermap'
+    itself or a new Roster of its players, so the rally and the Roster it
+    was parsed with are never changed.
+    """
+    if not isinstance(playermap, Roster):
+        playermap = Roster(*playermap)
+    if rally.touches is None:
+        return Rally(playermap, None)
+    if rally.playermap is playermap:
+        return rally
+    return Rally(playermap, tuple(touch.bind(playermap, rally.playermap)
+                                  for touch in rally.touches))
 
 
 def inject(rallies, playermap):
-    """Replace the players of the rally with those in the playermap."""
+    """
+    Replace the players of the rallies with those in the playermap.
+
+    The rallies are bound to one Roster, which is new unless 'playermap' is
+    a Roster.
+    """
+    if not isinstance(playermap, Roster):
+        playermap = Roster(*playermap)
     for rally in rallies:
         yield rally_inject(rally, playermap)
 
@@ -449,10 +565,14 @@ def select(rallies, player):
         yield from rally_select(rally, player)
 
 
+def read(fp, *delimeters):
+    """Retrieve the rally strings from a file."""
+    with open(fp, "r+") as file:
+        return [s for s in io.readsplitby(file, ",", "\n", *delimeters)
+                if s != '']
+
+
 def load(fp, *delimeters):
     """Retrieve the rallies from a file."""
     if Path(fp).is_file:
-        with open(fp, "r+") as file:
-            rallies = [s for s in io.readsplitby(file, ",", "\n", *delimeters)
-                       if s != '']
-            yield from validate(rallies)
+        yield from validate(read(fp, *delimeters))
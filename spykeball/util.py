@@ -3,10 +3,12 @@
 __all__ = ['default_typeerror', 'typecheck', 'isinnertype', 'isnestedtype',
            'haskeys', 'flatten', 'groupby', 'randstring', 'UIDObject']
 
-import string
 import random
+import re
+import string
+import threading
 
-from collections import Iterable, Sequence
+from collections.abc import Iterable, Sequence
 from itertools import zip_longest
 
 
@@ -85,26 +87,42 @@ def randstring(n=1, source=None):
 
 
 class UIDObject(object):
-    """A Unique Identifier for Each Subclass."""
+    """
+    A Unique Identifier for Each Subclass.
+
+    A UID is the first letter of the class followed by groups of six digits.
+    New UIDs encode a random 64-bit integer as four groups, and UIDs in the
+    older format of one to seven random groups are still accepted. The
+    registry of UIDs is a set guarded by a reentrant lock, since objects may
+    be created from several threads and collected in any of them.
+    """
+
+    _obj_uid_list = set()
+    _obj_uid_lock = threading.RLock()
 
-    _obj_uid_list = []
+    UID_BITS = 64
+    UID_GROUPS = 4
+    UID_PATTERN = re.compile(r'([A-Za-z])((?:-[0-9]{6})+)')
 
     def __init__(self, object_uid=None, **kwargs):
         """Create the object_uid."""
-        self._object_uid = object_uid
-
-        if object_uid in self.__class__._obj_uid_list:
-            raise IndexError("No two UIDObjects can have the same object_uid.",
-                             self, object_uid)
-        else:
-            self._object_uid = self.generate_uid(seed=object_uid)
-        self.__class__._obj_uid_list.append(self._object_uid)
+        self._object_uid = None
+        self._object_uid_num = None
+
+        with UIDObject._obj_uid_lock:
+            uid = self.generate_uid(seed=object_uid)
+            if uid in UIDObject._obj_uid_list:
+                raise IndexError("No two UIDObjects can have the same "
+                                 "object_uid.", self, object_uid)
+            UIDObject._obj_uid_list.add(uid)
+            self._object_uid = uid
         super().__init__(**kwargs)
 
     def __del__(self):
         """Deleting a UIDObject removes its id from the __obj_uid_list."""
-        index = self.__class__._obj_uid_list.index(self.UID)
-        del self.__class__._obj_uid_list[index]
+        if self._object_uid is not None:
+            with UIDObject._obj_uid_lock:
+                UIDObject._obj_uid_list.discard(self._object_uid)
 
     @property
     def UID(self):
@@ -114,19 +132,33 @@ class UIDObject(object):
     @property
     def UID_num(self):
         """Return the numeric component of the object_uid for this Object."""
-        return int(''.join(self._object_uid.split('-')[1:]))
+        if self._object_uid_num is None:
+            self._object_uid_num = self.parse_uid(self._object_uid)[1]
+        return self._object_uid_num
+
+    @classmethod
+    def format_uid(cls, num, groups=None):
+        """Return the UID of the class with a number as six-digit groups."""
+        digits = str(num).zfill(6 * (groups or cls.UID_GROUPS))
+        if len(digits) % 6:
+            digits = digits.zfill(len(digits) + 6 - len(digits) % 6)
+        return cls.__name__[0] + ''.join(
+            '-' + digits[i:i + 6] for i in range(0, len(digits), 6))
+
+    @classmethod
+    def parse_uid(cls, uid):
+        """Return the class letter and the number of a UID."""
+        typecheck(uid, str)
+        match = cls.UID_PATTERN.fullmatch(uid)
+        if match is None:
+            raise SyntaxError("UID must contain sets of six-digit numbers.")
+        return match.group(1), int(match.group(2).replace('-', ''))
 
     @classmethod
     def generate_uid(cls, seed=None):
         """Generate a Unique ID."""
-        class_letter = cls.__name__[0]
         if isinstance(seed, int):
-            num = list(str(seed))
-            result = []
-            while len(num) > 0:
-                result.append('-' + ''.join(num[:6]) + '0' * (6-len(num[:6])))
-                del num[:6]
-            return class_letter + ''.join(result)
+            return cls.format_uid(seed)
         elif isinstance(seed, str):
             try:
                 if cls.valid_id(seed):
@@ -140,33 +172,17 @@ class UIDObject(object):
                         pass
                 return cls.generate_uid(seed=int(''.join(num_list)))
         else:
-            test_uid = ''
-            first_loop = True
-            while first_loop or test_uid in cls._obj_uid_list:
-                first_loop = False
-                num_list = []
-                for _ in range(0, random.randrange(1, random.randrange(4, 8))):
-                    num = str(random.randrange(0, 999999))
-                    num_list.append('-' + num + '0' * (6-len(num)))
-                test_uid = class_letter + ''.join(num_list)
-            return test_uid
+            with UIDObject._obj_uid_lock:
+                while True:
+                    uid = cls.format_uid(random.getrandbits(cls.UID_BITS))
+                    if uid not in UIDObject._obj_uid_list:
+                        return uid
 
     @classmethod
     def valid_id(cls, uid):
         """Verify the Unique ID."""
-        typecheck(uid, str)
-        digiterror = SyntaxError("UID must contain sets of six-digit numbers.")
-        uid_as_list = uid.split('-')
-        if uid_as_list[0] == cls.__name__[0]:
-            for num in uid_as_list[1:]:
-                if len(num) != 6:
-                    raise digiterror
-                else:
-                    try:
-                        int(num)
-                    except ValueError:
-                        raise digiterror
-            return True
-        else:
+        letter, _ = cls.parse_uid(uid)
+        if letter != cls.__name__[0]:
             raise SyntaxError(
                 "UID must begin with the same letter as the class.")
+        return True
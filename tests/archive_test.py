@@ -0,0 +1,59 @@
+"""Archive Tests."""
+
+import gc
+import json
+
+import pytest
+
+from spykeball import synth
+from spykeball import Archive, ArchiveException, Game
+
+
+@pytest.fixture
+def game_files(players, tmp_path):
+    """Save played games whose objects no longer exist."""
+    directory = tmp_path.joinpath('games')
+    directory.mkdir()
+    scores = {}
+    for rallies in synth.games(4, seed=14):
+        game = Game(players, rallies)
+        game.play(save_stats=False)
+        game.save(directory.joinpath(game.UID + '.json'))
+        scores[game.UID] = dict(game.score)
+    del game
+    gc.collect()
+    return directory, players, scores
+
+
+@pytest.mark.parametrize('codec', ['zlib', 'lzma'])
+def test_archive_games(tmp_path, game_files, codec):
+    """Test that archived games read like saved games."""
+    directory, players, scores = game_files
+    archive = Archive(tmp_path.joinpath('archive'))
+    assert sorted(archive.archive(directory, codec=codec)) == sorted(scores)
+    assert not list(directory.iterdir())
+
+    archive = Archive(tmp_path.joinpath('archive'))
+    assert len(archive) == 4
+    for uid, score in scores.items():
+        assert archive.players(uid) == tuple(p.UID for p in players)
+        assert json.loads(archive.read(uid))['score'] == score
+        game = archive.load(uid, with_stats=False)
+        assert game.score == score
+        del game
+    assert len(archive.games_of(players.p1.UID)) == 4
+
+
+def test_archive_compact(tmp_path):
+    """Test that compaction merges segments."""
+    archive = Archive(tmp_path)
+    archive.pack([('G-000001', '{"UID": "G-000001"}')], codec='zlib')
+    archive.pack([('G-000002', '{"UID": "G-000002"}')])
+    assert len(archive.segments) == 2
+
+    archive.compact()
+    archive = Archive(tmp_path)
+    assert len(archive.segments) == 1
+    assert json.loads(archive.read('G-000001')) == {'UID': 'G-000001'}
+    with pytest.raises(ArchiveException):
+        archive.read('G-000003')
@@ -0,0 +1,53 @@
+"""Batch Tests."""
+
+import json
+
+import pytest
+
+from spykeball import batch
+from spykeball import synth
+from spykeball import Player
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    """Write a manifest of synthetic games for six players."""
+    players = [Player(name) for name in 'abcdef']
+    entries = []
+    for i, rallies in enumerate(synth.games(6, seed=1)):
+        tmp_path.joinpath('g{}.txt'.format(i)).write_text(','.join(rallies))
+        entries.append({
+            'players': [players[(i + k) % 6].UID for k in range(4)],
+            'actions': 'g{}.txt'.format(i)
+        })
+    fp = tmp_path.joinpath('manifest.json')
+    fp.write_text(json.dumps(entries))
+    return {'fp': fp, 'players': {p.UID: p for p in players}}
+
+
+def test_load_manifest(manifest, tmp_path):
+    """Test that manifest paths are resolved against the manifest."""
+    entries = batch.load_manifest(manifest['fp'])
+    assert len(entries) == 6
+    assert entries[0][1] == tmp_path.joinpath('g0.txt')
+
+    tmp_path.joinpath('bad.json').write_text('[{"players": ["P-000001"]}]')
+    with pytest.raises(batch.BatchException):
+        batch.load_manifest(tmp_path.joinpath('bad.json'))
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_score_batch(manifest, jobs):
+    """Test that every game is scored and added to its players."""
+    entries = batch.load_manifest(manifest['fp'])
+    players = manifest['players']
+    results, elapsed = batch.score_batch(entries, players, jobs=jobs)
+
+    assert len(results) == 6
+    for (pids, _), result in zip(entries, results):
+        record = json.loads(result.record)
+        assert record['UID'] == result.UID
+        teams = record['teams']['home'] + record['teams']['away']
+        assert [p['UID'] for p in teams] == list(pids)
+        for pid, stat in zip(pids, result.stats):
+            assert players[pid].stats[result.UID]['stat'] == stat
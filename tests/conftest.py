@@ -0,0 +1,25 @@
+"""Test Configuration."""
+
+import pytest
+
+from spykeball import synth
+from spykeball import Game, Player, PlayerMap
+
+
+@pytest.fixture
+def players():
+    """Return a fresh PlayerMap."""
+    return PlayerMap(Player('a'), Player('b'), Player('c'), Player('d'))
+
+
+@pytest.fixture(scope='session')
+def season():
+    """Return played synthetic games rotating through six players."""
+    players = [Player(name) for name in 'abcdef']
+    games = []
+    for i, rallies in enumerate(synth.games(30, seed=1)):
+        playermap = PlayerMap(*(players[(i + k) % 6] for k in range(4)))
+        game = Game(playermap, rallies)
+        game.play(save_stats=False)
+        games.append(game)
+    return {'players': players, 'games': games}
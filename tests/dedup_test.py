@@ -0,0 +1,68 @@
+"""Deduplication Tests."""
+
+import pytest
+
+from spykeball import synth
+from spykeball import (Archive, DuplicateGameException, Game, PlayerMap,
+                       Store)
+
+
+def _store(tmp_path, **kwargs):
+    """Return a Store in a temporary directory."""
+    return Store(tmp_path / 'games', tmp_path / 'players', **kwargs)
+
+
+def test_content_hash(players):
+    """Test that the hash depends on the rallies and players only."""
+    rallies = next(synth.games(1, seed=15))
+    first, second = Game(players, rallies), Game(players, list(rallies))
+    assert first.UID != second.UID
+    assert first.content_hash == second.content_hash
+    assert first.content_hash != Game(players, rallies[:-1]).content_hash
+    swapped = PlayerMap(players.p2, players.p1, players.p3, players.p4)
+    assert first.content_hash != Game(swapped, rallies).content_hash
+
+
+def test_store_rejects_and_merges(players, tmp_path):
+    """Test that duplicate games are rejected or merged."""
+    rallies = next(synth.games(1, seed=16))
+    first, second = Game(players, rallies), Game(players, rallies)
+
+    with _store(tmp_path) as store:
+        first.play()
+        assert store.add(first) == first.UID
+        assert store.add(first) == first.UID
+        with pytest.raises(DuplicateGameException):
+            store.add(second)
+
+    store = _store(tmp_path, on_duplicate='merge')
+    second.play()
+    assert second.UID in players.p1.stats
+    assert store.add(second) == first.UID
+    assert second.UID not in players.p1.stats
+    assert first.UID in players.p1.stats
+    assert len(store) == 0
+
+
+def test_dedup(players, tmp_path):
+    """Test that dedup keeps stored games over archived duplicates."""
+    rallies = next(synth.games(1, seed=17))
+    archive = Archive(tmp_path / 'archive')
+    games = [Game(players, rallies) for _ in range(3)]
+
+    for game in games:
+        game.play()
+        with _store(tmp_path) as store:
+            store.add(game)
+            store.add(players.p1)
+        tmp_path.joinpath('games', Store.HASH_INDEX).unlink()
+    archive.archive(tmp_path / 'games')
+    games[2].save(tmp_path / 'games' / (games[2].UID + '.json'))
+
+    store = _store(tmp_path, archive=archive)
+    removed = store.dedup()
+    assert removed == {g.UID: games[2].UID for g in games[:2]}
+    assert list(archive) == [games[2].UID]
+    assert store.segment(players.p1.UID).games() == [games[2].UID]
+    assert list(players.p1.stats) == [games[2].UID]
+    assert store.dedup() == {}
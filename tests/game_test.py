@@ -1,10 +1,16 @@
 """Game Tests."""
 
+import gc
+
 import pytest
 
 from spykeball import game
+from spykeball import synth
+from spykeball import touch
 from spykeball import util
 
+from spykeball.player import Player, PlayerMap
+
 
 @pytest.fixture(scope='session')
 def sample_games(sample_players):
@@ -27,3 +33,250 @@ def test_game_iteration(sample_games):
 def test_game_containment(sample_games):
     """Test the containment of players or actions in game objects."""
     assert True
+
+
+def test_game_load_shares_players(players, tmp_path):
+    """Test that games loaded in a session share their players."""
+    files = []
+    for i, rallies in enumerate(synth.games(2, seed=1)):
+        g = game.Game(players, rallies)
+        g.play(save_stats=False)
+        files.append(tmp_path.joinpath('{}.json'.format(i)))
+        g.save(files[-1], with_stats=False)
+        del g
+    gc.collect()
+
+    games = [game.Game.load(fp, with_stats=False) for fp in files]
+    assert games[0].players == games[1].players == players
+
+
+def test_load_trusts_stored_results(players, tmp_path):
+    """Test that a loaded game keeps its results and parses lazily."""
+    g = game.Game(players, next(synth.games(1, seed=3)))
+    g.play(save_stats=False)
+    stats = {p: g.player_stat(p) for p in players}
+    record = g.to_json()
+    record = dict(record, teams={k: [p.to_json() for p in team]
+                                 for k, team in record['teams'].items()},
+                  stats=dict(record['stats'],
+                             model=record['stats']['model'].to_json()))
+    uid, score, winner = g.UID, g.score, g.winner
+    del g
+    gc.collect()
+
+    loaded = game.Game.from_json(record)
+    assert not loaded.parsed
+    assert loaded.played and loaded.stats_calculated
+    assert loaded.UID == uid
+    assert loaded.score == score and loaded.winner == winner
+    assert {p: loaded.player_stat(p) for p in players} == stats
+    assert not loaded.parsed
+    assert len(loaded) == len(record['actions'])
+    assert loaded[0].touches
+    assert loaded.actions.parsed == 1
+
+    copies = [dict(record, UID=game.Game.format_uid(i)) for i in range(3)]
+    games = game.Game.from_json_many(copies, with_stats=False)
+    assert all(not g.stats_calculated for g in games)
+    assert games[0].players == games[2].players == players
+
+    with pytest.raises(game.JSONKeyError):
+        game.Game.from_json(dict(record, teams={'home': []}))
+
+
+def test_load_record_without_timeline(players):
+    """Test that a record saved without a timeline is played again."""
+    rallies = next(synth.games(1, seed=5))
+    record = {'UID': game.Game.format_uid(5),
+              'teams': {'home': [players.p1.to_json(), players.p2.to_json()],
+                        'away': [players.p3.to_json(), players.p4.to_json()]},
+              'actions': rallies,
+              'winner': 'home',
+              'score': {'home': 0, 'away': 0},
+              'stats': {'model': {'name': 'Model1'}}}
+
+    loaded = game.Game.from_json(record)
+    assert not loaded.played and not loaded.parsed
+    assert loaded.play(save_stats=False)['score'] == game.score(
+        game.Game(players, rallies)).score
+    assert loaded.timeline is not None
+
+
+def test_rallies_parse_on_demand(players):
+    """Test that each rally is parsed when its touches are first read."""
+    rallies = next(synth.games(1, seed=4))
+    g = game.Game(players, rallies + ['1x'])
+    assert g.actions.parsed == 0 and len(g) == len(rallies) + 1
+
+    rally = g[2]
+    assert g[2] is rally and g.actions.parsed == 1
+    g[2] = rallies[3]
+    assert g.actions.parsed == 0
+    assert g[2] is not rally and g.actions.strings[2] == rallies[3]
+
+    with pytest.raises(game.RallyException):
+        g.play(save_stats=False)
+
+
+def test_games_do_not_share_rally_strings(players):
+    """Test that games built from one list change independently."""
+    rallies = next(synth.games(1, seed=6))
+    first, second = game.Game(players, rallies), game.Game(players, rallies)
+    count = len(rallies)
+
+    first.append(rallies[0])
+    first[0] = rallies[1]
+    assert len(rallies) == len(second) == count
+    assert second.actions.strings[0] == rallies[0]
+    assert second[count - 1].touches
+    second.play(save_stats=False)
+
+
+def test_timeline(players):
+    """Test the point by point timeline built by play."""
+    rallies = next(synth.games(1, seed=2))
+    g = game.Game(players, rallies)
+    g.play(save_stats=False)
+
+    timeline = g.timeline
+    assert len(timeline) == len(rallies)
+    assert timeline.score_at(-1) == g.score
+    assert timeline.points() == g.score
+    assert timeline.serving(0) == 'home'
+
+    home = away = 0
+    for i in range(len(rallies)):
+        if timeline.winner(i) == 'home':
+            home += 1
+        else:
+            away += 1
+        assert timeline.score_at(i) == {'home': home, 'away': away}
+        if i:
+            assert timeline.serving(i) == timeline.winner(i - 1)
+
+    first, rest = timeline.points(0, 10), timeline.points(10)
+    assert first['home'] + rest['home'] == g.score['home']
+    assert game.Timeline.from_json(timeline.to_json()).to_json() == (
+        timeline.to_json())
+
+
+def test_stats_for(players):
+    """Test that windowed stats match stats of the windowed rallies."""
+    rallies = next(synth.games(1, seed=3))
+    g = game.Game(players, rallies)
+    g.play(save_stats=False)
+
+    assert g.stats_for() == {p: g.player_stat(p) for p in players}
+
+    window = game.Game(players, rallies[5:15])
+    expected = window.stat_model.calculate(window)
+    assert g.stats_for(5, 15) == expected
+
+
+def test_substitution_rebinds_touches(players):
+    """Test that substituting a player rebinds every parsed touch."""
+    rallies = next(synth.games(1, seed=4))
+    g = game.Game(players, rallies)
+    g.play(save_stats=False)
+    before = g.player_stat(players.p1)
+
+    sub = Player('e')
+    g['p1'] = sub
+    assert g.p1 is sub
+    assert all(t.actor is not players.p1
+               for rally in g for t in rally.touches)
+    assert g[sub]['actor']
+    assert g.player_stat(sub) == before
+    assert g.winner in (g.home_team, g.away_team)
+    assert sub in g.home_team
+
+
+def test_inject_leaves_game_unchanged(players):
+    """Test that injecting players into rallies does not change the game."""
+    others = PlayerMap(Player('e'), Player('f'), Player('g'), Player('h'))
+    g = game.Game(players, next(synth.games(1, seed=6)))
+    actor = g[0].touches[0].actor
+
+    injected = list(touch.inject(g.actions, others))
+    assert injected[0].touches[0].actor is others[players.index(actor)]
+    assert injected[0].playermap is injected[-1].playermap
+    assert g[0].touches[0].actor is actor
+    assert g.stats_for()
+
+
+def test_whatif_matches_replayed_games(players):
+    """Test that what-if outcomes match games played with each lineup."""
+    rallies = next(synth.games(1, seed=5))
+    g = game.Game(players, rallies)
+
+    table = g.whatif()
+    assert len(table) == 24
+    assert not g.played and g.score['home'] is None
+    same = table[1:][[o.players.p1 for o in table[1:]].index(players.p1)]
+    score, stat = dict(same.score), dict(same.stats[players.p1])
+    table[0].score['home'] += 1
+    table[0].stats[players.p1]['total'] += 1
+    assert same.score == score and same.stats[players.p1] == stat
+    table = g.whatif()
+    for outcome in table[::7]:
+        replay = game.Game(outcome.players, rallies)
+        replay.play(save_stats=False)
+        assert outcome.score == replay.score
+        assert outcome.winner == replay.winner
+        assert outcome.stats == {p: replay.player_stat(p)
+                                 for p in outcome.players}
+
+
+def test_touches_are_read_only(players):
+    """Test that parsed touches cannot be changed or rebound in place."""
+    others = PlayerMap(Player('e'), Player('f'), Player('g'), Player('h'))
+    g = game.Game(players, next(synth.games(1, seed=7)))
+    rally = g[0]
+    touch = rally.touches[0]
+    with pytest.raises(AttributeError):
+        touch.actor = players.p2
+    with pytest.raises(AttributeError):
+        touch.note = 'changed'
+
+    copy = game.Game(others, [rally])
+    assert copy[0].touches[0].actor is others[players.index(touch.actor)]
+    assert g[0].touches[0] is touch and touch.actor in players
+
+
+def test_score_is_pure(players):
+    """Test that score matches play without modifying the game."""
+    rallies = next(synth.games(1, seed=7))
+    g = game.Game(players, rallies)
+
+    result = game.score(g)
+    assert not g.played and not any(p.stats for p in players)
+
+    g.play(save_stats=False)
+    assert result.score == g.score
+    assert result.winner == g.winner
+    assert result.timeline.to_json() == g.timeline.to_json()
+    assert result.stats == {p: g.player_stat(p) for p in players}
+
+
+def test_score_threads(players):
+    """Test scoring games and creating players from many threads."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    rallies = list(synth.games(8, seed=8))
+    games = [game.Game(players, r) for r in rallies]
+    expected = [game.score(game.Game(players, r)) for r in rallies]
+
+    def work(i):
+        g = games[i % len(games)]
+        created = [Player(str(i)) for _ in range(20)]
+        return game.score(g), created
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(work, range(200)))
+
+    assert all(g.parsed for g in games)
+    uids = [p.UID for _, created in results for p in created]
+    assert len(set(uids)) == len(uids)
+    for i, (result, _) in enumerate(results):
+        assert result.stats == expected[i % len(games)].stats
+        assert result.score == expected[i % len(games)].score
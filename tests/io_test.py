@@ -1 +1,16 @@
 """Core IO Tests."""
+
+import os
+
+from spykeball import io
+
+
+def test_atomic_write_permissions(tmp_path):
+    """Test that atomic writes follow the umask and keep file permissions."""
+    fp = tmp_path.joinpath('data.json')
+    io.atomic_write(fp, '{}')
+    assert fp.stat().st_mode & 0o777 == 0o666 & ~io.UMASK
+
+    os.chmod(str(fp), 0o640)
+    io.atomic_write(fp, '[]')
+    assert fp.stat().st_mode & 0o777 == 0o640 and fp.read_text() == '[]'
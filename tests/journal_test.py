@@ -0,0 +1,65 @@
+"""Journal Tests."""
+
+import gc
+
+import pytest
+
+from spykeball import synth
+from spykeball import Game
+
+from spykeball.journal import Journal
+from spykeball.touch import RallyException
+
+
+def test_journal_recover(players, tmp_path):
+    """Test that a game is rebuilt from its snapshot and log."""
+    rallies = next(synth.games(1, seed=9))
+    journal = Journal(Game(players), tmp_path, sync_every=4,
+                      snapshot_every=10)
+    for rally in rallies:
+        journal.append(rally)
+    uid, score = journal.game.UID, journal.game.play(save_stats=False)
+    score = dict(score['score'])
+    journal.close()
+    del journal
+    gc.collect()
+
+    game = Journal.recover(tmp_path, uid)
+    assert game.actions is not None and len(game) == len(rallies)
+    game.play(save_stats=False)
+    assert game.score == score
+
+
+def test_journal_torn_tail(players, tmp_path):
+    """Test that a torn record and everything after it are dropped."""
+    rallies = next(synth.games(1, seed=10))
+    with Journal(Game(players), tmp_path, snapshot_every=1000) as journal:
+        for rally in rallies[:5]:
+            journal.append(rally)
+        uid, log = journal.game.UID, journal.log_path
+    del journal
+    gc.collect()
+
+    with open(log, 'ab') as file:
+        file.write(b'5\t' + rallies[5].encode())
+
+    journal = Journal.open(tmp_path, uid)
+    assert len(journal) == 5
+    assert log.read_bytes().endswith(b'\n')
+    journal.append(rallies[5])
+    journal.close(snapshot=True)
+    assert log.stat().st_size == 0
+
+
+def test_journal_serving_order(players, tmp_path):
+    """Test that a rally served by the wrong team is not journaled."""
+    rallies = next(synth.games(1, seed=11))
+    with Journal(Game(players), tmp_path) as journal:
+        with pytest.raises(RallyException):
+            journal.append('3a1')
+        for rally in rallies[:3]:
+            journal.append(rally)
+        with pytest.raises(RallyException):
+            journal.append('3a1' if rallies[3][0] in '12' else '1a3')
+        assert len(journal) == 3
+        assert journal.log_path.read_text().count('\n') == 3
@@ -0,0 +1,51 @@
+"""Metrics Tests."""
+
+import io as _io
+
+import pytest
+
+from spykeball import io
+from spykeball import metrics
+from spykeball import touch
+from spykeball import Player, PlayerMap
+
+
+@pytest.fixture
+def playermap():
+    """Return a fresh PlayerMap."""
+    return PlayerMap(Player('p1'), Player('p2'), Player('p3'), Player('p4'))
+
+
+def test_disabled_records_nothing(playermap):
+    """Test that nothing is recorded while metrics are disabled."""
+    metrics.reset()
+    touch.rally_parse('1343121p', playermap)
+    assert metrics.to_dict() == {}
+
+
+def test_profile_records_stages(playermap):
+    """Test that stages and generator stages are timed when enabled."""
+    with metrics.profile():
+        for _ in range(3):
+            touch.rally_parse('1343121p', playermap)
+        list(io.readsplitby(_io.StringIO('1n,2n\n3n'), ',', '\n'))
+        with metrics.timer('calculate', model='Model1'):
+            pass
+    assert not metrics.is_enabled()
+
+    stats = metrics.to_dict()
+    assert stats['rally_parse']['count'] == 3
+    assert stats['readsplitby']['count'] == 1
+    assert stats['calculate[model=Model1]']['count'] == 1
+
+
+def test_to_prometheus():
+    """Test the Prometheus text format."""
+    metrics.reset()
+    metrics.record('play', 0.5)
+    metrics.record('play', 1.5)
+    text = metrics.to_prometheus()
+    assert '# TYPE spykeball_stage_seconds summary' in text
+    assert 'spykeball_stage_seconds_count{stage="play"} 2' in text
+    assert 'spykeball_stage_seconds_sum{stage="play"} 2.0' in text
+    metrics.reset()
@@ -4,3 +4,106 @@ import pytest
 
 from spykeball import model
 from spykeball import util
+
+from spykeball import synth
+from spykeball import Game, GameException, score
+
+
+def test_linear_model_matches_components():
+    """Test that compiled Model1 matches its formulas."""
+    count = dict.fromkeys(model.COMPONENT_KEYS, 0)
+    count.update(serves_made=3, serve_total=4, aces=1, d_touch_r=5,
+                 d_touch_nr=2, spikes_returned=1, spike_total=4,
+                 missed_sets=1, tough_touch=1)
+    stats = model.Model1.calculate_components({'p': count}, 78)['p']
+
+    hitting = 20 * (1 - 0.25)
+    assert stats['hitting'] == hitting
+    assert stats['defense'] == round((2 + 0.4 * hitting * 5) * 0.5, 4)
+    assert stats['serving'] == 5.5 + 15 * 0.75
+    assert stats['cleanliness'] == 20 - 5 - 2
+    assert stats['total'] == round(sum(v for k, v in stats.items()
+                                       if k != 'total'), 4)
+
+
+def test_calculate_many(players):
+    """Test that scoring many games at once matches scoring each game."""
+    games = [Game(players, rallies) for rallies in synth.games(3, seed=6)]
+    for game, stats in zip(games, model.Model1.calculate_many(games)):
+        assert stats == model.Model1.calculate(game)
+
+
+def test_linear_model_unknown_factor():
+    """Test that terms over unknown factors fail to compile."""
+    with pytest.raises(NameError):
+        class Broken(model.LinearStatModel):
+            terms = {'hitting': {'aces*spin': 1}}
+
+
+def test_registry():
+    """Test that models are registered by versioned identifier."""
+    class Versioned(model.Model1):
+        version = 1
+
+    latest = type('Versioned', (model.Model1,), {'version': 2})
+
+    assert model.StatModel.registry['Versioned:1'] is Versioned
+    assert model.StatModel.from_json(Versioned.to_json()) is Versioned
+    assert model.StatModel.from_json(
+        {'UID': None, 'name': 'Versioned'}) is latest
+    assert model.StatModel.from_json(
+        {'UID': None, 'name': 'Model1'}) is model.Model1
+
+    with pytest.raises(NameError):
+        class Versioned(model.Model1):
+            version = 1
+
+    with pytest.raises(NameError):
+        model.StatModel.from_json({'UID': 'Missing:1', 'name': 'Missing'})
+
+    assert not any(m is model.LinearStatModel
+                   for m in model.StatModel.registry.values())
+    with pytest.raises(NameError):
+        model.StatModel.from_json(model.LinearStatModel.to_json())
+
+
+class WholeGame(model.StatModel):
+    """Model scoring every player by the length of the game."""
+
+    @classmethod
+    def calculate(cls, game, precision=4):
+        """Return the length of the game for each player."""
+        return {p: {'total': float(len(game))} for p in game.players}
+
+
+def test_model_overriding_calculate(players):
+    """Test that a model may define only whole-game calculations."""
+    g = Game(players, next(synth.games(1, seed=8)), stat_model=WholeGame)
+    g.play(save_stats=False)
+    assert g.player_stat(players.p1) == {'total': float(len(g))}
+    assert not WholeGame.windowed and model.Model1.windowed
+    assert g.stats_for() == {p: {'total': float(len(g))} for p in players}
+    WholeGame()
+
+    with pytest.raises(GameException):
+        g.stats_for(0, 3)
+    with pytest.raises(NotImplementedError):
+        model.StatModel.calculate(g)
+
+
+def test_score_with_whole_game_model(players):
+    """Test that score evaluates models which only calculate whole games."""
+    g = Game(players, next(synth.games(1, seed=9)))
+    result = score(g, stat_model=WholeGame)
+    assert not g.played
+    assert result.stats == {p: {'total': float(len(g))} for p in players}
+    assert result.score == score(g).score
+
+
+def test_whatif_with_whole_game_model(players):
+    """Test that what-if evaluates models which only calculate whole games."""
+    g = Game(players, next(synth.games(1, seed=10)), stat_model=WholeGame)
+    table = g.whatif()
+    assert len(table) == 24 and not g.played
+    assert all(o.stats == {p: {'total': float(len(g))} for p in o.players}
+               for o in table)
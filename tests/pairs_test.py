@@ -0,0 +1,70 @@
+"""Pairs Tests."""
+
+from spykeball.pairs import PairStats
+
+
+def brute_force(games, a, b, same_team):
+    """Return games, wins and differential of 'a' with or against 'b'."""
+    count = wins = differential = 0
+    for game in games:
+        home, away = game.home_team, game.away_team
+        diff = game.score['home'] - game.score['away']
+        if a in home:
+            team, other, diff = home, away, diff
+        elif a in away:
+            team, other, diff = away, home, -diff
+        else:
+            continue
+        if b in (team if same_team else other):
+            count += 1
+            wins += diff > 0
+            differential += diff
+    return count, wins, differential
+
+
+def test_pair_records(season):
+    """Test that incremental records match scanning the games."""
+    pairs = PairStats()
+    for game in season['games']:
+        pairs.add_game(game)
+
+    a, b = season['players'][0], season['players'][1]
+    record = pairs.partners(a, b)
+    assert (record.games, record.wins, record.differential) == brute_force(
+        season['games'], a, b, True)
+    swapped = pairs.partners(b, a)
+    assert (swapped.games, swapped.wins, swapped.differential) == (
+        record.games, record.wins, record.differential)
+    assert swapped.totals == record.totals[::-1]
+    for x in season['players']:
+        for y in season['players']:
+            if x is not y:
+                record = pairs.partners(x, y)
+                assert (record.games, record.wins,
+                        record.differential) == brute_force(
+                            season['games'], x, y, True)
+
+    record = pairs.head_to_head(b, a.UID)
+    assert (record.games, record.wins, record.differential) == brute_force(
+        season['games'], b, a, False)
+    assert pairs.head_to_head(a, b).wins == record.games - record.wins
+
+
+def test_best_partners(season):
+    """Test top-k queries and encoding the records."""
+    pairs = PairStats()
+    for game in season['games']:
+        pairs.add_game(game)
+
+    a = season['players'][0]
+    best = pairs.best_partners(a, k=2)
+    assert len(best) == 2
+    others = [p for p in season['players'] if p is not a]
+    rates = sorted((pairs.partners(a, p).win_rate for p in others
+                    if pairs.partners(a, p).games), reverse=True)
+    assert [r.win_rate for _, r in best] == rates[:2]
+
+    decoded = PairStats.from_json(pairs.to_json())
+    assert decoded.to_json() == pairs.to_json()
+    assert decoded.best_opponents(a.UID, k=3)[0][0] == (
+        pairs.best_opponents(a, k=3)[0][0])
@@ -1,5 +1,7 @@
 """Player Tests."""
 
+import gc
+
 import pytest
 
 from spykeball import player
@@ -15,3 +17,76 @@ def sample_players(count):
         'players': [player.Player(util.randstring(10)) for _ in range(count)],
         'length': count
         }
+
+
+def test_player_cache_shares_instances():
+    """Test that decoding a live player returns the same instance."""
+    p = player.Player('Billy')
+    assert player.PLAYER_CACHE.get(p.UID) is p
+    assert player.Player.from_json(p.to_json()) is p
+
+    uid = p.UID
+    del p
+    assert uid not in player.PLAYER_CACHE
+
+
+def test_player_cache_load(tmp_path):
+    """Test that a cached player is not read from disk again."""
+    p = player.Player('Billy')
+    fp = tmp_path.joinpath(p.UID + '.json')
+    p.save(fp)
+    fp.unlink()
+    assert player.PLAYER_CACHE.load(fp, p.UID) is p
+
+
+def test_roster_rebind():
+    """Test that a Roster resolves slots to its current players."""
+    a, b, c, d, e = (player.Player(n) for n in 'abcde')
+    roster = player.Roster(a, b, c, d)
+    assert roster[0] is a and roster['p4'] is d
+    assert roster.slot(c) == 3
+
+    roster.bind('p1', e)
+    assert roster.p1 is e and a not in roster
+    roster.rebind(player.PlayerMap(d, c, b, a))
+    assert list(roster) == [d, c, b, a]
+
+
+def test_player_uids():
+    """Test generating, parsing and validating player UIDs."""
+    p = player.Player('Billy')
+    assert player.Player.valid_id(p.UID)
+    assert len(p.UID) == 1 + 7 * player.Player.UID_GROUPS
+    assert p.UID_num < 2 ** player.Player.UID_BITS
+    assert player.Player.format_uid(p.UID_num) == p.UID
+
+    legacy = player.Player('Bob', object_uid='P-123456-000042-999999')
+    assert legacy.UID == 'P-123456-000042-999999'
+    assert legacy.UID_num == 123456000042999999
+    with pytest.raises(IndexError):
+        player.Player('Bob', object_uid=legacy.UID)
+
+    seeded = player.Player('Ann', object_uid=5)
+    assert seeded.UID == player.Player.format_uid(5)
+    assert seeded.UID_num == 5
+    assert legacy.UID in util.UIDObject._obj_uid_list
+
+    for uid in ('G-123456', 'P-12345', 'P-123456-', 'P'):
+        with pytest.raises(SyntaxError):
+            player.Player.valid_id(uid)
+
+
+def test_player_cache_load_adds_stats(tmp_path):
+    """Test that loading with stats fills in a live player's stats."""
+    p = player.Player('Billy')
+    p._stats['G-000001'] = {'stat': {'total': 1.0}, 'model': None}
+    uid, fp = p.UID, tmp_path.joinpath(p.UID + '.json')
+    p.save(fp)
+    del p
+    gc.collect()
+
+    live = player.Player('Billy', object_uid=uid)
+    assert player.PLAYER_CACHE.load(fp, uid, with_stats=False) is live
+    assert not live.stats and not live.stats_loaded
+    assert player.PLAYER_CACHE.load(fp, uid) is live
+    assert live.stats_loaded and 'G-000001' in live.stats
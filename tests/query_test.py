@@ -0,0 +1,54 @@
+"""Query Tests."""
+
+import pytest
+
+from spykeball.query import TouchIndex
+from spykeball.touch import Service
+
+
+@pytest.fixture(scope='module')
+def index(season):
+    """Return an index over the games of the season."""
+    return TouchIndex(season['games'])
+
+
+def test_filter_matches_select(index, season):
+    """Test that filters agree with walking the touches."""
+    games = season['games']
+    x, y = season['players'][0], season['players'][2]
+    serves = [t for g in games for r in g for t in r.touches
+              if isinstance(t, Service) and t.actor is x and t.target is y]
+
+    query = index.query(actor=x, target=y.UID, kind=Service)
+    assert query.count() == len(serves)
+    assert query.sum('ace') == sum(t.is_ace for t in serves)
+    assert query.rate(ace=True) == pytest.approx(
+        sum(t.is_ace for t in serves) / len(serves))
+
+
+def test_last_games(index, season):
+    """Test restricting a query to the last games it matches."""
+    games = season['games']
+    x = season['players'][0]
+    query = index.query(actor=x).last_games(3)
+    uids = [g.UID for g in games if x in g.players][-3:]
+    expected = sum(1 for g in games if g.UID in uids
+                   for r in g for t in r.touches if t.actor is x)
+    assert query.count() == expected
+
+
+def test_groupby(index, tmp_path):
+    """Test grouped aggregates and saving the index."""
+    counts = index.query(kind='Service').groupby('actor').count()
+    assert sum(counts.values()) == index.query(kind='Service').count()
+    assert set(counts) == set(index.players)
+
+    rates = index.query(kind='Service').groupby('actor').mean('ace')
+    for uid, rate in rates.items():
+        assert rate == pytest.approx(
+            index.query(kind='Service', actor=uid).mean('ace'))
+
+    fp = tmp_path.joinpath('index.npz')
+    index.save(fp)
+    loaded = TouchIndex.load(fp)
+    assert loaded.query(kind='Service').groupby('actor').count() == counts
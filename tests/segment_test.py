@@ -0,0 +1,58 @@
+"""Stat Segment Tests."""
+
+from spykeball import model
+from spykeball import synth
+from spykeball import Game, Store
+
+from spykeball.segment import StatSegment
+
+
+def test_segment_append_and_career(tmp_path):
+    """Test appending records and reading career aggregates."""
+    segment = StatSegment(tmp_path / 'p.stats')
+    assert len(segment) == 0 and segment.career()['games'] == 0
+
+    segment.append('G-000001', {'hitting': 1.0, 'total': 10.0}, model.Model1)
+    segment.extend([('G-000002', {'hitting': 3.0, 'total': 20.0}, None),
+                    ('G-000001', {'hitting': 5.0, 'total': 30.0},
+                     model.Model1)])
+    assert len(segment) == 3
+    assert segment.games() == ['G-000002', 'G-000001']
+    assert segment.career() == {'games': 2, 'hitting': 4.0, 'defense': 0.0,
+                                'serving': 0.0, 'cleanliness': 0.0,
+                                'total': 25.0}
+    assert segment.to_stats()['G-000001']['model'] is model.Model1
+
+    with open(segment.path, 'ab') as file:
+        file.write(b'torn')
+    segment.compact()
+    assert len(segment) == 2
+
+
+def test_segment_append_after_torn_record(tmp_path):
+    """Test that appending after a torn record keeps records aligned."""
+    segment = StatSegment(tmp_path / 'p.stats')
+    segment.append('G-000001', {'total': 5.0})
+    with open(segment.path, 'ab') as file:
+        file.write(b'torn')
+    segment.append('G-000002', {'total': 25.0})
+    assert segment.games() == ['G-000001', 'G-000002']
+    assert segment.career()['total'] == 15.0
+
+
+def test_store_appends_player_stats(players, tmp_path):
+    """Test that the store only appends the new games of a player."""
+    games = [Game(players, r) for r in synth.games(3, seed=13)]
+    store = Store(tmp_path / 'games', tmp_path / 'players')
+
+    for game in games:
+        game.play()
+        store.add(players.p1)
+        store.flush()
+
+    segment = store.segment(players.p1.UID)
+    assert len(segment) == 3
+    assert segment.games() == [g.UID for g in games]
+    assert 'stats' not in store.path(players.p1.UID).read_text()
+    assert segment.to_stats()[games[0].UID]['stat'] == (
+        players.p1.stats[games[0].UID]['stat'])
@@ -0,0 +1,43 @@
+"""Simulator Tests."""
+
+import numpy as np
+
+from spykeball import sim
+from spykeball import synth
+from spykeball import touch
+
+from spykeball import Game
+
+
+def test_touch_model_counts(players):
+    """Test that touches are counted by state and outcome."""
+    model = sim.TouchModel()
+    model.add_rally(touch.rally_parse('13s4n', players))
+    model.add_rally(touch.rally_parse('1a3', players))
+
+    p1, p3, p4 = (model.counts(p) for p in (players.p1, players.p3,
+                                               players.p4))
+    assert p1[sim.SERVICE, sim.OVER] == 1 and p1[sim.SERVICE, sim.WIN] == 1
+    assert p3[sim.DEFENSE, sim.PASS] == 1
+    assert p4[sim.SET, sim.FAULT] == 1
+    assert model.strength_rates(players.p3)[sim.DEFENSE, 1] == 1.0
+
+    probs = model.probabilities(players.p2)
+    assert np.allclose(probs, model.league())
+    assert np.allclose(probs.sum(axis=1), 1.0)
+
+
+def test_simulate(players):
+    """Test that simulations are reproducible and favor stronger teams."""
+    model = sim.TouchModel(Game(players, rallies)
+                           for rallies in synth.games(5, seed=1))
+
+    forecast, = model.simulate([players], games=2000, seed=7)
+    assert forecast == model.simulate([players], games=2000, seed=7)[0]
+    assert 0.0 < forecast.home_win < 1.0
+    assert min(forecast.home_points, forecast.away_points) > 0
+
+    counts = model._player_counts(players.p1)[0]
+    counts[sim.SPIKE] = (1000, 0, 0, 0)
+    stacked, = model.simulate([players], games=2000, seed=7, jobs=2)
+    assert stacked.home_win > forecast.home_win
@@ -0,0 +1,47 @@
+"""Store Tests."""
+
+import json
+
+import pytest
+
+from spykeball import synth
+from spykeball import Game, Player, Store
+
+
+def test_store_coalesces_writes(players, tmp_path, monkeypatch):
+    """Test that an object added many times is written once per flush."""
+    saves = []
+    monkeypatch.setattr(Player, 'save', lambda self, fp, *a, **k: (
+        saves.append(self.UID)))
+
+    with Store(tmp_path / 'games', tmp_path / 'players') as store:
+        for rallies in synth.games(5, seed=12):
+            game = Game(players, rallies)
+            game.play()
+            store.add(game)
+            for player in players:
+                store.add(player)
+        assert len(store) == 9
+
+    assert sorted(saves) == sorted(p.UID for p in players)
+    assert len(list((tmp_path / 'games').glob('*.json'))) == 5
+
+
+def test_store_load_and_discard(tmp_path):
+    """Test loading pending and flushed objects and dropping writes."""
+    store = Store(tmp_path / 'games', tmp_path / 'players')
+    player = Player('a')
+    store.add(player)
+    assert store.load(player.UID) is player
+
+    store.add_record('G-123456', json.dumps({'UID': 'G-123456'}))
+    store.discard('G-123456')
+    assert store.flush() == 1
+    assert store.load(player.UID) is player
+    assert json.loads(store.path(player.UID).read_text())['name'] == 'a'
+
+    with pytest.raises(RuntimeError):
+        with store:
+            store.add(Player('b'))
+            raise RuntimeError
+    assert len(store) == 0
@@ -0,0 +1,89 @@
+"""Summary Index Tests."""
+
+import pytest
+
+from spykeball import synth
+from spykeball import Game, Player, PlayerMap, Store
+
+from spykeball.summary import SummaryIndex, summarize
+
+
+def test_summary_index(players, tmp_path):
+    """Test appending, finding and filtering game summaries."""
+    others = PlayerMap(Player('e'), Player('f'), players.p3, players.p4)
+    games = [Game(players if i % 2 else others, r)
+             for i, r in enumerate(synth.games(4, seed=18))]
+    index = SummaryIndex(tmp_path / 'games.summary')
+    assert len(index) == 0 and index.find(games[0].UID) is None
+
+    for i, game in enumerate(games):
+        game.play(save_stats=False)
+        index.append(game, saved=float(i))
+    game = games[1]
+    record = index.find(game.UID)
+    assert record['game'].decode() == game.UID
+    assert (record['home'], record['away']) == (game.score['home'],
+                                                game.score['away'])
+    assert record['winner'] == (0 if game.winner == game.home_team else 1)
+    assert record['rallies'] == len(game)
+
+    game.player_stat(game.p1)
+    index.append(game, saved=4.0)
+    record = index.find(game.UID)
+    totals = [game.stats[p]['total'] for p in game.players]
+    assert record['top_total'] == max(totals)
+    assert record['top'] == totals.index(max(totals))
+    assert len(index) == 5 and len(index.records()) == 4
+
+    assert [r['game'].decode() for r in index.between(2.0, 4.0)] == [
+        games[2].UID, games[3].UID]
+    assert len(index.of_player(players.p1.UID)) == 2
+    assert len(index.of_player(players.p3.UID)) == 4
+
+    index.compact(exclude=[games[0].UID])
+    assert len(index) == 3 and index.find(games[0].UID) is None
+
+
+def test_store_maintains_summaries(players, tmp_path):
+    """Test that flushing games and records appends their summaries."""
+    game, other = (Game(players, r) for r in synth.games(2, seed=19))
+    game.play()
+
+    with Store(tmp_path / 'games', tmp_path / 'players') as store:
+        store.add(game)
+        store.add_record(other.UID, other.dumps())
+    assert len(store.summaries) == 2
+    assert store.summaries.find(game.UID) == summarize(
+        game, store.summaries.find(game.UID)['time'])[0]
+    assert store.summaries.find(other.UID)['winner'] == -1
+
+
+def test_summary_append_after_torn_record(players, tmp_path):
+    """Test that appending after a torn record keeps records aligned."""
+    games = [Game(players, r) for r in synth.games(2, seed=21)]
+    index = SummaryIndex(tmp_path / 'games.summary')
+    index.append(games[0])
+    with open(index.path, 'ab') as file:
+        file.write(b'torn')
+    index.append(games[1])
+    assert len(index) == 2
+    assert index.find(games[1].UID)['game'].decode() == games[1].UID
+
+
+def test_store_indexes_games_written_before_a_failure(players, tmp_path):
+    """Test that a failed flush still indexes the games it wrote."""
+    game, other = (Game(players, r) for r in synth.games(2, seed=22))
+    store = Store(tmp_path / 'games', tmp_path / 'players')
+    store.add(game)
+    store.add_record(other.UID, other.dumps())
+    (tmp_path / 'games').mkdir()
+    store.path(other.UID).mkdir()
+
+    with pytest.raises(OSError):
+        store.flush()
+    assert store.summaries.find(game.UID) is not None
+    assert store.summaries.find(other.UID) is None
+    assert game.UID not in store and other.UID in store
+    assert store.hashes[game.content_hash] == game.UID
+    assert (tmp_path / 'games' / Store.HASH_INDEX).read_text().count(
+        game.UID) == 1
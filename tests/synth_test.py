@@ -0,0 +1,44 @@
+"""Synth Tests."""
+
+import pytest
+
+from spykeball import synth
+from spykeball import touch
+from spykeball import Game, Player, PlayerMap
+
+
+@pytest.fixture
+def playermap():
+    """Return a fresh PlayerMap."""
+    return PlayerMap(Player('p1'), Player('p2'), Player('p3'), Player('p4'))
+
+
+def test_rallies_parse(playermap):
+    """Test that generated rallies follow the rally grammar."""
+    for rally in synth.rallies(2000, seed=1):
+        assert touch.rally_parse(rally, playermap).touches
+
+
+def test_rallies_cover_lexicon():
+    """Test that generated rallies use every parsed rally character."""
+    used = set(''.join(synth.rallies(5000, seed=2)))
+    assert used <= set(touch.TOUCH_LEXICON)
+    assert used >= set('1234aenpsw')
+
+
+def test_games_play(playermap):
+    """Test that generated games have a valid serving order and end."""
+    for rallies in synth.games(20, seed=3):
+        game = Game(playermap, rallies)
+        game.play(save_stats=False)
+        home, away = game.score['home'], game.score['away']
+        assert max(home, away) >= 21
+        assert abs(home - away) >= 2
+
+
+def test_games_reproducible():
+    """Test that games only depend on the seed and their index."""
+    synthesizer = synth.Synthesizer(seed=4)
+    assert list(synth.games(5, seed=4)) == list(synthesizer.games(5))
+    assert list(synthesizer.games(2, start=3)) == list(
+        synthesizer.games(5))[3:]
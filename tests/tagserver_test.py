@@ -0,0 +1,92 @@
+"""Tagging Server Tests."""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from spykeball import synth
+from spykeball import Store
+
+from spykeball.tagserver import TagServer
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Run a TagServer on a free port."""
+    store = Store(tmp_path / 'games', tmp_path / 'players')
+    server = TagServer(('127.0.0.1', 0), tmp_path / 'journal', store,
+                       quiet=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _post(server, path, body, content_type='text/plain'):
+    """Post a body to the server and return the status and JSON reply."""
+    url = 'http://{}:{}{}'.format(*server.server_address, path)
+    request = urllib.request.Request(url, data=body.encode(), method='POST',
+                                     headers={'Content-Type': content_type})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_tag_server(players, server, tmp_path):
+    """Test tagging a game rally by rally over HTTP."""
+    for player in players:
+        server.store.add(player)
+    server.store.flush()
+    rallies = next(synth.games(1, seed=20))
+
+    status, reply = _post(server, '/games', json.dumps(
+        {'players': [p.UID for p in players]}), 'application/json')
+    assert status == 200
+    uid = reply['game']
+
+    _, reply = _post(server, '/games/{}/rallies'.format(uid), rallies[0])
+    assert reply == {'game': uid, 'rallies': 1}
+    _, reply = _post(server, '/games/{}/rallies'.format(uid),
+                     '\n'.join(rallies[1:3] + ['1x'] + rallies[3:]))
+    assert reply['rallies'] == 3 and reply['accepted'] == 2
+    assert reply['rally'] == '1x' and reply['error']
+    url = 'http://{}:{}/games/{}'.format(*server.server_address, uid)
+    with urllib.request.urlopen(url) as response:
+        assert json.loads(response.read())['actions'] == rallies[:3]
+    assert (tmp_path / 'journal' / (uid + '.log')).read_text().count(
+        '\n') == 3
+
+    for rally in rallies[3:]:
+        _post(server, '/games/{}/rallies'.format(uid),
+              json.dumps({'rally': rally}), 'application/json')
+    status, reply = _post(server, '/games/{}/finish'.format(uid), '')
+    assert status == 200 and reply['game'] == uid
+    assert server.store.summaries.find(uid)['rallies'] == len(rallies)
+    assert not list((tmp_path / 'journal').iterdir())
+    assert players.p1.stats[uid]
+
+    status, reply = _post(server, '/games', json.dumps(
+        {'players': [p.UID for p in players]}), 'application/json')
+    duplicate = reply['game']
+    _post(server, '/games/{}/rallies'.format(duplicate), '\n'.join(rallies))
+    status, reply = _post(server, '/games/{}/finish'.format(duplicate), '')
+    assert status == 409 and reply['game'] == uid and reply['error']
+    assert _post(server, '/games/{}/rallies'.format(duplicate),
+                 rallies[0])[1]['rallies'] == len(rallies) + 1
+
+    status, reply = _post(server, '/games', json.dumps(
+        {'players': [p.UID for p in players]}), 'application/json')
+    status, reply = _post(server, '/games/{}/rallies'.format(reply['game']),
+                          '3a1')
+    assert status == 200 and reply['rallies'] == 0
+    assert reply['error'] == "Wrong team serving."
+
+    assert _post(server, '/games/{}/rallies'.format(uid), '1')[0] == 404
+    assert _post(server, '/games/X-1/rallies', '1')[0] == 400
+    assert _post(server, '/games', '{}', 'application/json')[0] == 400